@@ -1,11 +1,40 @@
-from prefect import task, flow, get_run_logger
+from prefect import task, flow, get_run_logger, unmapped
+from prefect.task_runners import ProcessPoolTaskRunner
+from prefect_ray.task_runners import RayTaskRunner
+from contextlib import contextmanager
 from multiprocessing import cpu_count
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import json
+import os
+
+from raytracer import instrumentation
+from raytracer.animation import DEFAULT_FRAME_PATTERN, frame_path, render_frame
+from raytracer.cache import TileCache, fingerprint, tile_key
+from raytracer.canvas import Canvas, MappedCanvas
+from raytracer.render import Sampler, SharedBuffer, Tile, render_tile, split_tiles
+from raytracer.render.tiles import DEFAULT_TILE_SIZE, Renderer
 
 from tests.test_tuple import test_tuple
 from tests.test_color import test_color
 from tests.test_canvas import test_canvas
 from tests.test_matrix import test_matrix
 from tests.test_matrix_transformations import test_matrix_transformations
+from tests.test_ray import test_ray
+from tests.test_render import test_render
+from tests.test_sphere import test_sphere
+from tests.test_bvh import test_bvh
+from tests.test_bench import test_bench
+from tests.test_instrumentation import test_instrumentation
+from tests.test_progressive import test_progressive
+from tests.test_cache import test_cache
+from tests.test_sampling import test_sampling
+from tests.test_camera import test_camera
+from tests.test_mesh import test_mesh
+from tests.test_shading import test_shading
+from tests.test_world import test_world
+from tests.test_scene import test_scene
+from tests.test_animation import test_animation
 
 NUM_CPUS = cpu_count()
 
@@ -17,6 +46,231 @@ def run_test() -> None:
     test_canvas()
     test_matrix()
     test_matrix_transformations()
+    test_ray()
+    test_render()
+    test_sphere()
+    test_bvh()
+    test_bench()
+    test_instrumentation()
+    test_progressive()
+    test_cache()
+    test_sampling()
+    test_camera()
+    test_mesh()
+    test_shading()
+    test_world()
+    test_scene()
+    test_animation()
+
+
+def _open_target(target: str, width: int, height: int, mapped: bool):
+    """Attach to the flow's shared buffer, or open its memory-mapped output file."""
+    if mapped:
+        return MappedCanvas.open(target)
+    return SharedBuffer.attach(target, width, height)
+
+
+def _render_into(
+    renderer: Renderer, tile: Tile, target: str, width: int, height: int, mapped: bool, sampler: Optional[Sampler]
+) -> None:
+    opened = _open_target(target, width, height, mapped)
+    try:
+        pixels = render_tile(renderer, tile) if sampler is None else sampler.render_tile(renderer, tile)
+        if mapped:
+            opened.write_block(tile.x0, tile.y0, pixels)
+        else:
+            opened.array[tile.y0:tile.y1, tile.x0:tile.x1] = pixels
+        instrumentation.count("canvas_writes", tile.width * tile.height)
+    finally:
+        opened.close()
+
+
+@task
+def render_tile_task(
+    renderer: Renderer,
+    tile: Tile,
+    target: str,
+    width: int,
+    height: int,
+    instrument: bool = False,
+    mapped: bool = False,
+    sampler: Optional[Sampler] = None,
+) -> dict:
+    if not instrument:
+        _render_into(renderer, tile, target, width, height, mapped, sampler)
+        return {}
+    with instrumentation.instrumented():
+        _render_into(renderer, tile, target, width, height, mapped, sampler)
+        return instrumentation.snapshot()
+
+
+@contextmanager
+def _render_target(width: int, height: int, output_path: Optional[str], output_dtype: str):
+    """Yield the canvas tiles land in and the name workers open it by.
+
+    A mapped canvas is flushed when the render succeeds and closed when it
+    fails; on success it stays open for the caller.
+    """
+    if output_path is not None:
+        canvas = MappedCanvas(output_path, width, height, output_dtype)
+        try:
+            yield canvas, output_path
+        except BaseException:
+            canvas.close()
+            raise
+        canvas.flush()
+    else:
+        with SharedBuffer(width, height) as shared:
+            yield Canvas.from_buffer(shared.array), shared.name
+
+
+@flow(
+    name="Render Flow",
+    task_runner=ProcessPoolTaskRunner(max_workers=NUM_CPUS),
+    validate_parameters=False,
+)
+def run_render(
+    renderer: Renderer,
+    width: int,
+    height: int,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    instrument: bool = False,
+    cache: Optional[TileCache] = None,
+    output_path: Optional[str] = None,
+    output_dtype: str = "uint8",
+    sampler: Optional[Sampler] = None,
+) -> Canvas:
+    """Render tiles in parallel and return the finished canvas.
+
+    Each pixel gets one sample at its center unless a ``sampler`` is given.
+
+    By default tiles are gathered in shared memory. With ``output_path``
+    workers write straight into a ``MappedCanvas`` file instead, so the
+    image never has to fit in RAM; that canvas is returned. Either way the
+    workers must run on this machine, so the flow uses a pool of local
+    processes. Like ``run_animation_locally``, a script that calls it must
+    do so under ``if __name__ == "__main__":``.
+    """
+    logger = get_run_logger()
+
+    tiles = split_tiles(width, height, tile_size)
+    logger.info(f"Rendering {width}x{height} as {len(tiles)} tiles on {NUM_CPUS} CPUs.")
+    with _render_target(width, height, output_path, output_dtype) as (target, target_name):
+        pending = tiles
+        if cache is not None:
+            # Tiles are cached as the target stores them, so an 8-bit file
+            # never feeds its rounded pixels to a full-precision render.
+            target_kind = ("mapped", output_dtype) if output_path is not None else ("shared", "float64")
+            scene_key = fingerprint((renderer, sampler, target_kind))
+            pending = []
+            for tile in tiles:
+                cached = cache.get(tile_key(scene_key, tile))
+                if cached is None or cached.shape != (tile.height, tile.width, 3):
+                    pending.append(tile)
+                else:
+                    target.write_block(tile.x0, tile.y0, cached)
+            logger.info(f"Reused {len(tiles) - len(pending)} of {len(tiles)} tiles from the cache.")
+
+        futures = render_tile_task.map(
+            unmapped(renderer), pending, unmapped(target_name), unmapped(width), unmapped(height),
+            unmapped(instrument), unmapped(output_path is not None), unmapped(sampler),
+        )
+        reports = futures.result()
+        if cache is not None:
+            for tile in pending:
+                cache.put(tile_key(scene_key, tile), target.rows(tile.y0, tile.y1)[:, tile.x0:tile.x1], evict=False)
+            cache.evict()
+        canvas = target if output_path is not None else Canvas.from_buffer(target.buffer.copy())
+    if instrument:
+        logger.info("Render breakdown:\n" + instrumentation.format_report(instrumentation.merge(*reports)))
+    logger.info("Render complete.")
+    return canvas
+
+
+FRAME_RETRIES = 2
+
+
+@task(retries=FRAME_RETRIES, retry_delay_seconds=1)
+def render_frame_task(
+    description: Dict[str, Any],
+    frame: int,
+    path: str,
+    base_dir: str,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    sampler: Optional[Sampler] = None,
+) -> str:
+    return render_frame(description, frame, path, base_dir, tile_size, sampler)
+
+
+@flow(
+    name="Animation Flow",
+    task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}),
+    validate_parameters=False,
+)
+def run_animation(
+    scene: Union[str, Dict[str, Any]],
+    frames: Sequence[int],
+    output_pattern: str = DEFAULT_FRAME_PATTERN,
+    base_dir: Optional[str] = None,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    sampler: Optional[Sampler] = None,
+    overwrite: bool = False,
+) -> List[str]:
+    """Render a frame range of a keyframed scene, one task per frame.
+
+    ``scene`` is a JSON scene file or an already loaded description whose
+    values may be keyframed. Each frame is written atomically to
+    ``output_pattern`` and its task is retried up to ``FRAME_RETRIES``
+    times. Frames that already have a file are skipped unless
+    ``overwrite``, so a rerun after an interruption picks up where it
+    stopped. Returns every frame's path.
+
+    Frames go to whatever task runner the flow runs with. To use several
+    machines, attach it to a Ray cluster with
+    ``run_animation.with_options(task_runner=RayTaskRunner(address=...))``.
+    Each frame is rendered and written by its worker without shared
+    memory, so this only needs ``output_pattern`` on storage every node
+    can reach. ``run_animation_locally`` uses a pool of local processes
+    instead.
+    """
+    logger = get_run_logger()
+
+    if isinstance(scene, str):
+        with open(scene) as f:
+            description = json.load(f)
+        base_dir = base_dir or os.path.dirname(os.path.abspath(scene))
+    else:
+        description = scene
+    frames = list(frames)
+    paths = [frame_path(output_pattern, frame) for frame in frames]
+    pending = [(frame, path) for frame, path in zip(frames, paths) if overwrite or not os.path.exists(path)]
+    logger.info(f"Rendering {len(pending)} of {len(frames)} frames.")
+    if pending:
+        futures = render_frame_task.map(
+            unmapped(description), [frame for frame, _ in pending], [path for _, path in pending],
+            unmapped(base_dir or "."), unmapped(tile_size), unmapped(sampler),
+        )
+        futures.result()
+    logger.info("Animation complete.")
+    return paths
+
+
+def run_animation_locally(
+    scene: Union[str, Dict[str, Any]],
+    frames: Sequence[int],
+    output_pattern: str = DEFAULT_FRAME_PATTERN,
+    workers: Optional[int] = None,
+    **options,
+) -> List[str]:
+    """``run_animation`` on a pool of worker processes on this machine.
+
+    The workers are started with ``spawn``, so each one re-imports the
+    calling script. A script that calls this must do so under
+    ``if __name__ == "__main__":``, or every worker would start the
+    animation again.
+    """
+    runner = ProcessPoolTaskRunner(max_workers=workers or NUM_CPUS)
+    return run_animation.with_options(task_runner=runner)(scene, frames, output_pattern, **options)
 
 
 @flow(name="Ray Tracing Flow")
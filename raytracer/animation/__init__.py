@@ -0,0 +1,4 @@
+# raytracer/animation/__init__.py
+
+from .keyframes import KEYFRAMES, interpolate, is_animated, scene_at
+from .frames import DEFAULT_FRAME_PATTERN, frame_path, render_frame
\ No newline at end of file
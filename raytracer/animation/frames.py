@@ -0,0 +1,46 @@
+# raytracer/animation/frames.py
+
+import os
+from typing import Any, Dict, Optional
+
+from raytracer.canvas import Canvas
+from raytracer.render import Sampler, render_tile, split_tiles
+from raytracer.render.tiles import DEFAULT_TILE_SIZE
+from raytracer.scene import parse_scene
+from raytracer.world import SceneRenderer, World
+from .keyframes import scene_at
+
+DEFAULT_FRAME_PATTERN = "frame_{frame:04d}.ppm"
+
+
+def frame_path(pattern: str, frame: int) -> str:
+    """The output file of ``frame``, e.g. ``frame_path("out/f_{frame:04d}.ppm", 7)``."""
+    return pattern.format(frame=frame)
+
+
+def render_frame(
+    description: Dict[str, Any],
+    frame: int,
+    path: str,
+    base_dir: str = ".",
+    tile_size: int = DEFAULT_TILE_SIZE,
+    sampler: Optional[Sampler] = None,
+) -> str:
+    """Render one frame of a keyframed scene description to a binary PPM.
+
+    The frame is rendered in this process, tile by tile, and the file
+    replaces ``path`` atomically. A crashed or retried render never leaves a
+    partial frame behind, so an existing file is always a finished frame.
+    """
+    objects, lights, camera = parse_scene(scene_at(description, frame), base_dir)
+    if camera is None:
+        raise ValueError("An animated scene needs a camera")
+    renderer = SceneRenderer(World(objects, lights), camera)
+    canvas = Canvas(camera.hsize, camera.vsize)
+    for tile in split_tiles(camera.hsize, camera.vsize, tile_size):
+        pixels = render_tile(renderer, tile) if sampler is None else sampler.render_tile(renderer, tile)
+        canvas.write_block(tile.x0, tile.y0, pixels)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    canvas.save_ppm(path)
+    return path
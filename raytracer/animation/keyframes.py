@@ -0,0 +1,53 @@
+# raytracer/animation/keyframes.py
+
+import bisect
+from typing import Any, Dict, List, Tuple
+
+# A value written {"keyframes": {"0": 0, "120": 6.2832}} is animated; any
+# other value in a scene description is the same on every frame.
+KEYFRAMES = "keyframes"
+
+
+def is_animated(value: Any) -> bool:
+    return isinstance(value, dict) and set(value) == {KEYFRAMES}
+
+
+def interpolate(keys: Dict[Any, Any], frame: float):
+    """Linearly interpolate keyed numbers (or lists of numbers) at ``frame``.
+
+    Keys are frame numbers (strings in JSON). Frames before the first key
+    or after the last one hold that key's value.
+    """
+    frames, values = _sorted_keys(keys)
+    if frame <= frames[0]:
+        return values[0]
+    if frame >= frames[-1]:
+        return values[-1]
+    i = bisect.bisect_right(frames, frame)
+    f0, f1 = frames[i - 1], frames[i]
+    s = (frame - f0) / (f1 - f0)
+    a, b = values[i - 1], values[i]
+    if isinstance(a, list):
+        return [x + (y - x) * s for x, y in zip(a, b)]
+    return a + (b - a) * s
+
+
+def scene_at(description: Any, frame: float) -> Any:
+    """A copy of ``description`` with every keyframed value resolved at ``frame``."""
+    if is_animated(description):
+        return interpolate(description[KEYFRAMES], frame)
+    if isinstance(description, dict):
+        return {key: scene_at(value, frame) for key, value in description.items()}
+    if isinstance(description, list):
+        return [scene_at(value, frame) for value in description]
+    return description
+
+
+def _sorted_keys(keys: Dict[Any, Any]) -> Tuple[List[float], List[Any]]:
+    if not keys:
+        raise ValueError("Keyframes need at least one key")
+    shapes = {len(value) if isinstance(value, list) else None for value in keys.values()}
+    if len(shapes) > 1:
+        raise ValueError("Keyframe values must all be numbers or all lists of the same length")
+    items = sorted(((float(frame), value) for frame, value in keys.items()), key=lambda item: item[0])
+    return [frame for frame, _ in items], [value for _, value in items]
@@ -0,0 +1,4 @@
+# raytracer/bench/__init__.py
+
+from .benchmarks import BENCHMARKS, run_benchmarks
+from .compare import compare_results, load_results, save_results
\ No newline at end of file
@@ -0,0 +1,51 @@
+# raytracer/bench/__main__.py
+
+"""Run the benchmark suite: ``python -m raytracer.bench --help``."""
+
+import argparse
+import sys
+
+from .benchmarks import DEFAULT_RESOLUTIONS, benchmark_suite, run_benchmarks
+from .compare import DEFAULT_THRESHOLD, compare_results, load_results, save_results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m raytracer.bench", description=__doc__)
+    parser.add_argument("benchmarks", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("-o", "--output", default="bench_output.json", help="where to write the JSON results")
+    parser.add_argument("-c", "--compare", metavar="BASELINE", help="JSON results to compare against")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown fraction that counts as a regression (default: %(default)s)")
+    parser.add_argument("-r", "--resolutions", type=int, nargs="+", default=list(DEFAULT_RESOLUTIONS),
+                        help="image sizes for the end-to-end renders")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per benchmark; the best is kept")
+    parser.add_argument("--label", help="free-form label stored with the results, e.g. a version")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(benchmark_suite(args.resolutions)))
+        return 0
+
+    def progress(name, result):
+        print(f"{name:40s} {result['seconds'] * 1e6:14.2f} us {result['operations_per_second']:16.1f} ops/s")
+
+    results = run_benchmarks(args.benchmarks or None, args.resolutions, args.repeat, progress=progress)
+    current = save_results(results, args.output, args.label)
+    print(f"Results written to {args.output}")
+
+    if not args.compare:
+        return 0
+
+    rows = compare_results(load_results(args.compare), current, args.threshold)
+    for row in rows:
+        print(f"{row['name']:40s} {row['ratio']:8.3f}x  {row['status']}")
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# raytracer/bench/benchmarks.py
+
+import timeit
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from raytracer.camera import Camera
+from raytracer.canvas import Canvas
+from raytracer.colors import Color
+from raytracer.matrices import Matrix
+from raytracer.matrices.transformations import Transform, view_transform
+from raytracer.render import render_tile, split_tiles
+from raytracer.tuples import Point, Vector
+from .scenes import SCENES, OrthographicRenderer
+
+DEFAULT_RESOLUTIONS = (64, 128, 256)
+
+# A benchmark returns a function to time and how many operations one call
+# of that function performs.
+Benchmark = Callable[[], Tuple[Callable[[], object], int]]
+
+
+def _matrix_inverse():
+    elements = Transform().rotate_x(0.3).scale(2, 3, 4).translate(1, 2, 3).matrix.elements
+
+    def run():
+        # A fresh matrix each time so the cached inverse isn't measured.
+        return Matrix(4, 4, elements).inverse()
+
+    return run, 1
+
+
+def _matrix_multiply_tuple():
+    m = Transform().rotate_y(0.5).translate(1, 2, 3).matrix
+    p = Point(1, 2, 3)
+    v = Vector(1, 2, 3)
+
+    def run():
+        m * p
+        m * v
+
+    return run, 2
+
+
+def _tuple_arithmetic():
+    a = Vector(1, 2, 3)
+    b = Vector(4, 5, 6)
+    p = Point(1, 1, 1)
+
+    def run():
+        (p + a * 2.0 - b).dot(a.cross(b).normalize())
+
+    return run, 6
+
+
+def _canvas_to_ppm(size: int = 128):
+    canvas = Canvas(size, size)
+    canvas.buffer[:] = np.linspace(0, 1, size * size * 3).reshape(size, size, 3)
+
+    def run():
+        canvas.to_ppm()
+
+    return run, size * size
+
+
+def _canvas_write_pixel(size: int = 64):
+    canvas = Canvas(size, size)
+    color = Color(0.5, 0.25, 1)
+
+    def run():
+        for y in range(size):
+            for x in range(size):
+                canvas.write_pixel(x, y, color)
+
+    return run, size * size
+
+
+def _camera_primary_rays(size: int = 256):
+    camera = Camera(size, size, 1.0, view_transform(Point(0, 1.5, -5), Point(0, 1, 0), Vector(0, 1, 0)))
+    tiles = split_tiles(size, size)
+
+    def run():
+        for tile in tiles:
+            camera.rays_for_tile(tile.x0, tile.y0, tile.x1, tile.y1)
+
+    return run, size * size
+
+
+def _render(scene: str, resolution: int):
+    def setup():
+        renderer = OrthographicRenderer(SCENES[scene](), resolution, resolution)
+        tiles = split_tiles(resolution, resolution)
+
+        def run():
+            for tile in tiles:
+                render_tile(renderer, tile)
+
+        return run, resolution * resolution
+
+    return setup
+
+
+def benchmark_suite(resolutions: Iterable[int] = DEFAULT_RESOLUTIONS) -> Dict[str, Benchmark]:
+    suite: Dict[str, Benchmark] = {
+        "matrix_inverse": _matrix_inverse,
+        "matrix_multiply_tuple": _matrix_multiply_tuple,
+        "tuple_arithmetic": _tuple_arithmetic,
+        "canvas_write_pixel": _canvas_write_pixel,
+        "canvas_to_ppm": _canvas_to_ppm,
+        "camera_primary_rays": _camera_primary_rays,
+    }
+    for scene in SCENES:
+        for resolution in resolutions:
+            suite[f"render_{scene}_{resolution}"] = _render(scene, resolution)
+    return suite
+
+
+BENCHMARKS = benchmark_suite()
+
+
+def time_benchmark(benchmark: Benchmark, repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    """Time a benchmark and report the best of ``repeat`` runs.
+
+    Each run loops the function until it takes at least ``min_time`` seconds,
+    so fast operations get enough iterations to time accurately.
+    """
+    run, operations = benchmark()
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {
+        "seconds": best,
+        "operations": operations,
+        "operations_per_second": operations / best if best else float("inf"),
+    }
+
+
+def run_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    resolutions: Iterable[int] = DEFAULT_RESOLUTIONS,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    progress: Optional[Callable[[str, Dict[str, float]], None]] = None,
+) -> Dict[str, Dict[str, float]]:
+    suite = benchmark_suite(resolutions)
+    selected = list(suite) if names is None else list(names)
+    unknown = [name for name in selected if name not in suite]
+    if unknown:
+        raise KeyError(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    results = {}
+    for name in selected:
+        results[name] = time_benchmark(suite[name], repeat=repeat, min_time=min_time)
+        if progress is not None:
+            progress(name, results[name])
+    return results
@@ -0,0 +1,58 @@
+# raytracer/bench/compare.py
+
+import json
+import platform
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+
+
+def save_results(results: Dict[str, Dict[str, float]], path: str, label: Optional[str] = None) -> dict:
+    """Write benchmark results and the environment they came from to JSON."""
+    document = {
+        "format_version": FORMAT_VERSION,
+        "label": label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "benchmarks": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return document
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} benchmark file")
+    return document
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """Compare the benchmarks two result files have in common.
+
+    A benchmark is a regression when it got slower by more than
+    ``threshold`` (a fraction), and an improvement when it got faster by
+    more than that.
+    """
+    rows = []
+    for name in sorted(set(baseline["benchmarks"]) & set(current["benchmarks"])):
+        before = baseline["benchmarks"][name]["seconds"]
+        after = current["benchmarks"][name]["seconds"]
+        ratio = after / before if before else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        rows.append({"name": name, "baseline": before, "current": after, "ratio": ratio, "status": status})
+    return rows
@@ -0,0 +1,80 @@
+# raytracer/bench/scenes.py
+
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from raytracer import instrumentation
+from raytracer.bvh import BVH
+from raytracer.matrices.transformations import Transform
+from raytracer.rays import RayBatch
+from raytracer.shapes import Shape, Sphere
+
+
+def sphere_grid(count: int = 64) -> List[Shape]:
+    """Spheres on a regular square grid in the z = 0 plane."""
+    side = max(int(np.ceil(np.sqrt(count))), 1)
+    spacing = 2.5
+    offset = (side - 1) * spacing / 2
+    return [
+        Sphere(Transform().translate(i * spacing - offset, j * spacing - offset, 0).matrix)
+        for j in range(side)
+        for i in range(side)
+    ][:count]
+
+
+def random_spheres(count: int = 1000, seed: int = 1) -> List[Shape]:
+    """Randomly placed and sized spheres; the seed makes runs reproducible."""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-20, 20, (count, 3))
+    radii = rng.uniform(0.2, 1.0, count)
+    return [
+        Sphere(Transform().scale(r, r, r).translate(x, y, z).matrix)
+        for (x, y, z), r in zip(centers.tolist(), radii.tolist())
+    ]
+
+
+SCENES: Dict[str, Callable[[], List[Shape]]] = {
+    "sphere_grid_64": lambda: sphere_grid(64),
+    "random_spheres_1k": lambda: random_spheres(1000),
+}
+
+
+def gradient(px: np.ndarray, py: np.ndarray) -> np.ndarray:
+    """A renderer with no scene: red grows with x and green with y, a tenth per pixel.
+
+    It's linear in both axes, so tiling, sampling and filtering tests can
+    predict every pixel exactly.
+    """
+    return np.stack([px / 10, py / 10, np.zeros_like(px)], axis=-1)
+
+
+class OrthographicRenderer:
+    """Looks down -z at a scene through parallel rays and shades hits white.
+
+    It's the smallest renderer that exercises ray generation, the BVH and the
+    canvas together, which is enough to measure visibility throughput.
+    """
+
+    def __init__(self, shapes: List[Shape], width: int, height: int, extent: float = 22.0):
+        self.bvh = BVH(shapes)
+        self.width = width
+        self.height = height
+        self.extent = extent
+
+    def __call__(self, px: np.ndarray, py: np.ndarray) -> np.ndarray:
+        with instrumentation.stage("ray_generation"):
+            scale = 2 * self.extent / max(self.width, self.height)
+            origins = np.empty((len(px), 3))
+            origins[:, 0] = (px - self.width / 2) * scale
+            origins[:, 1] = (self.height / 2 - py) * scale
+            origins[:, 2] = 50
+            directions = np.zeros_like(origins)
+            directions[:, 2] = -1
+            instrumentation.count("rays_cast", len(px))
+        with instrumentation.stage("intersection"):
+            t, index = self.bvh.intersect_batch(RayBatch(origins, directions))
+        with instrumentation.stage("shading"):
+            colors = np.zeros((len(px), 3))
+            colors[index >= 0] = 1
+        return colors
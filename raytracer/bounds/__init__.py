@@ -0,0 +1,3 @@
+# raytracer/bounds/__init__.py
+
+from .bounding_box import BoundingBox
\ No newline at end of file
@@ -0,0 +1,55 @@
+# raytracer/bounds/bounding_box.py
+
+from typing import Iterable
+
+import numpy as np
+
+from raytracer.matrices import Matrix
+
+
+class BoundingBox:
+    """An axis-aligned box given by its minimum and maximum corners."""
+
+    def __init__(self, minimum: Iterable[float], maximum: Iterable[float]):
+        self.minimum: np.ndarray = np.array(minimum, dtype=np.float64)
+        self.maximum: np.ndarray = np.array(maximum, dtype=np.float64)
+
+    @classmethod
+    def empty(cls) -> "BoundingBox":
+        return cls((np.inf,) * 3, (-np.inf,) * 3)
+
+    def __eq__(self, other):
+        if not isinstance(other, BoundingBox):
+            return NotImplemented
+        return bool(
+            np.allclose(self.minimum, other.minimum) and np.allclose(self.maximum, other.maximum)
+        )
+
+    def __repr__(self):
+        return f"BoundingBox({self.minimum.tolist()}, {self.maximum.tolist()})"
+
+    def union(self, other: "BoundingBox") -> "BoundingBox":
+        return BoundingBox(
+            np.minimum(self.minimum, other.minimum), np.maximum(self.maximum, other.maximum)
+        )
+
+    def centroid(self) -> np.ndarray:
+        return (self.minimum + self.maximum) * 0.5
+
+    def surface_area(self) -> float:
+        dx, dy, dz = np.maximum(self.maximum - self.minimum, 0).tolist()
+        return 2 * (dx * dy + dy * dz + dz * dx)
+
+    def transform(self, matrix: Matrix) -> "BoundingBox":
+        """Return the box that encloses this box after transforming it."""
+        corners = np.array(
+            [
+                [x, y, z]
+                for x in (self.minimum[0], self.maximum[0])
+                for y in (self.minimum[1], self.maximum[1])
+                for z in (self.minimum[2], self.maximum[2])
+            ]
+        )
+        m = matrix.data
+        transformed = corners @ m[:3, :3].T + m[:3, 3]
+        return BoundingBox(transformed.min(axis=0), transformed.max(axis=0))
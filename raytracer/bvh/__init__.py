@@ -0,0 +1,3 @@
+# raytracer/bvh/__init__.py
+
+from .bvh import BVH
\ No newline at end of file
@@ -0,0 +1,512 @@
+# raytracer/bvh/bvh.py
+
+from typing import List, Optional, Sequence, Tuple
+
+import math
+
+import numpy as np
+
+from raytracer.intersections import HitBuffer, HitRecord, Intersection
+from raytracer.rays import Ray, RayBatch
+from raytracer.tuples import Point, Vector
+
+SAH_BINS = 16
+DEFAULT_MAX_LEAF_SIZE = 4
+# Below this many live rays a subtree is finished one ray at a time, where
+# the pure-Python slab test is cheaper than a numpy call per node.
+DEFAULT_MIN_PACKET_RAYS = 16
+
+# Stand-in for 1 / 0 in the slab test. Unlike inf it never produces
+# 0 * inf = nan when a ray starts exactly on a slab plane.
+_INV_ZERO = 1e300
+
+
+class BVH:
+    """A bounding volume hierarchy over shapes, built with the surface area heuristic.
+
+    Nodes live in flat arrays: ``node_min``/``node_max`` hold each node's
+    bounds, and ``node_count`` is the number of primitives in a leaf (zero for
+    interior nodes). For a leaf ``node_start`` is the offset of its first
+    primitive in ``indices``; for an interior node it is the index of the
+    left child, and the right child follows it directly.
+
+    Shapes need ``bounds()`` (object space) and a ``transform``, plus
+    ``closest_hit``, ``intersect`` and ``occluded`` for single rays and
+    ``closest_hits`` and ``occluded_batch`` for ray batches.
+    """
+
+    def __init__(self, shapes: Sequence, max_leaf_size: int = DEFAULT_MAX_LEAF_SIZE, nodes: Optional[Tuple] = None):
+        """``nodes`` takes the ``nodes()`` of a tree built earlier over the same
+        shapes, in the same order, and skips the build."""
+        self.shapes = list(shapes)
+        if nodes is not None:
+            self._set_nodes(*nodes)
+            return
+        boxes = [shape.bounds().transform(shape.transform) for shape in self.shapes]
+        mins = np.array([box.minimum for box in boxes], dtype=np.float64).reshape(-1, 3)
+        maxs = np.array([box.maximum for box in boxes], dtype=np.float64).reshape(-1, 3)
+        self._build(mins, maxs, max_leaf_size)
+
+    def nodes(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """The flat arrays that make up the tree, for saving and rebuilding it."""
+        return self.node_min, self.node_max, self.node_start, self.node_count, self.indices
+
+    def __len__(self) -> int:
+        return len(self.node_count)
+
+    def __fingerprint__(self):
+        # The tree is derived from the shapes and finds the same closest hits
+        # however it is split.
+        return self.shapes
+
+    def _build(self, mins: np.ndarray, maxs: np.ndarray, max_leaf_size: int) -> None:
+        count = len(mins)
+        centroids = (mins + maxs) * 0.5
+        indices = np.arange(count, dtype=np.int64)
+        capacity = max(2 * count - 1, 1)
+        node_min = np.zeros((capacity, 3))
+        node_max = np.zeros((capacity, 3))
+        node_start = np.zeros(capacity, dtype=np.int64)
+        node_count = np.zeros(capacity, dtype=np.int64)
+
+        used = 1
+        stack = [(0, 0, count)]
+        while stack:
+            node, start, end = stack.pop()
+            prims = indices[start:end]
+            if len(prims):
+                node_min[node] = mins[prims].min(axis=0)
+                node_max[node] = maxs[prims].max(axis=0)
+
+            left_mask = _sah_split(
+                centroids[prims], mins[prims], maxs[prims], node_min[node], node_max[node], max_leaf_size
+            )
+            if left_mask is None:
+                node_start[node] = start
+                node_count[node] = end - start
+                continue
+
+            middle = start + int(np.count_nonzero(left_mask))
+            indices[start:end] = np.concatenate([prims[left_mask], prims[~left_mask]])
+            left = used
+            used += 2
+            node_start[node] = left
+            stack.append((left + 1, middle, end))
+            stack.append((left, start, middle))
+
+        self._set_nodes(node_min[:used], node_max[:used], node_start[:used], node_count[:used], indices)
+
+    def _set_nodes(self, node_min, node_max, node_start, node_count, indices) -> None:
+        self.node_min = np.asarray(node_min, dtype=np.float64)
+        self.node_max = np.asarray(node_max, dtype=np.float64)
+        self.node_start = np.asarray(node_start, dtype=np.int64)
+        self.node_count = np.asarray(node_count, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self._python_nodes = None
+
+    def _node_lists(self):
+        """Plain Python copies of the nodes and indices, built on first use.
+
+        They let the single-ray path avoid per-node numpy calls. Structures
+        that never trace single rays (like large meshes) never pay their
+        memory cost.
+        """
+        if self._python_nodes is None:
+            nodes = [
+                (*lo, *hi, start, n)
+                for lo, hi, start, n in zip(
+                    self.node_min.tolist(), self.node_max.tolist(),
+                    self.node_start.tolist(), self.node_count.tolist(),
+                )
+            ]
+            self._python_nodes = (nodes, self.indices.tolist())
+        return self._python_nodes
+
+    def intersect(self, ray: Ray) -> List[Intersection]:
+        """Return the intersections of one ray with the shapes, sorted by t.
+
+        Shapes that lie entirely behind the ray origin are culled with their
+        nodes, so their (all negative) intersections are left out.
+        """
+        xs: List[Intersection] = []
+        if not self.shapes:
+            return xs
+        ox, oy, oz = ray.origin.x, ray.origin.y, ray.origin.z
+        d = ray.direction
+        ix = 1 / d.x if d.x else _INV_ZERO
+        iy = 1 / d.y if d.y else _INV_ZERO
+        iz = 1 / d.z if d.z else _INV_ZERO
+        nodes, indices = self._node_lists()
+
+        stack = [0]
+        while stack:
+            x0, y0, z0, x1, y1, z1, start, count = nodes[stack.pop()]
+            if not _slab_hit(ox, oy, oz, ix, iy, iz, x0, y0, z0, x1, y1, z1):
+                continue
+            if count:
+                for i in indices[start:start + count]:
+                    xs.extend(self.shapes[i].intersect(ray))
+            else:
+                stack.append(start + 1)
+                stack.append(start)
+
+        xs.sort(key=lambda x: x.t)
+        return xs
+
+    def closest_hit(self, ray: Ray, record: Optional[HitRecord] = None) -> HitRecord:
+        """Lower ``record`` to the closest hit below its ``t`` and return it.
+
+        ``record.t`` is the running ``t_max``: boxes beyond it are skipped, and
+        each hit found shrinks it further. Nothing is allocated per shape.
+        """
+        if record is None:
+            record = HitRecord()
+        if not self.shapes:
+            return record
+        ox, oy, oz = ray.origin.x, ray.origin.y, ray.origin.z
+        d = ray.direction
+        ix = 1 / d.x if d.x else _INV_ZERO
+        iy = 1 / d.y if d.y else _INV_ZERO
+        iz = 1 / d.z if d.z else _INV_ZERO
+        nodes, indices = self._node_lists()
+
+        stack = [0]
+        while stack:
+            x0, y0, z0, x1, y1, z1, start, count = nodes[stack.pop()]
+            if not _slab_hit(ox, oy, oz, ix, iy, iz, x0, y0, z0, x1, y1, z1, record.t):
+                continue
+            if count:
+                for i in indices[start:start + count]:
+                    self.shapes[i].closest_hit(ray, record)
+            else:
+                stack.append(start + 1)
+                stack.append(start)
+        return record
+
+    def intersect_batch(
+        self, batch: RayBatch, t_max=math.inf, min_packet_rays: int = DEFAULT_MIN_PACKET_RAYS,
+        out: Optional[HitBuffer] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the closest non-negative hit below ``t_max`` for every ray in a batch.
+
+        The batch is traced as one packet: at each node the slab test runs
+        on all rays still active there, and the node is skipped once none of
+        them can reach it. When a packet has diverged to ``min_packet_rays``
+        or fewer rays, they finish the subtree on the single-ray path.
+        ``t_max`` is a scalar or one limit per ray. Returns ``(t, index)``
+        where ``index`` is the position of the hit shape in ``shapes``; a
+        miss keeps ``t_max`` with index -1. With ``out`` the results are
+        written into its reused slots rather than new arrays, and its
+        ``face``, ``u`` and ``v`` say where each ray hit a mesh.
+        """
+        n = len(batch)
+        if out is None:
+            out = HitBuffer(n)
+        best_t, best_index = out.reset(n, t_max)
+        if not len(self.indices) or not n:
+            return best_t, best_index
+
+        origins = batch.origins
+        directions = batch.directions
+        with np.errstate(divide="ignore"):
+            inv_directions = np.where(directions != 0, 1 / directions, _INV_ZERO)
+
+        record = HitRecord()
+        stack = [(0, np.arange(n))]
+        while stack:
+            node, rays = stack.pop()
+            if len(rays) <= min_packet_rays:
+                for ray in rays.tolist():
+                    self._trace_single(ray, node, batch, inv_directions, record, out)
+                continue
+            rays = rays[
+                _slab_hit_batch(
+                    origins[rays], inv_directions[rays], self.node_min[node], self.node_max[node], best_t[rays]
+                )
+            ]
+            if not len(rays):
+                continue
+            start = self.node_start[node]
+            count = self.node_count[node]
+            if count:
+                self._intersect_leaf(
+                    self.indices[start:start + count], RayBatch(origins[rays], directions[rays]), rays, out
+                )
+            else:
+                stack.append((start + 1, rays))
+                stack.append((start, rays))
+
+        return best_t, best_index
+
+    def occluded(self, ray: Ray, max_t: float = math.inf) -> bool:
+        """Whether any shape blocks ``ray`` at some ``0 <= t < max_t``.
+
+        Traversal stops at the first blocking shape. No intersection lists
+        are built or sorted, and boxes beyond ``max_t`` are skipped.
+        """
+        if not self.shapes:
+            return False
+        ox, oy, oz = ray.origin.x, ray.origin.y, ray.origin.z
+        d = ray.direction
+        ix = 1 / d.x if d.x else _INV_ZERO
+        iy = 1 / d.y if d.y else _INV_ZERO
+        iz = 1 / d.z if d.z else _INV_ZERO
+        nodes, indices = self._node_lists()
+
+        stack = [0]
+        while stack:
+            x0, y0, z0, x1, y1, z1, start, count = nodes[stack.pop()]
+            if not _slab_hit(ox, oy, oz, ix, iy, iz, x0, y0, z0, x1, y1, z1, max_t):
+                continue
+            if count:
+                for i in indices[start:start + count]:
+                    if self.shapes[i].occluded(ray, max_t):
+                        return True
+            else:
+                stack.append(start + 1)
+                stack.append(start)
+        return False
+
+    def occluded_batch(self, batch: RayBatch, max_t=math.inf, min_packet_rays: int = DEFAULT_MIN_PACKET_RAYS) -> np.ndarray:
+        """Batched ``occluded``; ``max_t`` is a scalar or one limit per ray.
+
+        Rays drop out of the packet as soon as something blocks them, so the
+        remaining traversal only carries rays that are still unresolved.
+        """
+        n = len(batch)
+        blocked = np.zeros(n, dtype=bool)
+        if not len(self.indices) or not n:
+            return blocked
+
+        origins = batch.origins
+        directions = batch.directions
+        limits = np.array(np.broadcast_to(np.asarray(max_t, dtype=np.float64), (n,)))
+        with np.errstate(divide="ignore"):
+            inv_directions = np.where(directions != 0, 1 / directions, _INV_ZERO)
+
+        # A blocked ray's limit drops to -inf, so the slab test culls it from
+        # every node visited afterwards.
+        stack = [(0, np.arange(n))]
+        while stack:
+            node, rays = stack.pop()
+            if len(rays) <= min_packet_rays:
+                for ray in rays.tolist():
+                    if not blocked[ray] and self._occluded_single(ray, node, batch, inv_directions, float(limits[ray])):
+                        blocked[ray] = True
+                        limits[ray] = -np.inf
+                continue
+            rays = rays[
+                _slab_hit_batch(
+                    origins[rays], inv_directions[rays], self.node_min[node], self.node_max[node], limits[rays]
+                )
+            ]
+            if not len(rays):
+                continue
+            start = self.node_start[node]
+            count = self.node_count[node]
+            if count:
+                self._occlude_leaf(self.indices[start:start + count], batch, rays, limits, blocked)
+            else:
+                stack.append((start + 1, rays))
+                stack.append((start, rays))
+
+        return blocked
+
+    def _occluded_single(self, r: int, root: int, batch: RayBatch, inv_directions: np.ndarray, max_t: float) -> bool:
+        ox, oy, oz = batch.origins[r].tolist()
+        ix, iy, iz = inv_directions[r].tolist()
+        ray = None
+        nodes, indices = self._node_lists()
+
+        stack = [root]
+        while stack:
+            x0, y0, z0, x1, y1, z1, start, count = nodes[stack.pop()]
+            if not _slab_hit(ox, oy, oz, ix, iy, iz, x0, y0, z0, x1, y1, z1, max_t):
+                continue
+            if count:
+                if ray is None:
+                    ray = Ray(Point(ox, oy, oz), Vector(*batch.directions[r].tolist()))
+                for i in indices[start:start + count]:
+                    if self.shapes[i].occluded(ray, max_t):
+                        return True
+            else:
+                stack.append(start + 1)
+                stack.append(start)
+        return False
+
+    def _occlude_leaf(
+        self, primitives: np.ndarray, batch: RayBatch, rays: np.ndarray, limits: np.ndarray, blocked: np.ndarray
+    ) -> None:
+        """Mark which of ``rays`` a leaf's primitives block."""
+        sub_batch = batch.subset(rays)
+        sub_limits = limits[rays]
+        for i in primitives.tolist():
+            hits = self.shapes[i].occluded_batch(sub_batch, sub_limits)
+            if hits.any():
+                blocked[rays[hits]] = True
+                limits[rays[hits]] = -np.inf
+                open_rays = ~hits
+                rays = rays[open_rays]
+                if not len(rays):
+                    return
+                sub_batch = sub_batch.subset(open_rays)
+                sub_limits = sub_limits[open_rays]
+
+    def _trace_single(
+        self, r: int, root: int, batch: RayBatch, inv_directions: np.ndarray, record: HitRecord, hits: HitBuffer
+    ) -> None:
+        ox, oy, oz = batch.origins[r].tolist()
+        ix, iy, iz = inv_directions[r].tolist()
+        ray = None
+        record.reset(float(hits.t[r]))
+        index = -1
+        nodes, indices = self._node_lists()
+
+        stack = [root]
+        while stack:
+            x0, y0, z0, x1, y1, z1, start, count = nodes[stack.pop()]
+            if not _slab_hit(ox, oy, oz, ix, iy, iz, x0, y0, z0, x1, y1, z1, record.t):
+                continue
+            if count:
+                if ray is None:
+                    ray = Ray(Point(ox, oy, oz), Vector(*batch.directions[r].tolist()))
+                for i in indices[start:start + count]:
+                    if self.shapes[i].closest_hit(ray, record):
+                        index = i
+            else:
+                stack.append(start + 1)
+                stack.append(start)
+
+        if index >= 0:
+            hits.t[r] = record.t
+            hits.index[r] = index
+            if record.face is None:
+                hits.face[r] = -1
+            else:
+                hits.face[r], hits.u[r], hits.v[r] = record.face, record.u, record.v
+
+    def _intersect_leaf(self, primitives: np.ndarray, batch: RayBatch, rays: np.ndarray, hits: HitBuffer) -> None:
+        """Lower the closest hits of ``rays`` in ``hits`` with a leaf's primitives.
+
+        ``batch`` holds just those rays. Subclasses over other primitives
+        (like mesh triangles) override this.
+        """
+        for i in primitives.tolist():
+            self._closest_in_shape(i, batch, rays, hits)
+
+    def _closest_in_shape(self, i: int, batch: RayBatch, rays: np.ndarray, hits: HitBuffer) -> None:
+        best_t = hits.t[rays]
+        t, face, u, v = self.shapes[i].closest_hits(batch, best_t)
+        closer = t < best_t
+        rays = rays[closer]
+        hits.t[rays] = t[closer]
+        hits.index[rays] = i
+        if face is None:
+            hits.face[rays] = -1
+        else:
+            hits.face[rays] = face[closer]
+            hits.u[rays] = u[closer]
+            hits.v[rays] = v[closer]
+
+
+def _slab_hit(ox, oy, oz, ix, iy, iz, x0, y0, z0, x1, y1, z1, t_max=math.inf) -> bool:
+    t0 = (x0 - ox) * ix
+    t1 = (x1 - ox) * ix
+    if t0 > t1:
+        t0, t1 = t1, t0
+    tmin, tmax = t0, t1
+    t0 = (y0 - oy) * iy
+    t1 = (y1 - oy) * iy
+    if t0 > t1:
+        t0, t1 = t1, t0
+    if t0 > tmin:
+        tmin = t0
+    if t1 < tmax:
+        tmax = t1
+    t0 = (z0 - oz) * iz
+    t1 = (z1 - oz) * iz
+    if t0 > t1:
+        t0, t1 = t1, t0
+    if t0 > tmin:
+        tmin = t0
+    if t1 < tmax:
+        tmax = t1
+    return tmin <= tmax and tmax >= 0 and tmin <= t_max
+
+
+def _slab_hit_batch(
+    origins: np.ndarray, inv_directions: np.ndarray, lo: np.ndarray, hi: np.ndarray, t_max: np.ndarray
+) -> np.ndarray:
+    t0 = (lo - origins) * inv_directions
+    t1 = (hi - origins) * inv_directions
+    near = np.minimum(t0, t1)
+    far = np.maximum(t0, t1)
+    # Column-wise maximum/minimum; reducing along the length-3 axis is several times slower.
+    tmin = np.maximum(np.maximum(near[:, 0], near[:, 1]), near[:, 2])
+    tmax = np.minimum(np.minimum(far[:, 0], far[:, 1]), far[:, 2])
+    return (tmin <= tmax) & (tmax >= 0) & (tmin <= t_max)
+
+
+def _surface_areas(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    extent = np.maximum(hi - lo, 0)
+    return 2 * (extent[..., 0] * extent[..., 1] + extent[..., 1] * extent[..., 2] + extent[..., 2] * extent[..., 0])
+
+
+def _sah_split(
+    centroids: np.ndarray,
+    mins: np.ndarray,
+    maxs: np.ndarray,
+    node_lo: np.ndarray,
+    node_hi: np.ndarray,
+    max_leaf_size: int,
+) -> Optional[np.ndarray]:
+    """Choose the cheapest binned SAH split of a node's primitives.
+
+    Nodes with at most ``max_leaf_size`` primitives always become leaves.
+    Returns a mask of the primitives that go to the left child, or None when
+    the node should stay a leaf.
+    """
+    count = len(centroids)
+    if count <= max_leaf_size:
+        return None
+
+    # Dividing by the parent area doesn't change which split wins, but keeps
+    # costs comparable to the primitive count.
+    parent_area = max(float(_surface_areas(node_lo, node_hi)), 1e-300)
+    c_lo = centroids.min(axis=0)
+    extent = centroids.max(axis=0) - c_lo
+    best_mask = None
+    if np.any(extent > 0):
+        # Bin along all three axes at once; row a of each (3, ...) array is axis a.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(extent > 0, SAH_BINS / extent, 0)
+        bins = ((centroids - c_lo) * scale).astype(np.int64)
+        np.minimum(bins, SAH_BINS - 1, out=bins)
+        flat = (bins + np.arange(3) * SAH_BINS).T.ravel()
+        counts = np.bincount(flat, minlength=3 * SAH_BINS).reshape(3, SAH_BINS)
+        bin_lo = np.full((3 * SAH_BINS, 3), np.inf)
+        bin_hi = np.full((3 * SAH_BINS, 3), -np.inf)
+        np.minimum.at(bin_lo, flat, np.tile(mins, (3, 1)))
+        np.maximum.at(bin_hi, flat, np.tile(maxs, (3, 1)))
+        bin_lo = bin_lo.reshape(3, SAH_BINS, 3)
+        bin_hi = bin_hi.reshape(3, SAH_BINS, 3)
+
+        left_count = np.cumsum(counts, axis=1)[:, :-1]
+        right_count = count - left_count
+        left_area = _surface_areas(
+            np.minimum.accumulate(bin_lo, axis=1)[:, :-1], np.maximum.accumulate(bin_hi, axis=1)[:, :-1]
+        )
+        right_area = _surface_areas(
+            np.minimum.accumulate(bin_lo[:, ::-1], axis=1)[:, ::-1][:, 1:],
+            np.maximum.accumulate(bin_hi[:, ::-1], axis=1)[:, ::-1][:, 1:],
+        )
+        costs = (left_area * left_count + right_area * right_count) / parent_area
+        costs[(left_count == 0) | (right_count == 0) | (extent[:, np.newaxis] <= 0)] = np.inf
+        axis, split = np.unravel_index(int(np.argmin(costs)), costs.shape)
+        if np.isfinite(costs[axis, split]):
+            best_mask = bins[:, axis] <= split
+
+    if best_mask is None:
+        # Every centroid coincides, so no plane separates them; split evenly.
+        best_mask = np.arange(count) < count // 2
+    return best_mask
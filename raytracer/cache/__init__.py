@@ -0,0 +1,4 @@
+# raytracer/cache/__init__.py
+
+from .fingerprint import code_version, fingerprint
+from .tile_cache import TileCache, tile_key
\ No newline at end of file
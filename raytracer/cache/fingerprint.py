@@ -0,0 +1,126 @@
+# raytracer/cache/fingerprint.py
+
+"""Stable content hashes for scenes, cameras and renderers.
+
+``fingerprint`` walks an object graph and hashes what it finds: numbers,
+strings, containers, numpy arrays, functions (by name and bytecode) and
+any other object by its class and attributes. Classes whose attributes
+include caches or derived data define ``__fingerprint__`` to return the
+value that should be hashed in their place, so two equal scenes hash the
+same whether or not their caches have been filled.
+
+Methods are not part of an object's fingerprint, so a scene hashes the
+same before and after a fix to the code that renders it. ``code_version``
+hashes the package's sources; cache keys mix it in so that stale results
+are not served across code changes.
+"""
+
+import functools
+import hashlib
+import os
+import struct
+import types
+from typing import Any, Dict
+
+import numpy as np
+
+
+def fingerprint(obj: Any) -> str:
+    """Return a hex digest that changes whenever ``obj``'s content does."""
+    return _Hasher().digest(obj).hex()
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """Hex digest of every ``.py`` file in the ``raytracer`` package."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    h = hashlib.sha256()
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = sorted(d for d in subdirectories if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(directory, name)
+                h.update(os.path.relpath(path, root).encode())
+                with open(path, "rb") as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+class _Hasher:
+    def __init__(self):
+        # Shared sub-objects (e.g. one transform used by many shapes) are
+        # hashed once. Objects stay referenced in ``_keep`` so ids are stable.
+        self._memo: Dict[int, bytes] = {}
+        self._keep = []
+        self._active = set()
+
+    def digest(self, obj: Any) -> bytes:
+        key = id(obj)
+        if key in self._memo:
+            return self._memo[key]
+        if key in self._active:
+            return _hash(b"cycle")
+        self._active.add(key)
+        try:
+            result = self._digest(obj)
+        finally:
+            self._active.discard(key)
+        self._memo[key] = result
+        self._keep.append(obj)
+        return result
+
+    def _digest(self, obj: Any) -> bytes:
+        if obj is None or isinstance(obj, (bool, int, str, bytes)):
+            return _hash(type(obj).__name__.encode(), repr(obj).encode())
+        if isinstance(obj, float):
+            return _hash(b"float", struct.pack("<d", obj))
+        if isinstance(obj, np.ndarray):
+            data = np.ascontiguousarray(obj)
+            return _hash(b"ndarray", str(data.dtype).encode(), repr(data.shape).encode(), data.tobytes())
+        if isinstance(obj, np.generic):
+            return self._digest(obj.item())
+        if isinstance(obj, (list, tuple)):
+            return _hash(type(obj).__name__.encode(), *map(self.digest, obj))
+        if isinstance(obj, (set, frozenset)):
+            return _hash(b"set", *sorted(map(self.digest, obj)))
+        if isinstance(obj, dict):
+            items = sorted(_hash(self.digest(k), self.digest(v)) for k, v in obj.items())
+            return _hash(b"dict", *items)
+        if isinstance(obj, types.FunctionType):
+            code = obj.__code__
+            return _hash(
+                b"function", _qualified_name(obj).encode(), code.co_code,
+                self.digest(code.co_consts), self.digest(obj.__defaults__),
+                self.digest([cell.cell_contents for cell in obj.__closure__ or ()]),
+            )
+        if isinstance(obj, (types.BuiltinFunctionType, type, types.ModuleType)):
+            return _hash(b"named", _qualified_name(obj).encode())
+        if isinstance(obj, types.CodeType):
+            return _hash(b"code", obj.co_code, self.digest(obj.co_consts))
+
+        kind = _qualified_name(type(obj)).encode()
+        custom = getattr(obj, "__fingerprint__", None)
+        if custom is not None:
+            return _hash(kind, self.digest(custom()))
+        return _hash(kind, self.digest(_state(obj)))
+
+
+def _state(obj: Any) -> Dict[str, Any]:
+    state = dict(getattr(obj, "__dict__", {}))
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                state[name] = getattr(obj, name)
+    return state
+
+
+def _qualified_name(obj: Any) -> str:
+    return f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', getattr(obj, '__name__', ''))}"
+
+
+def _hash(*parts: bytes) -> bytes:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.digest()
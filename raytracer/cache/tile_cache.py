@@ -0,0 +1,126 @@
+# raytracer/cache/tile_cache.py
+
+import os
+import tempfile
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from .fingerprint import code_version, fingerprint
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class TileCache:
+    """A directory of rendered pixel arrays keyed by content hash.
+
+    Each entry is one ``.npy`` file named after its key. Reading an entry
+    touches its modification time, and once the directory grows past
+    ``max_bytes`` the least recently used entries are deleted. Writes go
+    through a temporary file, so concurrent readers never see a partial
+    entry.
+
+    The directory is scanned once to learn its size, which ``put`` then
+    keeps up to date, so it only rescans when eviction is due. Writers can
+    pass ``evict=False`` and call ``evict()`` once after a batch of puts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._entries())
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        path = self._path(key)
+        try:
+            array = np.load(path)
+            os.utime(path)
+        except (FileNotFoundError, ValueError, EOFError):
+            return None
+        return array
+
+    def put(self, key: str, array: np.ndarray, evict: bool = True) -> None:
+        path = self._path(key)
+        replaced = _file_size(path)
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+                size = f.tell()
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        if self._size is not None:
+            self._size += size - replaced
+        if evict and (self._size is None or self._size > self.max_bytes):
+            self.evict()
+
+    def invalidate(self, key: str) -> None:
+        path = self._path(key)
+        size = _file_size(path)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return
+        if self._size is not None:
+            self._size -= size
+
+    def clear(self) -> None:
+        for path, _, _ in self._entries():
+            os.unlink(path)
+        self._size = 0
+
+    def size_bytes(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _entries(self) -> Iterator[Tuple[str, float, int]]:
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".npy"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entry.path, stat.st_mtime_ns, stat.st_size
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+
+def tile_key(scene_key: str, tile, version: Optional[str] = None) -> str:
+    """Key for one tile of a scene; ``scene_key`` comes from ``fingerprint``.
+
+    ``version`` defaults to ``code_version()``, so editing the renderer's
+    code makes every earlier tile a miss.
+    """
+    version = code_version() if version is None else version
+    return fingerprint((version, scene_key, tile.x0, tile.y0, tile.x1, tile.y1))
@@ -0,0 +1,3 @@
+# raytracer/camera/__init__.py
+
+from .camera import Camera
\ No newline at end of file
@@ -0,0 +1,87 @@
+# raytracer/camera/camera.py
+
+import math
+from typing import Optional
+
+import numpy as np
+
+from raytracer.matrices import Matrix
+from raytracer.rays import Ray, RayBatch
+from raytracer.tuples import Point
+from raytracer.utils import identity_matrix
+
+IDENTITY = Matrix(4, 4, identity_matrix(4))
+
+
+class Camera:
+    """A pinhole camera that maps an ``hsize`` x ``vsize`` canvas onto the
+    scene through the view ``transform``.
+
+    The inverse transform is computed once whenever the transform is set.
+    Each column's and each row's share of a ray direction is precomputed
+    too. A tile's primary rays then come from a single broadcast add and
+    normalize, with no per-pixel matrix work.
+
+    Pixel coordinates are continuous, with pixel centers at ``x + 0.5``, so
+    a camera works as the ray source of a ``Renderer``.
+    """
+
+    def __init__(self, hsize: int, vsize: int, field_of_view: float, transform: Optional[Matrix] = None):
+        self.hsize = hsize
+        self.vsize = vsize
+        self.field_of_view = field_of_view
+        half_view = math.tan(field_of_view / 2)
+        aspect = hsize / vsize
+        if aspect >= 1:
+            self.half_width, self.half_height = half_view, half_view / aspect
+        else:
+            self.half_width, self.half_height = half_view * aspect, half_view
+        self.pixel_size = self.half_width * 2 / hsize
+        self.transform = IDENTITY if transform is None else transform
+
+    @property
+    def transform(self) -> Matrix:
+        return self._transform
+
+    @transform.setter
+    def transform(self, transform: Matrix) -> None:
+        self._transform = transform
+        self.inverse_transform = transform.inverse()
+        inverse = self.inverse_transform.data
+        self._origin = np.ascontiguousarray(inverse[:3, 3])
+        self._axes = np.ascontiguousarray(inverse[:3, :3])
+        # Direction before normalizing, for pixel centers:
+        # axes @ (world_x, world_y, -1) = column_part[x] + row_part[y].
+        xs = self.half_width - (np.arange(self.hsize) + 0.5) * self.pixel_size
+        ys = self.half_height - (np.arange(self.vsize) + 0.5) * self.pixel_size
+        self._column_part = xs[:, np.newaxis] * self._axes[:, 0]
+        self._row_part = ys[:, np.newaxis] * self._axes[:, 1] - self._axes[:, 2]
+
+    def __fingerprint__(self):
+        return (self.hsize, self.vsize, self.field_of_view, self._transform)
+
+    def ray_for_pixel(self, px: float, py: float) -> Ray:
+        """The ray through continuous pixel coordinates (px, py)."""
+        world_x = self.half_width - px * self.pixel_size
+        world_y = self.half_height - py * self.pixel_size
+        pixel = self.inverse_transform.transform_point(Point(world_x, world_y, -1))
+        origin = self.inverse_transform.transform_point(Point(0, 0, 0))
+        return Ray(origin, (pixel - origin).normalize_())
+
+    def rays_for_pixels(self, px: np.ndarray, py: np.ndarray) -> RayBatch:
+        """The rays through arrays of continuous pixel coordinates."""
+        world = np.empty((len(px), 3))
+        world[:, 0] = self.half_width - px * self.pixel_size
+        world[:, 1] = self.half_height - py * self.pixel_size
+        world[:, 2] = -1
+        return self._batch(world @ self._axes.T)
+
+    def rays_for_tile(self, x0: int, y0: int, x1: int, y1: int) -> RayBatch:
+        """Rays through the pixel centers of ``[x0, x1) x [y0, y1)``, row-major."""
+        directions = (self._row_part[y0:y1, np.newaxis] + self._column_part[np.newaxis, x0:x1]).reshape(-1, 3)
+        return self._batch(directions)
+
+    def _batch(self, directions: np.ndarray) -> RayBatch:
+        directions /= np.sqrt(np.einsum("ij,ij->i", directions, directions))[:, np.newaxis]
+        origins = np.broadcast_to(self._origin, directions.shape).copy()
+        return RayBatch(origins, directions)
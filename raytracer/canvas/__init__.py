@@ -1,3 +1,4 @@
 # raytracer/canvas/__init__.py
 
-from .canvas import Canvas
\ No newline at end of file
+from .canvas import Canvas
+from .mapped import MappedCanvas
\ No newline at end of file
@@ -1,35 +1,144 @@
 # raytracer/canvas/canvas.py
 
+import functools
+import io
+import os
+import tempfile
+from typing import BinaryIO, List
+
+import numpy as np
+
+from raytracer import instrumentation
 from raytracer.colors import Color
 
+PPM_MAX_LINE_LENGTH = 70
+
 
 class Canvas:
+    """A grid of pixels stored as a single ``(height, width, 3)`` float64 array."""
+
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
-        self.pixels = [[Color(0, 0, 0) for _ in range(width)] for _ in range(height)]
+        self.buffer = np.zeros((height, width, 3), dtype=np.float64)
+
+    @classmethod
+    def from_buffer(cls, buffer: np.ndarray) -> "Canvas":
+        """Wrap an existing ``(height, width, 3)`` array without copying it."""
+        height, width, channels = buffer.shape
+        if channels != 3:
+            raise ValueError(f"Expected 3 color channels, got {channels}")
+        canvas = cls.__new__(cls)
+        canvas.width = width
+        canvas.height = height
+        canvas.buffer = buffer
+        return canvas
+
+    @property
+    def pixels(self) -> List[List[Color]]:
+        """Return a copy of the canvas as rows of ``Color`` objects."""
+        return [[Color(r, g, b) for r, g, b in row] for row in self.rows(0, self.height).tolist()]
+
+    def rows(self, y0: int, y1: int) -> np.ndarray:
+        """Return rows ``y0:y1`` as float colors; a view where possible."""
+        return self.buffer[y0:y1]
+
+    def write_block(self, x0: int, y0: int, pixels: np.ndarray) -> None:
+        """Write an ``(h, w, 3)`` array of colors with its top-left corner at (x0, y0)."""
+        height, width = pixels.shape[:2]
+        self.buffer[y0:y0 + height, x0:x0 + width] = pixels
 
     def write_pixel(self, x: int, y: int, color: Color) -> None:
-        self.pixels[y][x] = color
+        self.buffer[y, x] = (color.x, color.y, color.z)
 
     def pixel_at(self, x: int, y: int) -> Color:
-        return self.pixels[y][x]
+        r, g, b = self.buffer[y, x].tolist()
+        return Color(r, g, b)
+
+    def downscale(self, factor: int) -> "Canvas":
+        """Return a smaller canvas whose pixels average factor x factor blocks.
+
+        Blocks on the right and bottom edges may be smaller when the size
+        isn't a multiple of ``factor``.
+        """
+        if factor < 1:
+            raise ValueError(f"Downscale factor must be positive, got {factor}")
+        columns = np.arange(0, self.width, factor)
+        widths = np.diff(np.append(columns, self.width))
+        result = Canvas(len(columns), -(-self.height // factor))
+        # One band of rows at a time, so large memory-mapped canvases are
+        # never converted to floats all at once.
+        for i, y0 in enumerate(range(0, self.height, factor)):
+            band = self.rows(y0, min(y0 + factor, self.height))
+            sums = np.add.reduceat(band.sum(axis=0, dtype=np.float64), columns, axis=0)
+            result.buffer[i] = sums / (len(band) * widths[:, np.newaxis])
+        return result
 
     def to_ppm(self) -> str:
-        header = f"P3\n{self.width} {self.height}\n255\n"
-        body = ""
-        for row in self.pixels:
-            for pixel in row:
-                body += f"{self._to_ppm_color(pixel)}"
-            body = body[0:-1] + "\n"
-        return header + body
-
-    def _to_ppm_color(self, color: Color) -> str:
-        def clamp(x: float) -> int:
-            if x > 1:
-                return 255
-            if x < 0:
-                return 0
-            return round(x * 255)
-
-        return f"{clamp(color.x)} {clamp(color.y)} {clamp(color.z)} "
+        stream = io.BytesIO()
+        self.write_ppm(stream, binary=False)
+        return stream.getvalue().decode("ascii")
+
+    def write_ppm(self, fileobj: BinaryIO, binary: bool = True) -> None:
+        """Stream the canvas to a binary file object one row at a time.
+
+        Binary output is a P6 file; ASCII output is a P3 file whose lines
+        never exceed 70 characters.
+        """
+        with instrumentation.stage("ppm_encoding"):
+            magic = "P6" if binary else "P3"
+            fileobj.write(f"{magic}\n{self.width} {self.height}\n255\n".encode("ascii"))
+            for y in range(self.height):
+                values = self._ppm_row(y)
+                if binary:
+                    fileobj.write(values.tobytes())
+                else:
+                    fileobj.write(_to_ppm_lines(values.ravel().tolist()).encode("ascii"))
+
+    def save_ppm(self, path: str) -> None:
+        """Write a binary PPM to ``path``, replacing it atomically.
+
+        The image goes to a temporary file in the same directory first, so
+        readers never see a partly written file. The file gets the usual
+        permissions for the process's umask, not ``mkstemp``'s private 0600.
+        """
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".ppm.tmp")
+        try:
+            os.fchmod(fd, _default_file_mode())
+            with os.fdopen(fd, "wb") as f:
+                self.write_ppm(f)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def _ppm_row(self, y: int) -> np.ndarray:
+        return _to_ppm_bytes(self.buffer[y])
+
+
+def _to_ppm_bytes(colors: np.ndarray) -> np.ndarray:
+    """Scale colors to 0-255, rounding half to even and clamping."""
+    return np.clip(np.rint(colors * 255), 0, 255).astype(np.uint8)
+
+
+def _to_ppm_lines(values: List[int]) -> str:
+    lines = []
+    line: List[str] = []
+    length = -1
+    for value in map(str, values):
+        if line and length + 1 + len(value) > PPM_MAX_LINE_LENGTH:
+            lines.append(" ".join(line))
+            line = []
+            length = -1
+        line.append(value)
+        length += 1 + len(value)
+    lines.append(" ".join(line))
+    return "\n".join(lines) + "\n"
+
+
+@functools.lru_cache(maxsize=None)
+def _default_file_mode() -> int:
+    # The umask can only be read by setting it, so it is read once.
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
@@ -0,0 +1,104 @@
+# raytracer/canvas/mapped.py
+
+from typing import Tuple
+
+import numpy as np
+
+from raytracer.colors import Color
+from .canvas import Canvas, _to_ppm_bytes
+
+# Stored pixel type -> (magic number, third header line, numpy dtype).
+_FORMATS = {
+    "uint8": (b"P6", b"255", np.uint8),
+    "float32": (b"PF", b"-1.0", np.dtype("<f4")),
+}
+
+
+class MappedCanvas(Canvas):
+    """A canvas whose pixels live in a memory-mapped file instead of RAM.
+
+    ``uint8`` canvases are binary PPM (P6) files. The header comes first and
+    the pixel bytes follow it in row order, so the file is a finished image
+    once the last pixel is written. ``float32`` canvases are PFM files that
+    keep full precision; ``write_ppm`` converts them a row at a time.
+
+    Other processes can ``open`` the same path and write rows or tiles of
+    their own. Writes to disjoint regions never touch the same bytes.
+    """
+
+    def __init__(self, path: str, width: int, height: int, dtype: str = "uint8"):
+        if dtype not in _FORMATS:
+            raise ValueError(f"Unsupported canvas dtype {dtype!r}; expected one of {sorted(_FORMATS)}")
+        magic, scale, element = _FORMATS[dtype]
+        header = b"%s\n%d %d\n%s\n" % (magic, width, height, scale)
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(len(header) + width * height * 3 * np.dtype(element).itemsize)
+        self._map(path, dtype, width, height, len(header), "r+")
+
+    @classmethod
+    def open(cls, path: str, mode: str = "r+") -> "MappedCanvas":
+        """Map an existing canvas file, e.g. from a worker process."""
+        dtype, width, height, header_size = _read_header(path)
+        canvas = cls.__new__(cls)
+        canvas._map(path, dtype, width, height, header_size, mode)
+        return canvas
+
+    def _map(self, path: str, dtype: str, width: int, height: int, header_size: int, mode: str) -> None:
+        self.path = path
+        self.dtype = dtype
+        self.width = width
+        self.height = height
+        self._data = np.memmap(path, dtype=_FORMATS[dtype][2], mode=mode, offset=header_size, shape=(height, width, 3))
+        # PFM stores the bottom row first.
+        self.buffer = self._data if dtype == "uint8" else self._data[::-1]
+
+    def __enter__(self) -> "MappedCanvas":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write_pixel(self, x: int, y: int, color: Color) -> None:
+        self.buffer[y, x] = self._encode(np.array((color.x, color.y, color.z)))
+
+    def pixel_at(self, x: int, y: int) -> Color:
+        r, g, b = self.rows(y, y + 1)[0, x].tolist()
+        return Color(r, g, b)
+
+    def rows(self, y0: int, y1: int) -> np.ndarray:
+        rows = self.buffer[y0:y1].astype(np.float64)
+        if self.dtype == "uint8":
+            rows /= 255
+        return rows
+
+    def write_block(self, x0: int, y0: int, pixels: np.ndarray) -> None:
+        height, width = pixels.shape[:2]
+        self.buffer[y0:y0 + height, x0:x0 + width] = self._encode(pixels)
+
+    def flush(self) -> None:
+        self._data.flush()
+
+    def close(self) -> None:
+        """Flush the pixels to disk and release the mapping."""
+        if self._data is not None:
+            self._data.flush()
+            self._data = self.buffer = None
+
+    def _encode(self, colors: np.ndarray) -> np.ndarray:
+        return _to_ppm_bytes(colors) if self.dtype == "uint8" else colors
+
+    def _ppm_row(self, y: int) -> np.ndarray:
+        return self.buffer[y] if self.dtype == "uint8" else _to_ppm_bytes(self.buffer[y])
+
+
+def _read_header(path: str) -> Tuple[str, int, int, int]:
+    """Parse the three-line header ``MappedCanvas`` writes."""
+    with open(path, "rb") as f:
+        lines = [f.readline() for _ in range(3)]
+    magic, size, scale = (line.strip() for line in lines)
+    for dtype, (known_magic, known_scale, _) in _FORMATS.items():
+        if magic == known_magic and scale == known_scale:
+            width, height = map(int, size.split())
+            return dtype, width, height, sum(map(len, lines))
+    raise ValueError(f"{path} is not a canvas file written by MappedCanvas")
@@ -4,14 +4,46 @@ from raytracer.tuples import Tuple
 
 from typing import Union
 
+_new = object.__new__
+
 
 class Color(Tuple):
+    __slots__ = ()
+
     def __init__(self, r: float, g: float, b: float):
-        super().__init__(r, g, b, 0)
+        self.x = r
+        self.y = g
+        self.z = b
+        self.w = 0
 
     def __mul__(self, other: Union[int, float, "Color"]):
         if isinstance(other, (int, float)):
-            return Color(self.x * other, self.y * other, self.z * other)
+            return _color(self.x * other, self.y * other, self.z * other)
+
+        if isinstance(other, Color):
+            return _color(self.x * other.x, self.y * other.y, self.z * other.z)
+
+        return NotImplemented
 
+    def imul(self, other: Union[int, float, "Color"]) -> "Color":
+        """Scale this color, or blend it with another color, in place."""
         if isinstance(other, Color):
-            return Color(self.x * other.x, self.y * other.y, self.z * other.z)
+            self.x *= other.x
+            self.y *= other.y
+            self.z *= other.z
+            return self
+        return super().imul(other)
+
+    def __repr__(self):
+        return f"Color({self.x}, {self.y}, {self.z})"
+
+    __str__ = __repr__
+
+
+def _color(r: float, g: float, b: float) -> Color:
+    result = _new(Color)
+    result.x = r
+    result.y = g
+    result.z = b
+    result.w = 0
+    return result
@@ -0,0 +1,14 @@
+# raytracer/instrumentation/__init__.py
+
+from .registry import (
+    count,
+    disable,
+    enable,
+    format_report,
+    instrumented,
+    is_enabled,
+    merge,
+    reset,
+    snapshot,
+    stage,
+)
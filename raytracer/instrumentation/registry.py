@@ -0,0 +1,198 @@
+# raytracer/instrumentation/registry.py
+
+"""Opt-in counters and stage timers for the render pipeline.
+
+Instrumentation is off by default. Per-object events (tuple allocations,
+matrix inversions, shape intersection and occlusion tests, canvas writes) are counted by
+probes that ``enable()`` patches into the classes and ``disable()``
+removes again, so the hot paths are untouched while it is off. Per-batch
+events use ``count()`` and ``stage()``, which return immediately when
+disabled.
+
+Counters and timers are per process. Workers send a ``snapshot()`` back to
+the flow, which can ``merge`` the snapshots and log a ``format_report``.
+"""
+
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, List
+
+STAGES = ("ray_generation", "intersection", "shading", "ppm_encoding")
+
+_counters: Dict[str, int] = defaultdict(int)
+_timers: Dict[str, float] = defaultdict(float)
+_enabled = False
+_restore: List[Callable[[], None]] = []
+_NULL_STAGE = nullcontext()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def count(name: str, amount: int = 1) -> None:
+    if _enabled:
+        _counters[name] += amount
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _timers[self.name] += time.perf_counter() - self.start
+        return False
+
+
+def stage(name: str):
+    """Time a block of work under ``name``: ``with stage("shading"): ...``."""
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def reset() -> None:
+    _counters.clear()
+    _timers.clear()
+
+
+def snapshot() -> dict:
+    return {"counters": dict(_counters), "timers": dict(_timers)}
+
+
+def merge(*snapshots: dict) -> dict:
+    counters: Dict[str, int] = defaultdict(int)
+    timers: Dict[str, float] = defaultdict(float)
+    for item in snapshots:
+        for name, value in item.get("counters", {}).items():
+            counters[name] += value
+        for name, value in item.get("timers", {}).items():
+            timers[name] += value
+    return {"counters": dict(counters), "timers": dict(timers)}
+
+
+def format_report(report: dict) -> str:
+    """Render a snapshot as an aligned, human-readable table."""
+    lines = ["Counters:"]
+    for name, value in sorted(report.get("counters", {}).items()):
+        lines.append(f"  {name:24s} {value:>14,d}")
+    timers = report.get("timers", {})
+    total = sum(timers.values())
+    lines.append("Stage timings:")
+    for name in [*STAGES, *sorted(set(timers) - set(STAGES))]:
+        if name in timers:
+            share = timers[name] / total * 100 if total else 0.0
+            lines.append(f"  {name:24s} {timers[name]:12.4f} s {share:6.1f}%")
+    return "\n".join(lines)
+
+
+def enable() -> None:
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    _install_probes()
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+    while _restore:
+        _restore.pop()()
+
+
+@contextmanager
+def instrumented(fresh: bool = True) -> Iterator[None]:
+    """Enable instrumentation for a block, restoring the previous state after."""
+    was_enabled = _enabled
+    if fresh:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def _patch(owner, attribute: str, replacement) -> None:
+    original = owner.__dict__[attribute]
+    setattr(owner, attribute, replacement)
+    _restore.append(lambda: setattr(owner, attribute, original))
+
+
+def _counting(function: Callable, name: str) -> Callable:
+    def probe(*args, **kwargs):
+        _counters[name] += 1
+        return function(*args, **kwargs)
+
+    return probe
+
+
+def _install_probes() -> None:
+    # Imported here so the registry has no import-time dependencies.
+    from raytracer.canvas import Canvas
+    from raytracer.colors import Color, color as color_module
+    from raytracer.matrices import matrix as matrix_module
+    from raytracer.matrices.transformations import transform as transform_module
+    from raytracer.shapes import Shape
+    from raytracer.tuples import Point, Tuple, Vector, factories, tuple as tuple_module
+
+    # Tuples are built either through their constructors or through the
+    # modules' fast ``_new`` helper, so both are probed. Each class defines
+    # its own __init__, so none of them is counted twice.
+    for cls in (Tuple, Point, Vector, Color):
+        _patch(cls, "__init__", _counting(cls.__init__, "tuple_allocations"))
+    for module in (tuple_module, factories, color_module):
+        _patch(module, "_new", _counting(module._new, "tuple_allocations"))
+
+    _patch(matrix_module, "_inverse_4x4", _counting(matrix_module._inverse_4x4, "matrix_inversions"))
+    _patch(matrix_module, "_inverse_nxn", _counting(matrix_module._inverse_nxn, "matrix_inversions"))
+    _patch(transform_module, "_affine_inverse", _counting(transform_module._affine_inverse, "matrix_inversions"))
+
+    intersect = Shape.intersect
+    closest_hit = Shape.closest_hit
+    intersect_batch = Shape.intersect_batch
+    closest_hits = Shape.closest_hits
+    occluded = Shape.occluded
+    occluded_batch = Shape.occluded_batch
+
+    def counting_intersect(self, ray):
+        _counters["intersection_tests"] += 1
+        return intersect(self, ray)
+
+    def counting_closest_hit(self, ray, record):
+        _counters["intersection_tests"] += 1
+        return closest_hit(self, ray, record)
+
+    def counting_intersect_batch(self, batch):
+        _counters["intersection_tests"] += len(batch)
+        return intersect_batch(self, batch)
+
+    def counting_closest_hits(self, batch, t_max=math.inf):
+        _counters["intersection_tests"] += len(batch)
+        return closest_hits(self, batch, t_max)
+
+    def counting_occluded(self, ray, max_t=math.inf):
+        _counters["occlusion_tests"] += 1
+        return occluded(self, ray, max_t)
+
+    def counting_occluded_batch(self, batch, max_t=math.inf):
+        _counters["occlusion_tests"] += len(batch)
+        return occluded_batch(self, batch, max_t)
+
+    _patch(Shape, "intersect", counting_intersect)
+    _patch(Shape, "closest_hit", counting_closest_hit)
+    _patch(Shape, "intersect_batch", counting_intersect_batch)
+    _patch(Shape, "closest_hits", counting_closest_hits)
+    _patch(Shape, "occluded", counting_occluded)
+    _patch(Shape, "occluded_batch", counting_occluded_batch)
+    _patch(Canvas, "write_pixel", _counting(Canvas.write_pixel, "canvas_writes"))
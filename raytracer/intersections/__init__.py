@@ -0,0 +1,4 @@
+# raytracer/intersections/__init__.py
+
+from .intersection import Intersection, intersections, hit
+from .record import HitBuffer, HitRecord
\ No newline at end of file
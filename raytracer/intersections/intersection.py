@@ -0,0 +1,43 @@
+# raytracer/intersections/intersection.py
+
+from typing import List, Optional
+
+
+class Intersection:
+    """The distance ``t`` along a ray at which it meets ``object``.
+
+    Meshes also record which ``face`` was hit and the barycentric ``u``/``v``
+    of the hit on it, for interpolating normals.
+    """
+
+    __slots__ = ("t", "object", "u", "v", "face")
+
+    def __init__(self, t: float, object, u: Optional[float] = None, v: Optional[float] = None,
+                 face: Optional[int] = None):
+        self.t: float = t
+        self.object = object
+        self.u = u
+        self.v = v
+        self.face = face
+
+    def __eq__(self, other):
+        if not isinstance(other, Intersection):
+            return NotImplemented
+        return self.t == other.t and self.object is other.object
+
+    def __repr__(self):
+        return f"Intersection({self.t}, {self.object!r})"
+
+
+def intersections(*xs: Intersection) -> List[Intersection]:
+    """Collect intersections into a list sorted by ``t``."""
+    return sorted(xs, key=lambda x: x.t)
+
+
+def hit(xs: List[Intersection]) -> Optional[Intersection]:
+    """Return the visible intersection: the one with the lowest non-negative t."""
+    result = None
+    for x in xs:
+        if x.t >= 0 and (result is None or x.t < result.t):
+            result = x
+    return result
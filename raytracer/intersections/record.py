@@ -0,0 +1,92 @@
+# raytracer/intersections/record.py
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .intersection import Intersection
+
+
+class HitRecord:
+    """The closest hit found so far along one ray.
+
+    ``t`` starts at the ray's ``t_max`` and only ever shrinks: ``record``
+    keeps a hit at ``0 <= t < self.t`` and ignores the rest, so no list of
+    intersections is built or sorted. The record is meant to be ``reset``
+    and reused from ray to ray. It has the same fields as an
+    ``Intersection`` and can be passed to ``normal_at`` directly.
+    """
+
+    __slots__ = ("t", "object", "u", "v", "face")
+
+    def __init__(self, t_max: float = math.inf):
+        self.reset(t_max)
+
+    def reset(self, t_max: float = math.inf) -> "HitRecord":
+        self.t = t_max
+        self.object = None
+        self.u = None
+        self.v = None
+        self.face = None
+        return self
+
+    def __bool__(self):
+        return self.object is not None
+
+    def __repr__(self):
+        return f"HitRecord({self.t}, {self.object!r})"
+
+    def record(self, t: float, object, u: Optional[float] = None, v: Optional[float] = None,
+               face: Optional[int] = None) -> bool:
+        """Keep the hit if it is closer than the current one; return whether it was."""
+        if not 0 <= t < self.t:
+            return False
+        self.t = t
+        self.object = object
+        self.u = u
+        self.v = v
+        self.face = face
+        return True
+
+    def intersection(self) -> Optional[Intersection]:
+        """A standalone ``Intersection`` for the hit, or None on a miss."""
+        if self.object is None:
+            return None
+        return Intersection(self.t, self.object, self.u, self.v, self.face)
+
+
+class HitBuffer:
+    """Closest-hit slots for a batch of rays, reused from batch to batch.
+
+    ``reset(n, t_max)`` hands out ``(t, index)`` views of length ``n``,
+    filled with ``t_max`` and -1. ``face``, ``u`` and ``v`` are views of the
+    same length for hits on meshes: the face index (-1 for other shapes and
+    misses) and the barycentric coordinates, which only mean something
+    where ``face`` is set. The storage only grows, so the views are
+    overwritten by the next ``reset``; copy them to keep them.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self._allocate(capacity)
+        self.reset(0)
+
+    def _allocate(self, capacity: int) -> None:
+        self._t = np.empty(capacity)
+        self._index = np.empty(capacity, dtype=np.int64)
+        self._face = np.empty(capacity, dtype=np.int64)
+        self._u = np.empty(capacity)
+        self._v = np.empty(capacity)
+
+    def reset(self, n: int, t_max=math.inf) -> Tuple[np.ndarray, np.ndarray]:
+        if n > len(self._t):
+            self._allocate(n)
+        self.t = self._t[:n]
+        self.index = self._index[:n]
+        self.face = self._face[:n]
+        self.u = self._u[:n]
+        self.v = self._v[:n]
+        self.t[...] = t_max
+        self.index.fill(-1)
+        self.face.fill(-1)
+        return self.t, self.index
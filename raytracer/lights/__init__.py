@@ -0,0 +1,3 @@
+# raytracer/lights/__init__.py
+
+from .point_light import PointLight
\ No newline at end of file
@@ -0,0 +1,20 @@
+# raytracer/lights/point_light.py
+
+from raytracer.colors import Color
+from raytracer.tuples import Point
+
+
+class PointLight:
+    """A light with no size that shines ``intensity`` from ``position``."""
+
+    def __init__(self, position: Point, intensity: Color):
+        self.position = position
+        self.intensity = intensity
+
+    def __eq__(self, other):
+        if not isinstance(other, PointLight):
+            return NotImplemented
+        return self.position == other.position and self.intensity == other.intensity
+
+    def __repr__(self):
+        return f"PointLight({self.position!r}, {self.intensity!r})"
@@ -0,0 +1,3 @@
+# raytracer/materials/__init__.py
+
+from .material import Material, MaterialTable
\ No newline at end of file
@@ -0,0 +1,67 @@
+# raytracer/materials/material.py
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from raytracer.colors import Color
+
+
+class Material:
+    """Phong surface parameters: a base ``color`` and the ambient, diffuse and
+    specular weights, with ``shininess`` as the specular exponent.
+
+    ``reflective`` and ``transparency`` weight the light arriving along the
+    mirror and refracted directions; ``refractive_index`` is the index of
+    the material the surface encloses.
+    """
+
+    def __init__(
+        self,
+        color: Optional[Color] = None,
+        ambient: float = 0.1,
+        diffuse: float = 0.9,
+        specular: float = 0.9,
+        shininess: float = 200.0,
+        reflective: float = 0.0,
+        transparency: float = 0.0,
+        refractive_index: float = 1.0,
+    ):
+        self.color = Color(1, 1, 1) if color is None else color
+        self.ambient = ambient
+        self.diffuse = diffuse
+        self.specular = specular
+        self.shininess = shininess
+        self.reflective = reflective
+        self.transparency = transparency
+        self.refractive_index = refractive_index
+
+    def __eq__(self, other):
+        if not isinstance(other, Material):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"Material({', '.join(f'{k}={v!r}' for k, v in vars(self).items())})"
+
+
+class MaterialTable:
+    """Materials unpacked into one array per parameter, for batched shading.
+
+    Row ``i`` of every array belongs to ``materials[i]``, so a hit's material
+    is an integer index rather than an object.
+    """
+
+    def __init__(self, materials: Sequence[Material]):
+        self.materials = list(materials)
+        self.colors = np.array([(m.color.x, m.color.y, m.color.z) for m in self.materials], dtype=np.float64).reshape(-1, 3)
+        self.ambient = np.array([m.ambient for m in self.materials], dtype=np.float64)
+        self.diffuse = np.array([m.diffuse for m in self.materials], dtype=np.float64)
+        self.specular = np.array([m.specular for m in self.materials], dtype=np.float64)
+        self.shininess = np.array([m.shininess for m in self.materials], dtype=np.float64)
+        self.reflective = np.array([m.reflective for m in self.materials], dtype=np.float64)
+        self.transparency = np.array([m.transparency for m in self.materials], dtype=np.float64)
+        self.refractive_index = np.array([m.refractive_index for m in self.materials], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.materials)
@@ -1,16 +1,72 @@
 # raytracer/matrices/matrix.py
 
 import math
-from typing import List
-from raytracer.utils import float_equal
-from raytracer.tuples import Tuple
+from typing import List, Optional
+
+import numpy as np
+
+from raytracer.utils import EPSILON
+from raytracer.tuples import Tuple, Point, Vector
 
 
 class Matrix:
-    def __init__(self, rows: int, columns: int, elements: List[List[float]]):
+    """An immutable matrix backed by a contiguous float64 array.
+
+    Because instances never change, ``inverse()`` and ``transpose()`` are
+    computed once and cached on the instance.
+
+    ``affine`` is true for 4x4 matrices whose bottom row is ``0 0 0 1``. It
+    is detected on construction unless the caller passes it, as the
+    transformation factories do. Products and inverses of affine matrices
+    stay affine. Affine matrices get the short ``transform_point``,
+    ``transform_vector`` and ``transform_normal`` paths.
+    """
+
+    def __init__(self, rows: int, columns: int, elements: List[List[float]], affine: Optional[bool] = None):
+        data = np.array(elements, dtype=np.float64).reshape(rows, columns)
+        data.setflags(write=False)
         self.rows: int = rows
         self.columns: int = columns
-        self.elements: List[List[float]] = elements
+        self.data: np.ndarray = data
+        self.affine: bool = _is_affine(data) if affine is None else affine
+        self._inverse: Optional["Matrix"] = None
+        self._transpose: Optional["Matrix"] = None
+        self._flat: Optional[List[float]] = None
+        self._inverse_transpose: Optional["Matrix"] = None
+
+    @classmethod
+    def from_array(cls, data: np.ndarray, inverse: Optional[np.ndarray] = None) -> "Matrix":
+        """Build a matrix from a copy of a 2D array.
+
+        A known ``inverse`` is cached as it is, so it is never recomputed.
+        """
+        matrix = cls._wrap(np.array(data, dtype=np.float64, order="C"))
+        if inverse is not None:
+            inverted = cls._wrap(np.array(inverse, dtype=np.float64, order="C"), affine=matrix.affine)
+            inverted._inverse = matrix
+            matrix._inverse = inverted
+        return matrix
+
+    @classmethod
+    def _wrap(cls, data: np.ndarray, affine: Optional[bool] = None) -> "Matrix":
+        # Takes ownership of a freshly computed array without copying it.
+        data.setflags(write=False)
+        matrix = cls.__new__(cls)
+        matrix.rows, matrix.columns = data.shape
+        matrix.data = data
+        matrix.affine = _is_affine(data) if affine is None else affine
+        matrix._inverse = None
+        matrix._transpose = None
+        matrix._flat = None
+        matrix._inverse_transpose = None
+        return matrix
+
+    def __fingerprint__(self) -> np.ndarray:
+        return self.data
+
+    @property
+    def elements(self) -> List[List[float]]:
+        return self.data.tolist()
 
     def __eq__(self, other):
         if not isinstance(other, Matrix):
@@ -18,11 +74,7 @@ class Matrix:
         return (
             self.rows == other.rows
             and self.columns == other.columns
-            and all(
-                float_equal(self.elements[row][column], other.elements[row][column])
-                for row in range(self.rows)
-                for column in range(self.columns)
-            )
+            and bool(np.all(np.abs(self.data - other.data) <= EPSILON))
         )
 
     def __mul__(self, other):
@@ -38,16 +90,9 @@ class Matrix:
             raise ValueError(
                 f"Cannot multiply matrices with {self.columns} columns and {other.rows} rows"
             )
-        result = Matrix(
-            self.rows, other.columns, [[0] * other.columns for _ in range(self.rows)]
-        )
-        for row in range(self.rows):
-            for column in range(other.columns):
-                result.elements[row][column] = sum(
-                    self.elements[row][i] * other.elements[i][column]
-                    for i in range(self.columns)
-                )
-        return result
+        if self.affine and other.affine:
+            return Matrix._wrap(self.data @ other.data, affine=True)
+        return Matrix._wrap(self.data @ other.data)
 
     def multiplyTuple(self, other: Tuple):
         if self.columns != 4:
@@ -55,42 +100,82 @@ class Matrix:
                 f"Cannot multiply matrix with {self.columns} columns by tuple"
             )
 
-        result = self.multiplyMatrix(Matrix(4, 1, [[other.x], [other.y], [other.z], [other.w]]))
+        if self.affine:
+            if type(other) is Point:
+                return self.transform_point(other)
+            if type(other) is Vector:
+                return self.transform_vector(other)
+
+        x, y, z, w = (self.data @ (other.x, other.y, other.z, other.w)).tolist()
+
+        return other.derive(x, y, z, w)
+
+    def transform_point(self, point: Tuple) -> Point:
+        """Apply an affine matrix to a point with 12 multiply-adds."""
+        if not self.affine:
+            return self.multiplyTuple(point)
+        a, b, c, d, e, f, g, h, i, j, k, l = self._flat or self._cache_flat()
+        x, y, z = point.x, point.y, point.z
+        return Point(a * x + b * y + c * z + d, e * x + f * y + g * z + h, i * x + j * y + k * z + l)
+
+    def transform_vector(self, vector: Tuple) -> Vector:
+        """Apply an affine matrix to a vector with 9 multiply-adds."""
+        if not self.affine:
+            return self.multiplyTuple(vector)
+        a, b, c, _, e, f, g, _, i, j, k, _ = self._flat or self._cache_flat()
+        x, y, z = vector.x, vector.y, vector.z
+        return Vector(a * x + b * y + c * z, e * x + f * y + g * z, i * x + j * y + k * z)
+
+    def transform_normal(self, normal: Tuple) -> Vector:
+        """Map an object-space normal to world space with ``inverse_transpose()``.
+
+        The result is not normalized.
+        """
+        return self.inverse_transpose().transform_vector(normal)
+
+    def inverse_transpose(self) -> "Matrix":
+        """The matrix that maps normals, cached like ``inverse()``.
+
+        Only the linear part of the inverse is transposed. A normal's w is
+        0, so the translation never contributes, and dropping it keeps the
+        matrix affine for ``transform_vector``.
+        """
+        if self._inverse_transpose is None:
+            linear = np.identity(4)
+            linear[:3, :3] = self.inverse().data[:3, :3].T
+            self._inverse_transpose = Matrix._wrap(linear, affine=True)
+        return self._inverse_transpose
 
-        return Tuple(result.elements[0][0], result.elements[1][0], result.elements[2][0], result.elements[3][0])
+    def _cache_flat(self) -> List[float]:
+        self._flat = self.data[:3].ravel().tolist()
+        return self._flat
 
     def transpose(self):
-        return Matrix(
-            self.columns,
-            self.rows,
-            [[self.elements[row][column] for row in range(self.rows)] for column in range(self.columns)],
-        )
+        if self._transpose is None:
+            transposed = Matrix._wrap(np.ascontiguousarray(self.data.T))
+            transposed._transpose = self
+            self._transpose = transposed
+        return self._transpose
 
     def determinant(self):
         if self.rows != self.columns:
             raise ValueError("Cannot calculate determinant of non-square matrix")
 
         if self.rows == 2:
-            return self.elements[0][0] * self.elements[1][1] - self.elements[0][1] * self.elements[1][0]
+            (a, b), (c, d) = self.data.tolist()
+            return a * d - b * c
+
+        if self.rows == 4:
+            return _determinant_4x4(self.data.ravel().tolist())
 
         return sum(
-            self.elements[0][column] * self.cofactor(0, column)
+            self.data[0, column] * self.cofactor(0, column)
             for column in range(self.columns)
         )
 
     def submatrix(self, row: int, column: int):
-        return Matrix(
-            self.rows - 1,
-            self.columns - 1,
-            [
-                [
-                    self.elements[i][j]
-                    for j in range(self.columns)
-                    if j != column
-                ]
-                for i in range(self.rows)
-                if i != row
-            ],
+        return Matrix._wrap(
+            np.delete(np.delete(self.data, row, axis=0), column, axis=1)
         )
 
     def minor(self, row: int, column: int):
@@ -103,19 +188,95 @@ class Matrix:
         return self.determinant() != 0
 
     def inverse(self):
-        if not self.is_invertible():
-            raise ValueError("Matrix is not invertible")
-
-        determinant = self.determinant()
-
-        return Matrix(
-            self.rows,
-            self.columns,
-            [
-                [
-                    self.cofactor(row, column) / determinant
-                    for column in range(self.columns)
-                ]
-                for row in range(self.rows)
-            ],
-        ).transpose() # Matrix[col, row] = cofactor[row, col] / determinant
\ No newline at end of file
+        if self._inverse is not None:
+            return self._inverse
+
+        if self.rows == 4 and self.columns == 4:
+            inverse = _inverse_4x4(self.data.ravel().tolist())
+            if inverse is None:
+                raise ValueError("Matrix is not invertible")
+            inverted = Matrix._wrap(np.array(inverse).reshape(4, 4), affine=self.affine)
+        else:
+            if not self.is_invertible():
+                raise ValueError("Matrix is not invertible")
+            inverted = Matrix._wrap(_inverse_nxn(self.data))
+
+        inverted._inverse = self
+        self._inverse = inverted
+        return inverted
+
+
+def _is_affine(data: np.ndarray) -> bool:
+    return data.shape == (4, 4) and data[3].tolist() == [0.0, 0.0, 0.0, 1.0]
+
+
+def _inverse_nxn(data: np.ndarray) -> np.ndarray:
+    return np.linalg.inv(data)
+
+
+def _minors_4x4(m: List[float]):
+    """Return the twelve 2x2 minors of the top and bottom row pairs."""
+    a00, a01, a02, a03, a10, a11, a12, a13, a20, a21, a22, a23, a30, a31, a32, a33 = m
+    s = (
+        a00 * a11 - a10 * a01,
+        a00 * a12 - a10 * a02,
+        a00 * a13 - a10 * a03,
+        a01 * a12 - a11 * a02,
+        a01 * a13 - a11 * a03,
+        a02 * a13 - a12 * a03,
+    )
+    c = (
+        a20 * a31 - a30 * a21,
+        a20 * a32 - a30 * a22,
+        a20 * a33 - a30 * a23,
+        a21 * a32 - a31 * a22,
+        a21 * a33 - a31 * a23,
+        a22 * a33 - a32 * a23,
+    )
+    return s, c
+
+
+def _determinant_4x4(m: List[float]) -> float:
+    (s0, s1, s2, s3, s4, s5), (c0, c1, c2, c3, c4, c5) = _minors_4x4(m)
+    return s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0
+
+
+def _inverse_4x4(m: List[float]) -> Optional[List[float]]:
+    """Closed-form 4x4 inverse by Laplace expansion over 2x2 minors.
+
+    Returns None when the matrix is singular.
+    """
+    a00, a01, a02, a03, a10, a11, a12, a13, a20, a21, a22, a23, a30, a31, a32, a33 = m
+    (s0, s1, s2, s3, s4, s5), (c0, c1, c2, c3, c4, c5) = _minors_4x4(m)
+
+    determinant = s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0
+    if determinant == 0 or not math.isfinite(determinant):
+        return None
+    inv = 1.0 / determinant
+
+    if a30 == 0 and a31 == 0 and a32 == 0 and a33 == 1:
+        # The inverse of an affine matrix is affine; keep its bottom row exact.
+        bottom = [0.0, 0.0, 0.0, 1.0]
+    else:
+        bottom = [
+            (-a10 * c3 + a11 * c1 - a12 * c0) * inv,
+            (a00 * c3 - a01 * c1 + a02 * c0) * inv,
+            (-a30 * s3 + a31 * s1 - a32 * s0) * inv,
+            (a20 * s3 - a21 * s1 + a22 * s0) * inv,
+        ]
+
+    return [
+        (a11 * c5 - a12 * c4 + a13 * c3) * inv,
+        (-a01 * c5 + a02 * c4 - a03 * c3) * inv,
+        (a31 * s5 - a32 * s4 + a33 * s3) * inv,
+        (-a21 * s5 + a22 * s4 - a23 * s3) * inv,
+        (-a10 * c5 + a12 * c2 - a13 * c1) * inv,
+        (a00 * c5 - a02 * c2 + a03 * c1) * inv,
+        (-a30 * s5 + a32 * s2 - a33 * s1) * inv,
+        (a20 * s5 - a22 * s2 + a23 * s1) * inv,
+        (a10 * c4 - a11 * c2 + a13 * c0) * inv,
+        (-a00 * c4 + a01 * c2 - a03 * c0) * inv,
+        (a30 * s4 - a31 * s2 + a33 * s0) * inv,
+        (-a20 * s4 + a21 * s2 - a23 * s0) * inv,
+        *bottom,
+    ]
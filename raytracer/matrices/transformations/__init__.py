@@ -3,4 +3,6 @@
 from .scaling import scaling  
 from .shearing import shearing
 from .translation import translation
-from .rotation import rotation_x, rotation_y, rotation_z
\ No newline at end of file
+from .rotation import rotation_x, rotation_y, rotation_z
+from .transform import Transform
+from .view import view_transform
\ No newline at end of file
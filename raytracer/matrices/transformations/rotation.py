@@ -1,31 +1,42 @@
 # raytracer/matrices/transformations/rotation.py
 
+from functools import lru_cache
 from math import cos, sin
+from typing import Tuple
 from raytracer.matrices import Matrix
 
+
+@lru_cache(maxsize=1024)
+def cos_sin(r: float) -> Tuple[float, float]:
+    """Return (cos(r), sin(r)), cached for angles that recur across a scene."""
+    return cos(r), sin(r)
+
 def rotation_x(r):
     """Return a matrix for rotating points around the x-axis."""
+    c, s = cos_sin(r)
     return Matrix(4, 4, [
         [1, 0, 0, 0],
-        [0, cos(r), -sin(r), 0],
-        [0, sin(r), cos(r), 0],
+        [0, c, -s, 0],
+        [0, s, c, 0],
         [0, 0, 0, 1]
-    ])
+    ], affine=True)
 
 def rotation_y(r):
     """Return a matrix for rotating points around the y-axis."""
+    c, s = cos_sin(r)
     return Matrix(4, 4, [
-        [cos(r), 0, sin(r), 0],
+        [c, 0, s, 0],
         [0, 1, 0, 0],
-        [-sin(r), 0, cos(r), 0],
+        [-s, 0, c, 0],
         [0, 0, 0, 1]
-    ])
+    ], affine=True)
 
 def rotation_z(r):
     """Return a matrix for rotating points around the z-axis."""
+    c, s = cos_sin(r)
     return Matrix(4, 4, [
-        [cos(r), -sin(r), 0, 0],
-        [sin(r), cos(r), 0, 0],
+        [c, -s, 0, 0],
+        [s, c, 0, 0],
         [0, 0, 1, 0],
         [0, 0, 0, 1]
-    ])
\ No newline at end of file
+    ], affine=True)
\ No newline at end of file
@@ -9,4 +9,4 @@ def scaling(sx, sy, sz):
         [0, sy, 0, 0],
         [0, 0, sz, 0],
         [0, 0, 0, 1]
-    ])
\ No newline at end of file
+    ], affine=True)
\ No newline at end of file
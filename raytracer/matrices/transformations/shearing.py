@@ -9,4 +9,4 @@ def shearing(xy, xz, yx, yz, zx, zy):
         [yx, 1, yz, 0],
         [zx, zy, 1, 0],
         [0, 0, 0, 1]
-    ])
\ No newline at end of file
+    ], affine=True)
\ No newline at end of file
@@ -0,0 +1,128 @@
+# raytracer/matrices/transformations/transform.py
+
+from typing import Optional, Tuple
+
+from raytracer.matrices import Matrix
+from .rotation import cos_sin
+
+Row = Tuple[float, float, float, float]
+
+
+class Transform:
+    """A fluent builder for affine transformations.
+
+    Each call applies one more transformation after the ones before it, so
+    ``Transform().rotate_x(r).scale(5, 5, 5).translate(10, 5, 7)`` equals
+    ``translation(10, 5, 7) * scaling(5, 5, 5) * rotation_x(r)``. Only the top
+    three rows of the matrix are tracked and each step updates them in
+    closed form, with no 4x4 multiply. Builders are immutable, and the final
+    ``matrix`` and its ``inverse`` are computed once and cached.
+    """
+
+    __slots__ = ("_rows", "_matrix", "_inverse")
+
+    def __init__(self, rows: Optional[Tuple[Row, Row, Row]] = None):
+        self._rows: Tuple[Row, Row, Row] = rows or (
+            (1.0, 0.0, 0.0, 0.0),
+            (0.0, 1.0, 0.0, 0.0),
+            (0.0, 0.0, 1.0, 0.0),
+        )
+        self._matrix: Optional[Matrix] = None
+        self._inverse: Optional[Matrix] = None
+
+    def __repr__(self):
+        return f"Transform({self._rows!r})"
+
+    def __fingerprint__(self):
+        return self._rows
+
+    def translate(self, dx: float, dy: float, dz: float) -> "Transform":
+        (a, b, c, x), (d, e, f, y), (g, h, i, z) = self._rows
+        return Transform(((a, b, c, x + dx), (d, e, f, y + dy), (g, h, i, z + dz)))
+
+    def scale(self, sx: float, sy: float, sz: float) -> "Transform":
+        r0, r1, r2 = self._rows
+        return Transform((_scale(r0, sx), _scale(r1, sy), _scale(r2, sz)))
+
+    def rotate_x(self, r: float) -> "Transform":
+        c, s = cos_sin(r)
+        r0, r1, r2 = self._rows
+        return Transform((r0, _mix(c, r1, -s, r2), _mix(s, r1, c, r2)))
+
+    def rotate_y(self, r: float) -> "Transform":
+        c, s = cos_sin(r)
+        r0, r1, r2 = self._rows
+        return Transform((_mix(c, r0, s, r2), r1, _mix(-s, r0, c, r2)))
+
+    def rotate_z(self, r: float) -> "Transform":
+        c, s = cos_sin(r)
+        r0, r1, r2 = self._rows
+        return Transform((_mix(c, r0, -s, r1), _mix(s, r0, c, r1), r2))
+
+    def shear(self, xy: float, xz: float, yx: float, yz: float, zx: float, zy: float) -> "Transform":
+        r0, r1, r2 = self._rows
+        return Transform((
+            _mix3(1, r0, xy, r1, xz, r2),
+            _mix3(yx, r0, 1, r1, yz, r2),
+            _mix3(zx, r0, zy, r1, 1, r2),
+        ))
+
+    @property
+    def matrix(self) -> Matrix:
+        if self._matrix is None:
+            self._matrix = Matrix(4, 4, [*self._rows, (0.0, 0.0, 0.0, 1.0)], affine=True)
+        return self._matrix
+
+    @property
+    def inverse(self) -> Matrix:
+        if self._inverse is None:
+            matrix = self.matrix
+            inverse = Matrix(4, 4, _affine_inverse(self._rows), affine=True)
+            matrix._inverse = inverse
+            inverse._inverse = matrix
+            self._inverse = inverse
+        return self._inverse
+
+
+def _scale(row: Row, k: float) -> Row:
+    a, b, c, d = row
+    return (a * k, b * k, c * k, d * k)
+
+
+def _mix(k0: float, r0: Row, k1: float, r1: Row) -> Row:
+    a0, b0, c0, d0 = r0
+    a1, b1, c1, d1 = r1
+    return (k0 * a0 + k1 * a1, k0 * b0 + k1 * b1, k0 * c0 + k1 * c1, k0 * d0 + k1 * d1)
+
+
+def _mix3(k0: float, r0: Row, k1: float, r1: Row, k2: float, r2: Row) -> Row:
+    a0, b0, c0, d0 = r0
+    a1, b1, c1, d1 = r1
+    a2, b2, c2, d2 = r2
+    return (
+        k0 * a0 + k1 * a1 + k2 * a2,
+        k0 * b0 + k1 * b1 + k2 * b2,
+        k0 * c0 + k1 * c1 + k2 * c2,
+        k0 * d0 + k1 * d1 + k2 * d2,
+    )
+
+
+def _affine_inverse(rows: Tuple[Row, Row, Row]):
+    """Invert [L | t] as [L^-1 | -L^-1 t] using the 3x3 adjugate."""
+    (a, b, c, x), (d, e, f, y), (g, h, i, z) = rows
+    A = e * i - f * h
+    B = f * g - d * i
+    C = d * h - e * g
+    determinant = a * A + b * B + c * C
+    if determinant == 0:
+        raise ValueError("Matrix is not invertible")
+    k = 1.0 / determinant
+    m00, m01, m02 = A * k, (c * h - b * i) * k, (b * f - c * e) * k
+    m10, m11, m12 = B * k, (a * i - c * g) * k, (c * d - a * f) * k
+    m20, m21, m22 = C * k, (b * g - a * h) * k, (a * e - b * d) * k
+    return [
+        [m00, m01, m02, -(m00 * x + m01 * y + m02 * z)],
+        [m10, m11, m12, -(m10 * x + m11 * y + m12 * z)],
+        [m20, m21, m22, -(m20 * x + m21 * y + m22 * z)],
+        [0.0, 0.0, 0.0, 1.0],
+    ]
@@ -9,4 +9,4 @@ def translation(dx, dy, dz):
         [0, 1, 0, dy],
         [0, 0, 1, dz],
         [0, 0, 0, 1]
-    ])
+    ], affine=True)
@@ -0,0 +1,21 @@
+# raytracer/matrices/transformations/view.py
+
+from raytracer.matrices import Matrix
+
+
+def view_transform(from_point, to, up):
+    """Return the matrix that moves the world so the eye sits at ``from_point``
+    looking toward ``to``, with ``up`` roughly upward."""
+    forward = (to - from_point).normalize()
+    left = forward.cross(up.normalize())
+    true_up = left.cross(forward)
+    fx, fy, fz = from_point.x, from_point.y, from_point.z
+    rows = [
+        [left.x, left.y, left.z],
+        [true_up.x, true_up.y, true_up.z],
+        [-forward.x, -forward.y, -forward.z],
+    ]
+    # The orientation followed by a translation by -from, in closed form.
+    return Matrix(4, 4, [
+        [a, b, c, -(a * fx + b * fy + c * fz)] for a, b, c in rows
+    ] + [[0, 0, 0, 1]], affine=True)
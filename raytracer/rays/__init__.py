@@ -0,0 +1,4 @@
+# raytracer/rays/__init__.py
+
+from .ray import Ray
+from .batch import RayBatch
@@ -0,0 +1,62 @@
+# raytracer/rays/batch.py
+
+from typing import Iterable, Union
+
+import numpy as np
+
+from raytracer.matrices import Matrix
+from raytracer.tuples import Point, Vector
+from .ray import Ray
+
+
+class RayBatch:
+    """N rays stored as contiguous ``(N, 3)`` origin and direction arrays.
+
+    Origins are implicitly points (w = 1) and directions vectors (w = 0), so
+    the homogeneous coordinate is not stored.
+    """
+
+    def __init__(self, origins: np.ndarray, directions: np.ndarray):
+        origins = np.ascontiguousarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.ascontiguousarray(directions, dtype=np.float64).reshape(-1, 3)
+        if origins.shape != directions.shape:
+            raise ValueError(
+                f"Got {len(origins)} origins but {len(directions)} directions"
+            )
+        self.origins: np.ndarray = origins
+        self.directions: np.ndarray = directions
+
+    @classmethod
+    def from_rays(cls, rays: Iterable[Ray]) -> "RayBatch":
+        rays = list(rays)
+        return cls(
+            [(ray.origin.x, ray.origin.y, ray.origin.z) for ray in rays],
+            [(ray.direction.x, ray.direction.y, ray.direction.z) for ray in rays],
+        )
+
+    def __len__(self) -> int:
+        return len(self.origins)
+
+    def __getitem__(self, index: int) -> Ray:
+        ox, oy, oz = self.origins[index].tolist()
+        dx, dy, dz = self.directions[index].tolist()
+        return Ray(Point(ox, oy, oz), Vector(dx, dy, dz))
+
+    def subset(self, index: Union[np.ndarray, slice]) -> "RayBatch":
+        """Return the rays selected by a boolean mask, index array or slice."""
+        return RayBatch(self.origins[index], self.directions[index])
+
+    def transform(self, matrix: Matrix) -> "RayBatch":
+        """Apply an affine 4x4 matrix to every origin and direction at once."""
+        if not matrix.affine:
+            raise ValueError("Rays can only be transformed by affine matrices")
+        m = matrix.data
+        linear = m[:3, :3].T
+        return RayBatch(self.origins @ linear + m[:3, 3], self.directions @ linear)
+
+    def position(self, t: Union[float, np.ndarray]) -> np.ndarray:
+        """Return the ``(N, 3)`` points ``origin + direction * t`` for each ray."""
+        t = np.asarray(t, dtype=np.float64)
+        if t.ndim:
+            t = t[:, np.newaxis]
+        return self.origins + self.directions * t
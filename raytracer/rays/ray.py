@@ -1,5 +1,8 @@
 # raytracer/rays/ray.py
 
+from typing import Optional
+
+from raytracer.intersections import HitRecord
 from raytracer.tuples import Point, Vector
 
 
@@ -11,5 +14,19 @@ class Ray:
     def position(self, t: float) -> Point:
         return self.origin + self.direction * t
 
+    def transform(self, matrix) -> "Ray":
+        return Ray(matrix.transform_point(self.origin), matrix.transform_vector(self.direction))
+
     def intersect(self, shape):
-        return shape.intersect(self)
\ No newline at end of file
+        return shape.intersect(self)
+
+    def closest_hit(self, shape, record: Optional[HitRecord] = None) -> HitRecord:
+        """Record the closest hit with ``shape`` (or a BVH) below ``record.t``."""
+        if record is None:
+            record = HitRecord()
+        shape.closest_hit(self, record)
+        return record
+
+    def occluded(self, shape, max_t: float = float("inf")) -> bool:
+        """Whether ``shape`` (or a BVH) blocks this ray before ``max_t``."""
+        return shape.occluded(self, max_t)
\ No newline at end of file
@@ -0,0 +1,6 @@
+# raytracer/render/__init__.py
+
+from .tiles import Tile, split_tiles, render_tile
+from .shared import SharedBuffer
+from .progressive import RenderPass, iter_progressive, render_progressive, write_preview
+from .sampling import BoxFilter, Filter, GaussianFilter, Sampler, TentFilter
\ No newline at end of file
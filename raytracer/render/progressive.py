@@ -0,0 +1,139 @@
+# raytracer/render/progressive.py
+
+import time
+from typing import Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from raytracer.canvas import Canvas
+from .tiles import Renderer
+
+DEFAULT_INITIAL_BLOCK = 8
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class RenderPass:
+    """What one progressive pass did.
+
+    ``kind`` is ``"coarse"`` for block passes, where each rendered pixel
+    stands in for a ``block`` x ``block`` square, and ``"sample"`` for
+    extra jittered samples over the whole image.
+    """
+
+    __slots__ = ("index", "kind", "block", "pixels", "elapsed")
+
+    def __init__(self, index: int, kind: str, block: int, pixels: int, elapsed: float):
+        self.index = index
+        self.kind = kind
+        self.block = block
+        self.pixels = pixels
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (
+            f"RenderPass({self.index}, {self.kind!r}, block={self.block}, "
+            f"pixels={self.pixels}, elapsed={self.elapsed:.3f})"
+        )
+
+
+def iter_progressive(
+    renderer: Renderer,
+    width: int,
+    height: int,
+    initial_block: int = DEFAULT_INITIAL_BLOCK,
+    extra_samples: int = 0,
+    seed: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[RenderPass, Canvas]]:
+    """Render an image in passes that refine it, yielding after each one.
+
+    The first pass renders one pixel per ``initial_block`` square and fills
+    the square with it. Each later pass halves the block size, rendering
+    only pixels no earlier pass has covered. The block-1 pass completes
+    the image. Each of the ``extra_samples`` passes after that adds one
+    jittered sample to every pixel, averaged with the samples before it.
+
+    The yielded canvas is updated in place by later passes; copy its buffer
+    to keep a pass's image.
+    """
+    if initial_block < 1 or initial_block & (initial_block - 1):
+        raise ValueError(f"Initial block size must be a power of two, got {initial_block}")
+
+    sums = np.zeros((height, width, 3))
+    counts = np.zeros((height, width))
+    canvas = Canvas(width, height)
+    ys, xs = np.mgrid[0:height, 0:width]
+    index = 0
+
+    block = initial_block
+    while block >= 1:
+        start = time.perf_counter()
+        new = (ys % block == 0) & (xs % block == 0) & (counts == 0)
+        py, px = np.nonzero(new)
+        _accumulate(renderer, px, py, px + 0.5, py + 0.5, sums, counts, chunk_size)
+        grid = sums[::block, ::block] / counts[::block, ::block, np.newaxis]
+        canvas.buffer[:] = np.repeat(np.repeat(grid, block, axis=0), block, axis=1)[:height, :width]
+        yield RenderPass(index, "coarse", block, len(px), time.perf_counter() - start), canvas
+        index += 1
+        block //= 2
+
+    rng = np.random.default_rng(seed)
+    py, px = ys.ravel(), xs.ravel()
+    for _ in range(extra_samples):
+        start = time.perf_counter()
+        jitter = rng.random((2, len(px)))
+        _accumulate(renderer, px, py, px + jitter[0], py + jitter[1], sums, counts, chunk_size)
+        canvas.buffer[:] = sums / counts[..., np.newaxis]
+        yield RenderPass(index, "sample", 1, len(px), time.perf_counter() - start), canvas
+        index += 1
+
+
+def render_progressive(
+    renderer: Renderer,
+    width: int,
+    height: int,
+    initial_block: int = DEFAULT_INITIAL_BLOCK,
+    extra_samples: int = 0,
+    seed: int = 0,
+    callback: Optional[Callable[[RenderPass, Canvas], None]] = None,
+    preview_path: Optional[str] = None,
+    preview_size: int = 256,
+) -> Canvas:
+    """Run every progressive pass and return the final canvas.
+
+    After each pass ``callback`` (if given) receives the pass and the canvas.
+    If ``preview_path`` is set, a binary PPM no larger than ``preview_size``
+    pixels a side is written there. It is replaced atomically, so a viewer
+    polling the file never reads a partial image.
+    """
+    canvas = None
+    for render_pass, canvas in iter_progressive(renderer, width, height, initial_block, extra_samples, seed):
+        if preview_path is not None:
+            write_preview(canvas, preview_path, preview_size)
+        if callback is not None:
+            callback(render_pass, canvas)
+    return canvas
+
+
+def write_preview(canvas: Canvas, path: str, max_size: int = 256) -> None:
+    """Write a downscaled binary PPM of the canvas, replacing ``path`` atomically."""
+    factor = max(1, -(-max(canvas.width, canvas.height) // max_size))
+    preview = canvas.downscale(factor) if factor > 1 else canvas
+    preview.save_ppm(path)
+
+
+def _accumulate(
+    renderer: Renderer,
+    px: np.ndarray,
+    py: np.ndarray,
+    sample_x: np.ndarray,
+    sample_y: np.ndarray,
+    sums: np.ndarray,
+    counts: np.ndarray,
+    chunk_size: int,
+) -> None:
+    for start in range(0, len(px), chunk_size):
+        end = start + chunk_size
+        colors = np.asarray(renderer(sample_x[start:end], sample_y[start:end]), dtype=np.float64)
+        sums[py[start:end], px[start:end]] += colors
+        counts[py[start:end], px[start:end]] += 1
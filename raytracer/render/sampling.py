@@ -0,0 +1,189 @@
+# raytracer/render/sampling.py
+
+import math
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .tiles import Renderer, Tile
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class Filter(ABC):
+    """A separable reconstruction filter, zero beyond ``radius`` pixels.
+
+    A sample adds ``weight(dx, dy)`` times its color to every pixel whose
+    center is within ``radius`` of it, and each pixel is divided by its
+    total weight. Subclasses implement the one-dimensional ``profile``.
+    """
+
+    radius = 0.5
+
+    def __init__(self, radius: Optional[float] = None):
+        if radius is not None:
+            self.radius = radius
+
+    @property
+    def margin(self) -> int:
+        """How many pixels beyond a tile's edge can still reach into it."""
+        return max(math.ceil(self.radius - 0.5), 0)
+
+    def weight(self, dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+        return self.profile(dx) * self.profile(dy)
+
+    @abstractmethod
+    def profile(self, d: np.ndarray) -> np.ndarray:
+        """The filter's weight at signed pixel offsets ``d`` along one axis."""
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.radius})"
+
+
+class BoxFilter(Filter):
+    """Averages the samples that fall inside each pixel."""
+
+    def profile(self, d: np.ndarray) -> np.ndarray:
+        return (np.abs(d) <= self.radius).astype(np.float64)
+
+
+class TentFilter(Filter):
+    radius = 1.0
+
+    def profile(self, d: np.ndarray) -> np.ndarray:
+        return np.maximum(1 - np.abs(d) / self.radius, 0)
+
+
+class GaussianFilter(Filter):
+    radius = 1.5
+
+    def __init__(self, radius: Optional[float] = None, alpha: float = 2.0):
+        super().__init__(radius)
+        self.alpha = alpha
+
+    def profile(self, d: np.ndarray) -> np.ndarray:
+        return np.maximum(np.exp(-self.alpha * d * d) - math.exp(-self.alpha * self.radius ** 2), 0)
+
+
+FILTERS = {"box": BoxFilter, "tent": TentFilter, "gaussian": GaussianFilter}
+
+
+class Sampler:
+    """Renders tiles with stratified, jittered supersampling.
+
+    Each pixel is split into ``samples`` x ``samples`` strata with one
+    jittered sample in each, and all the samples of a tile go to the renderer
+    as one batch. Samples are combined by a reconstruction ``filter`` in
+    float64. Filters wider than a pixel also sample a margin around the tile,
+    so tiles join up without seams.
+
+    With a ``threshold``, sampling is adaptive: after each round, pixels
+    whose estimated standard error (the largest over the three channels) is
+    below the threshold stop. The others get another round, up to
+    ``max_rounds``. The jitter is seeded from ``seed`` and the tile's
+    position, so a tile renders the same wherever it runs.
+    """
+
+    def __init__(
+        self,
+        samples: int = 2,
+        filter: Union[str, Filter] = "box",
+        threshold: Optional[float] = None,
+        max_rounds: int = 4,
+        seed: int = 0,
+    ):
+        if samples < 1:
+            raise ValueError(f"Samples per axis must be positive, got {samples}")
+        self.samples = samples
+        self.filter = FILTERS[filter]() if isinstance(filter, str) else filter
+        self.threshold = threshold
+        self.max_rounds = max_rounds
+        self.seed = seed
+
+    def render_tile(self, renderer: Renderer, tile: Tile) -> np.ndarray:
+        """Render one tile to a ``(tile.height, tile.width, 3)`` array."""
+        margin = self.filter.margin
+        x0, y0 = tile.x0 - margin, tile.y0 - margin
+        shape = (tile.height + 2 * margin, tile.width + 2 * margin)
+        sums = np.zeros((tile.height * tile.width, 3))
+        weights = np.zeros(tile.height * tile.width)
+        # Per-pixel sample statistics over the tile and its margin, for the adaptive test.
+        count = np.zeros(shape)
+        total = np.zeros(shape + (3,))
+        total_sq = np.zeros(shape + (3,))
+        active = np.ones(shape, dtype=bool)
+        rng = np.random.default_rng([self.seed, tile.x0, tile.y0])
+        per_pixel = self.samples * self.samples
+
+        for _ in range(1 if self.threshold is None else self.max_rounds):
+            ry, rx = np.nonzero(active)
+            sx, sy = self.stratified(rx + x0, ry + y0, rng)
+            colors = _evaluate(renderer, sx, sy)
+            self._splat(tile, sx, sy, colors, sums, weights)
+
+            own = colors.reshape(len(rx), per_pixel, 3)
+            count[ry, rx] += per_pixel
+            total[ry, rx] += own.sum(axis=1)
+            total_sq[ry, rx] += np.einsum("ijk,ijk->ik", own, own)
+            if self.threshold is None:
+                break
+            active &= _standard_error(count, total, total_sq) >= self.threshold
+            if not active.any():
+                break
+
+        return (sums / weights[:, np.newaxis]).reshape(tile.height, tile.width, 3)
+
+    def stratified(self, px: np.ndarray, py: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """Jittered sample positions for integer pixels, grouped by pixel."""
+        n = self.samples
+        strata = np.arange(n * n)
+        jitter = rng.random((2, len(px), n * n))
+        sx = px[:, np.newaxis] + (strata % n + jitter[0]) / n
+        sy = py[:, np.newaxis] + (strata // n + jitter[1]) / n
+        return sx.ravel(), sy.ravel()
+
+    def _splat(
+        self, tile: Tile, sx: np.ndarray, sy: np.ndarray, colors: np.ndarray, sums: np.ndarray, weights: np.ndarray
+    ) -> None:
+        margin = self.filter.margin
+        ix = np.floor(sx).astype(np.int64)
+        iy = np.floor(sy).astype(np.int64)
+        size = len(weights)
+        for oy in range(-margin, margin + 1):
+            for ox in range(-margin, margin + 1):
+                qx = ix + ox
+                qy = iy + oy
+                w = self.filter.weight(sx - (qx + 0.5), sy - (qy + 0.5))
+                tx = qx - tile.x0
+                ty = qy - tile.y0
+                keep = (w > 0) & (tx >= 0) & (tx < tile.width) & (ty >= 0) & (ty < tile.height)
+                flat = ty[keep] * tile.width + tx[keep]
+                w = w[keep]
+                weights += np.bincount(flat, w, minlength=size)
+                for channel in range(3):
+                    sums[:, channel] += np.bincount(flat, w * colors[keep, channel], minlength=size)
+
+    def __repr__(self):
+        return (
+            f"Sampler({self.samples}, {self.filter!r}, threshold={self.threshold}, "
+            f"max_rounds={self.max_rounds}, seed={self.seed})"
+        )
+
+
+def _evaluate(renderer: Renderer, sx: np.ndarray, sy: np.ndarray) -> np.ndarray:
+    if len(sx) <= DEFAULT_CHUNK_SIZE:
+        return np.asarray(renderer(sx, sy), dtype=np.float64)
+    return np.concatenate([
+        np.asarray(renderer(sx[i:i + DEFAULT_CHUNK_SIZE], sy[i:i + DEFAULT_CHUNK_SIZE]), dtype=np.float64)
+        for i in range(0, len(sx), DEFAULT_CHUNK_SIZE)
+    ])
+
+
+def _standard_error(count: np.ndarray, total: np.ndarray, total_sq: np.ndarray) -> np.ndarray:
+    """Largest per-channel standard error of each pixel's mean; inf with under two samples."""
+    n = count[..., np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = np.maximum(total_sq - total * total / n, 0) / (n - 1)
+        error = np.sqrt(variance / n).max(axis=-1)
+    return np.where(count > 1, error, np.inf)
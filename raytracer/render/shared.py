@@ -0,0 +1,89 @@
+# raytracer/render/shared.py
+
+import os
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from raytracer.canvas import Canvas
+
+# The segment starts with the owner's resource tracker id (see _attach),
+# padded so the pixels stay 8-byte aligned.
+_HEADER = struct.Struct("qq")
+
+
+class SharedBuffer:
+    """A ``(height, width, 3)`` float64 pixel buffer in shared memory.
+
+    The creating process owns the segment and unlinks it on close; worker
+    processes attach by name and write their tiles straight into it, so no
+    pixel data is pickled on the way back. The segment is only visible on
+    the host that created it.
+    """
+
+    def __init__(self, width: int, height: int, name: Optional[str] = None):
+        self.width = width
+        self.height = height
+        self.owner = name is None
+        size = _HEADER.size + width * height * 3 * np.dtype(np.float64).itemsize
+        if self.owner:
+            self._memory = shared_memory.SharedMemory(create=True, size=size)
+            _HEADER.pack_into(self._memory.buf, 0, *_tracker_id())
+        else:
+            self._memory = _attach(name)
+        self.array: np.ndarray = np.ndarray(
+            (height, width, 3), dtype=np.float64, buffer=self._memory.buf, offset=_HEADER.size
+        )
+        if self.owner:
+            self.array.fill(0)
+
+    @classmethod
+    def attach(cls, name: str, width: int, height: int) -> "SharedBuffer":
+        return cls(width, height, name=name)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def to_canvas(self) -> Canvas:
+        """Copy the shared pixels into a regular, process-local Canvas."""
+        return Canvas.from_buffer(self.array.copy())
+
+    def close(self) -> None:
+        # Drop the array view first; the segment can't close while exported.
+        del self.array
+        self._memory.close()
+        if self.owner:
+            self._memory.unlink()
+
+    def __enter__(self) -> "SharedBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the segment with this
+        # process's resource tracker, which would unlink it when the worker
+        # exits even though the owner still uses it. Processes that share
+        # the owner's tracker (the owner itself, and workers it started)
+        # must leave the registration alone: it is the owner's, and its
+        # unlink() removes it.
+        memory = shared_memory.SharedMemory(name=name)
+        if _HEADER.unpack_from(memory.buf, 0) != _tracker_id():
+            resource_tracker.unregister(memory._name, "shared_memory")
+        return memory
+
+
+def _tracker_id() -> Tuple[int, int]:
+    """Identifies this process's resource tracker by the pipe it talks to it on."""
+    if os.name != "posix":
+        return (0, 0)
+    info = os.fstat(resource_tracker.getfd())
+    return (info.st_dev, info.st_ino)
@@ -0,0 +1,67 @@
+# raytracer/render/tiles.py
+
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+# A renderer maps arrays of continuous pixel coordinates (pixel centers sit
+# at x + 0.5, y + 0.5) to an (N, 3) array of linear RGB colors.
+Renderer = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+DEFAULT_TILE_SIZE = 32
+
+
+class Tile:
+    """A rectangular block of pixels, ``[x0, x1) x [y0, y1)``."""
+
+    __slots__ = ("x0", "y0", "x1", "y1")
+
+    def __init__(self, x0: int, y0: int, x1: int, y1: int):
+        self.x0 = x0
+        self.y0 = y0
+        self.x1 = x1
+        self.y1 = y1
+
+    @property
+    def width(self) -> int:
+        return self.x1 - self.x0
+
+    @property
+    def height(self) -> int:
+        return self.y1 - self.y0
+
+    def pixel_centers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return flat, row-major arrays of the tile's pixel center coordinates."""
+        xs = np.arange(self.x0, self.x1, dtype=np.float64) + 0.5
+        ys = np.arange(self.y0, self.y1, dtype=np.float64) + 0.5
+        px, py = np.meshgrid(xs, ys)
+        return px.ravel(), py.ravel()
+
+    def __eq__(self, other):
+        if not isinstance(other, Tile):
+            return NotImplemented
+        return (self.x0, self.y0, self.x1, self.y1) == (other.x0, other.y0, other.x1, other.y1)
+
+    def __hash__(self):
+        return hash((self.x0, self.y0, self.x1, self.y1))
+
+    def __repr__(self):
+        return f"Tile({self.x0}, {self.y0}, {self.x1}, {self.y1})"
+
+
+def split_tiles(width: int, height: int, tile_size: int = DEFAULT_TILE_SIZE) -> List[Tile]:
+    """Cover a width x height image with row-major tiles of at most tile_size pixels a side."""
+    if tile_size < 1:
+        raise ValueError(f"Tile size must be positive, got {tile_size}")
+    return [
+        Tile(x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in range(0, height, tile_size)
+        for x in range(0, width, tile_size)
+    ]
+
+
+def render_tile(renderer: Renderer, tile: Tile) -> np.ndarray:
+    """Render one tile to a ``(tile.height, tile.width, 3)`` array."""
+    px, py = tile.pixel_centers()
+    colors = np.asarray(renderer(px, py), dtype=np.float64)
+    return colors.reshape(tile.height, tile.width, 3)
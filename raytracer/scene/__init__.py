@@ -0,0 +1,5 @@
+# raytracer/scene/__init__.py
+
+from .description import parse_scene, read_scene
+from .compiled import CompiledScene
+from .loader import compile_scene, load_scene
\ No newline at end of file
@@ -0,0 +1,25 @@
+# raytracer/scene/__main__.py
+
+"""Compile a JSON scene for render workers: ``python -m raytracer.scene --help``."""
+
+import argparse
+import os
+import sys
+
+from .loader import compile_scene
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m raytracer.scene", description=__doc__)
+    parser.add_argument("source", help="JSON scene description")
+    parser.add_argument("-o", "--output", help="where to write the compiled scene (default: SOURCE with .npz)")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.splitext(args.source)[0] + ".npz"
+    scene = compile_scene(args.source, output)
+    print(f"{len(scene.arrays['kinds'])} objects compiled to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+# raytracer/scene/compiled.py
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from raytracer.bvh import BVH
+from raytracer.camera import Camera
+from raytracer.colors import Color
+from raytracer.lights import PointLight
+from raytracer.materials import Material
+from raytracer.matrices import Matrix
+from raytracer.shapes import Mesh, Shape, Sphere
+from raytracer.tuples import Point
+from raytracer.world import SceneRenderer, World
+from .description import MATERIAL_FIELDS
+
+SPHERE = 0
+MESH = 1
+
+_NODE_FIELDS = ("node_min", "node_max", "node_start", "node_count")
+_WORLD_SETTINGS = ("max_depth", "roulette_depth", "seed")
+
+
+class CompiledScene:
+    """A scene flattened into named numpy arrays, ready to save and reload.
+
+    Every shape's transform is stored next to its inverse, and the scene's
+    BVH and each mesh's triangle BVH are stored as built. Rebuilding the
+    objects from the arrays then inverts no matrices and builds no trees.
+    Meshes share concatenated vertex, face and node arrays addressed by
+    per-mesh offsets. Triangles come back as one-face meshes. The world's
+    tracing settings (``max_depth``, ``roulette_depth``, ``seed``) are kept.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+
+    def __fingerprint__(self):
+        return self.arrays
+
+    @classmethod
+    def from_objects(
+        cls, objects: Sequence[Shape], lights: Sequence[PointLight] = (), camera: Optional[Camera] = None
+    ) -> "CompiledScene":
+        return cls.from_world(World(objects, lights), camera)
+
+    @classmethod
+    def from_world(cls, world: World, camera: Optional[Camera] = None) -> "CompiledScene":
+        objects = world.objects
+        lights = world.lights
+        arrays: Dict[str, np.ndarray] = {}
+        arrays["world_settings"] = np.array([getattr(world, name) for name in _WORLD_SETTINGS], dtype=np.int64)
+
+        kinds = []
+        materials: List[Material] = []
+        material_rows: Dict[int, int] = {}
+        material_index = []
+        meshes: List[Mesh] = []
+        mesh_shape = []
+        for shape in objects:
+            if type(shape) is Sphere:
+                kinds.append(SPHERE)
+                mesh_shape.append(-1)
+            elif isinstance(shape, Mesh):
+                kinds.append(MESH)
+                mesh_shape.append(len(meshes))
+                meshes.append(shape)
+            else:
+                raise ValueError(f"Can't compile a {type(shape).__name__}")
+            row = material_rows.setdefault(id(shape.material), len(materials))
+            if row == len(materials):
+                materials.append(shape.material)
+            material_index.append(row)
+
+        arrays["kinds"] = np.array(kinds, dtype=np.int8)
+        arrays["transforms"] = np.array([shape.transform.data for shape in objects]).reshape(-1, 4, 4)
+        arrays["inverses"] = np.array([shape.inverse_transform.data for shape in objects]).reshape(-1, 4, 4)
+        arrays["material_index"] = np.array(material_index, dtype=np.int64)
+        arrays["material_colors"] = np.array(
+            [(m.color.x, m.color.y, m.color.z) for m in materials], dtype=np.float64
+        ).reshape(-1, 3)
+        for field in MATERIAL_FIELDS:
+            arrays[f"material_{field}"] = np.array([getattr(m, field) for m in materials], dtype=np.float64)
+        arrays["mesh_shape"] = np.array(mesh_shape, dtype=np.int64)
+        arrays.update(_pack_meshes(meshes))
+        for field, values in zip((*_NODE_FIELDS, "indices"), world.bvh.nodes()):
+            arrays[f"bvh_{field}"] = values
+
+        arrays["light_positions"] = np.array(
+            [(l.position.x, l.position.y, l.position.z) for l in lights], dtype=np.float64
+        ).reshape(-1, 3)
+        arrays["light_intensities"] = np.array(
+            [(l.intensity.x, l.intensity.y, l.intensity.z) for l in lights], dtype=np.float64
+        ).reshape(-1, 3)
+        if camera is not None:
+            arrays["camera_size"] = np.array([camera.hsize, camera.vsize], dtype=np.int64)
+            arrays["camera_field_of_view"] = np.array(camera.field_of_view, dtype=np.float64)
+            arrays["camera_transform"] = camera.transform.data
+            arrays["camera_inverse"] = camera.inverse_transform.data
+        return cls(arrays)
+
+    def save(self, path) -> None:
+        """Write the arrays to an uncompressed ``.npz`` file."""
+        np.savez(path, **self.arrays)
+
+    @classmethod
+    def load(cls, path) -> "CompiledScene":
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def objects(self) -> List[Shape]:
+        a = self.arrays
+        # Files compiled before a field existed leave it at its default.
+        fields = [field for field in MATERIAL_FIELDS if f"material_{field}" in a]
+        materials = [
+            Material(Color(*color), **dict(zip(fields, params)))
+            for color, *params in zip(a["material_colors"].tolist(), *(a[f"material_{field}"].tolist() for field in fields))
+        ]
+        objects: List[Shape] = []
+        for i, (kind, row, mesh) in enumerate(zip(a["kinds"].tolist(), a["material_index"].tolist(), a["mesh_shape"].tolist())):
+            transform = Matrix.from_array(a["transforms"][i], a["inverses"][i])
+            if kind == SPHERE:
+                objects.append(Sphere(transform, materials[row]))
+            else:
+                objects.append(self._mesh(mesh, transform, materials[row]))
+        return objects
+
+    def lights(self) -> List[PointLight]:
+        return [
+            PointLight(Point(*position), Color(*intensity))
+            for position, intensity in zip(
+                self.arrays["light_positions"].tolist(), self.arrays["light_intensities"].tolist()
+            )
+        ]
+
+    def camera(self) -> Optional[Camera]:
+        a = self.arrays
+        if "camera_size" not in a:
+            return None
+        hsize, vsize = a["camera_size"].tolist()
+        transform = Matrix.from_array(a["camera_transform"], a["camera_inverse"])
+        return Camera(hsize, vsize, float(a["camera_field_of_view"]), transform)
+
+    def world(self) -> World:
+        """The scene's objects and lights, with the saved BVH."""
+        objects = self.objects()
+        nodes = tuple(self.arrays[f"bvh_{field}"] for field in (*_NODE_FIELDS, "indices"))
+        # Scenes compiled before the settings were stored take the defaults.
+        settings = {}
+        if "world_settings" in self.arrays:
+            settings = dict(zip(_WORLD_SETTINGS, self.arrays["world_settings"].tolist()))
+        return World(objects, self.lights(), BVH(objects, nodes=nodes), **settings)
+
+    def renderer(self) -> SceneRenderer:
+        camera = self.camera()
+        if camera is None:
+            raise ValueError("The scene has no camera")
+        return SceneRenderer(self.world(), camera)
+
+    def _mesh(self, k: int, transform: Matrix, material: Material) -> Mesh:
+        a = self.arrays
+        v0, v1 = a["mesh_vertex_offsets"][k:k + 2].tolist()
+        f0, f1 = a["mesh_face_offsets"][k:k + 2].tolist()
+        n0, n1 = a["mesh_normal_offsets"][k:k + 2].tolist()
+        b0, b1 = a["mesh_node_offsets"][k:k + 2].tolist()
+        smooth = bool(a["mesh_smooth"][k])
+        nodes = (*(a[f"mesh_{field}"][b0:b1] for field in _NODE_FIELDS), a["mesh_indices"][f0:f1])
+        return Mesh(
+            a["mesh_vertices"][v0:v1], a["mesh_faces"][f0:f1],
+            a["mesh_normals"][n0:n1] if smooth else None, a["mesh_normal_faces"][f0:f1] if smooth else None,
+            transform, int(a["mesh_leaf_size"][k]), material, bvh_nodes=nodes,
+        )
+
+
+def _pack_meshes(meshes: List[Mesh]) -> Dict[str, np.ndarray]:
+    trees = [mesh.bvh.nodes() for mesh in meshes]
+    smooth = [mesh.normals is not None for mesh in meshes]
+    normals = [mesh.normals if mesh.normals is not None else np.zeros((0, 3)) for mesh in meshes]
+    normal_faces = [
+        mesh.normal_faces if mesh.normal_faces is not None else np.full_like(mesh.faces, -1) for mesh in meshes
+    ]
+    arrays = {
+        "mesh_smooth": np.array(smooth, dtype=bool),
+        "mesh_leaf_size": np.array([mesh.max_leaf_size for mesh in meshes], dtype=np.int64),
+        "mesh_vertices": _concatenate([mesh.vertices for mesh in meshes], (0, 3), np.float64),
+        "mesh_faces": _concatenate([mesh.faces for mesh in meshes], (0, 3), np.int64),
+        "mesh_normals": _concatenate(normals, (0, 3), np.float64),
+        "mesh_normal_faces": _concatenate(normal_faces, (0, 3), np.int64),
+        "mesh_indices": _concatenate([tree[4] for tree in trees], (0,), np.int64),
+        "mesh_vertex_offsets": _offsets([len(mesh.vertices) for mesh in meshes]),
+        "mesh_face_offsets": _offsets([len(mesh.faces) for mesh in meshes]),
+        "mesh_normal_offsets": _offsets([len(n) for n in normals]),
+        "mesh_node_offsets": _offsets([len(tree[3]) for tree in trees]),
+    }
+    for i, field in enumerate(_NODE_FIELDS):
+        shape = (0, 3) if field in ("node_min", "node_max") else (0,)
+        dtype = np.float64 if shape == (0, 3) else np.int64
+        arrays[f"mesh_{field}"] = _concatenate([tree[i] for tree in trees], shape, dtype)
+    return arrays
+
+
+def _concatenate(parts: List[np.ndarray], empty_shape, dtype) -> np.ndarray:
+    if not parts:
+        return np.zeros(empty_shape, dtype=dtype)
+    return np.concatenate(parts).astype(dtype, copy=False)
+
+
+def _offsets(lengths: List[int]) -> np.ndarray:
+    return np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64)
@@ -0,0 +1,148 @@
+# raytracer/scene/description.py
+
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from raytracer.camera import Camera
+from raytracer.colors import Color
+from raytracer.lights import PointLight
+from raytracer.materials import Material
+from raytracer.matrices import Matrix
+from raytracer.matrices.transformations import Transform, view_transform
+from raytracer.shapes import Mesh, Shape, Sphere, Triangle, load_obj
+from raytracer.tuples import Point, Vector
+
+# Steps of an object's "transform" list, applied in order, and how many
+# numbers each one takes.
+TRANSFORM_STEPS = {
+    "translate": 3,
+    "scale": 3,
+    "rotate_x": 1,
+    "rotate_y": 1,
+    "rotate_z": 1,
+    "shear": 6,
+}
+MATERIAL_FIELDS = (
+    "ambient", "diffuse", "specular", "shininess", "reflective", "transparency", "refractive_index",
+)
+
+
+def read_scene(path: str) -> Tuple[List[Shape], List[PointLight], Optional[Camera]]:
+    """Read a JSON scene file; mesh files are found relative to it."""
+    with open(path) as f:
+        description = json.load(f)
+    return parse_scene(description, os.path.dirname(os.path.abspath(path)))
+
+
+def parse_scene(
+    description: Dict[str, Any], base_dir: str = "."
+) -> Tuple[List[Shape], List[PointLight], Optional[Camera]]:
+    """Build the objects, lights and camera of a scene description.
+
+    The description is a dict, normally read from JSON::
+
+        {
+          "camera": {"width": 320, "height": 240, "field_of_view": 1.0472,
+                     "from": [0, 1.5, -5], "to": [0, 1, 0], "up": [0, 1, 0]},
+          "lights": [{"position": [-10, 10, -10], "intensity": [1, 1, 1]}],
+          "materials": {"red": {"color": [1, 0, 0], "specular": 0.3}},
+          "objects": [
+            {"type": "sphere", "material": "red",
+             "transform": [["scale", 0.5, 0.5, 0.5], ["translate", 1, 0.5, 0]]},
+            {"type": "mesh", "file": "teapot.obj", "material": {"diffuse": 0.6}},
+            {"type": "triangle", "points": [[0, 1, 0], [-1, 0, 0], [1, 0, 0]]}
+          ]
+        }
+
+    Transform steps apply in order and angles are in radians. Materials are
+    given by name or inline, and missing fields take ``Material`` defaults.
+    Meshes come from an OBJ ``file`` or inline ``vertices`` and ``faces``.
+    Mistakes raise ``ValueError`` naming the offending entry.
+    """
+    materials = {
+        name: _material(entry, f"materials.{name}")
+        for name, entry in description.get("materials", {}).items()
+    }
+    objects = [
+        _object(entry, materials, base_dir, f"objects[{i}]")
+        for i, entry in enumerate(description.get("objects", []))
+    ]
+    lights = [
+        PointLight(Point(*_triple(entry, "position", f"lights[{i}]")), Color(*_triple(entry, "intensity", f"lights[{i}]")))
+        for i, entry in enumerate(description.get("lights", []))
+    ]
+    camera = _camera(description["camera"]) if "camera" in description else None
+    return objects, lights, camera
+
+
+def _object(entry: Dict[str, Any], materials: Dict[str, Material], base_dir: str, where: str) -> Shape:
+    transform = _transform(entry.get("transform", []), where)
+    material = entry.get("material")
+    if isinstance(material, str):
+        if material not in materials:
+            raise ValueError(f"Scene {where}: unknown material {material!r}")
+        material = materials[material]
+    elif material is not None:
+        material = _material(material, f"{where}.material")
+
+    kind = entry.get("type")
+    if kind == "sphere":
+        return Sphere(transform, material)
+    if kind == "triangle":
+        points = entry.get("points")
+        if not isinstance(points, list) or len(points) != 3:
+            raise ValueError(f"Scene {where}: a triangle needs three points")
+        return Triangle(*(Point(*p) for p in points), transform=transform, material=material)
+    if kind == "mesh":
+        if "file" in entry:
+            mesh = load_obj(os.path.join(base_dir, entry["file"]), transform)
+            if material is not None:
+                mesh.material = material
+            return mesh
+        if "vertices" in entry and "faces" in entry:
+            return Mesh(
+                entry["vertices"], entry["faces"], entry.get("normals"), entry.get("normal_faces"),
+                transform=transform, material=material,
+            )
+        raise ValueError(f"Scene {where}: a mesh needs a file or vertices and faces")
+    raise ValueError(f"Scene {where}: unknown object type {kind!r}")
+
+
+def _transform(steps: List[List[Any]], where: str) -> Matrix:
+    transform = Transform()
+    for step in steps:
+        if not isinstance(step, list) or not step or TRANSFORM_STEPS.get(step[0]) != len(step) - 1:
+            raise ValueError(f"Scene {where}: bad transform step {step!r}")
+        name, *args = step
+        transform = getattr(transform, name)(*args)
+    return transform.matrix
+
+
+def _material(entry: Dict[str, Any], where: str) -> Material:
+    unknown = set(entry) - {"color", *MATERIAL_FIELDS}
+    if unknown:
+        raise ValueError(f"Scene {where}: unknown material fields {sorted(unknown)}")
+    fields = {name: entry[name] for name in MATERIAL_FIELDS if name in entry}
+    if "color" in entry:
+        fields["color"] = Color(*_triple(entry, "color", where))
+    return Material(**fields)
+
+
+def _camera(entry: Dict[str, Any]) -> Camera:
+    if "width" not in entry or "height" not in entry:
+        raise ValueError("Scene camera: width and height are required")
+    transform = view_transform(
+        Point(*_triple(entry, "from", "camera")),
+        Point(*_triple(entry, "to", "camera")),
+        Vector(*entry.get("up", (0, 1, 0))),
+    )
+    return Camera(int(entry["width"]), int(entry["height"]), float(entry.get("field_of_view", math.pi / 3)), transform)
+
+
+def _triple(entry: Dict[str, Any], key: str, where: str) -> Tuple[float, float, float]:
+    value = entry.get(key)
+    if not isinstance(value, (list, tuple)) or len(value) != 3:
+        raise ValueError(f"Scene {where}: {key} must be three numbers")
+    return tuple(float(x) for x in value)
@@ -0,0 +1,21 @@
+# raytracer/scene/loader.py
+
+import os
+
+from .compiled import CompiledScene
+from .description import read_scene
+
+
+def load_scene(path: str) -> CompiledScene:
+    """Load a compiled ``.npz`` scene, or compile a JSON scene description."""
+    if os.path.splitext(path)[1] == ".npz":
+        return CompiledScene.load(path)
+    objects, lights, camera = read_scene(path)
+    return CompiledScene.from_objects(objects, lights, camera)
+
+
+def compile_scene(source: str, destination: str) -> CompiledScene:
+    """Compile a JSON scene description and save it as ``.npz``."""
+    scene = load_scene(source)
+    scene.save(destination)
+    return scene
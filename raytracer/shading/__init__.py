@@ -0,0 +1,4 @@
+# raytracer/shading/__init__.py
+
+from .lighting import lighting
+from .fresnel import reflect, refract
\ No newline at end of file
@@ -0,0 +1,34 @@
+# raytracer/shading/fresnel.py
+
+from typing import Tuple
+
+import numpy as np
+
+
+def reflect(directions: np.ndarray, normals: np.ndarray) -> np.ndarray:
+    """Mirror ``(..., 3)`` directions about unit normals."""
+    return directions - normals * (2 * np.einsum("...i,...i->...", directions, normals))[..., np.newaxis]
+
+
+def refract(eyev: np.ndarray, normals: np.ndarray, n1, n2) -> Tuple[np.ndarray, np.ndarray]:
+    """Refracted directions and Schlick reflectances for a batch of hits.
+
+    ``eyev`` and ``normals`` are ``(..., 3)`` unit vectors on the same side
+    of the surface; ``n1`` and ``n2`` are the refractive indices the ray
+    leaves and enters. Where light is totally internally reflected the
+    reflectance is 1 and the direction is meaningless.
+    """
+    n1 = np.asarray(n1, dtype=np.float64)
+    n2 = np.asarray(n2, dtype=np.float64)
+    ratio = n1 / n2
+    cos_i = np.einsum("...i,...i->...", eyev, normals)
+    sin2_t = ratio * ratio * (1 - cos_i * cos_i)
+    total = sin2_t > 1
+    cos_t = np.sqrt(np.maximum(1 - sin2_t, 0))
+    directions = normals * (ratio * cos_i - cos_t)[..., np.newaxis] - eyev * ratio[..., np.newaxis]
+
+    # Schlick's approximation uses the angle on the denser side.
+    cos = np.where(n1 > n2, cos_t, cos_i)
+    r0 = ((n1 - n2) / (n1 + n2)) ** 2
+    reflectance = np.where(total, 1.0, r0 + (1 - r0) * (1 - cos) ** 5)
+    return directions, reflectance
@@ -0,0 +1,62 @@
+# raytracer/shading/lighting.py
+
+from typing import Optional
+
+import numpy as np
+
+from raytracer.lights import PointLight
+from raytracer.materials import MaterialTable
+
+
+def lighting(
+    materials: MaterialTable,
+    material_index,
+    light: PointLight,
+    points: np.ndarray,
+    eyev: np.ndarray,
+    normals: np.ndarray,
+    in_shadow: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None,
+    accumulate: bool = False,
+) -> np.ndarray:
+    """Phong-shade a batch of hits lit by one point light.
+
+    ``points``, ``eyev`` and ``normals`` are ``(..., 3)`` arrays, the last two
+    of unit vectors. ``material_index`` picks each hit's row of ``materials``
+    and ``in_shadow`` marks hits that only get the ambient term; both have
+    the leading shape (or are scalars). Colors are written to ``out``, or
+    added to it with ``accumulate``, so a canvas region can take them
+    directly. Every term is computed on whole arrays.
+    """
+    index = np.asarray(material_index)
+    intensity = np.array([light.intensity.x, light.intensity.y, light.intensity.z])
+    position = np.array([light.position.x, light.position.y, light.position.z])
+
+    lightv = position - points
+    lightv /= np.sqrt(np.einsum("...i,...i->...", lightv, lightv))[..., np.newaxis]
+    light_dot_normal = np.einsum("...i,...i->...", lightv, normals)
+    lit = light_dot_normal >= 0
+    if in_shadow is not None:
+        lit &= ~np.asarray(in_shadow)
+
+    # reflect(-lightv, normal) . eyev, without building the reflected vectors.
+    reflect_dot_eye = (
+        2 * light_dot_normal * np.einsum("...i,...i->...", normals, eyev)
+        - np.einsum("...i,...i->...", lightv, eyev)
+    )
+    shine = lit & (reflect_dot_eye > 0)
+    specular = np.where(
+        shine, materials.specular[index] * np.power(np.where(shine, reflect_dot_eye, 0), materials.shininess[index]), 0
+    )
+    weight = materials.ambient[index] + np.where(lit, materials.diffuse[index] * light_dot_normal, 0)
+
+    if out is None:
+        out = np.empty(np.shape(points))
+        accumulate = False
+    effective = materials.colors[index] * intensity
+    if accumulate:
+        out += effective * weight[..., np.newaxis]
+    else:
+        np.multiply(effective, weight[..., np.newaxis], out=out)
+    out += specular[..., np.newaxis] * intensity
+    return out
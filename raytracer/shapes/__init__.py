@@ -0,0 +1,6 @@
+# raytracer/shapes/__init__.py
+
+from .shape import Shape
+from .sphere import Sphere
+from .mesh import Mesh, Triangle
+from .obj import load_obj, parse_obj
\ No newline at end of file
@@ -0,0 +1,258 @@
+# raytracer/shapes/mesh.py
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from raytracer.bounds import BoundingBox
+from raytracer.bvh import BVH
+from raytracer.intersections import HitBuffer, HitRecord, Intersection
+from raytracer.materials import Material
+from raytracer.matrices import Matrix
+from raytracer.rays import Ray, RayBatch
+from raytracer.tuples import Point, Vector
+from raytracer.utils import EPSILON
+from .shape import Shape
+
+DEFAULT_MESH_LEAF_SIZE = 8
+
+
+class Mesh(Shape):
+    """Triangles that share contiguous vertex, normal and face arrays.
+
+    ``vertices`` is ``(V, 3)`` and ``faces`` an ``(F, 3)`` array of vertex
+    indices. For smooth shading, ``normals`` is ``(N, 3)`` and
+    ``normal_faces`` gives each face corner's normal index, -1 for none.
+    Faces without all three corner normals are flat shaded. Per-face edge
+    vectors are precomputed once. The mesh builds its own BVH over the
+    triangles in object space the first time it is intersected (or takes
+    ``bvh_nodes`` saved from one built earlier), and the mesh as a whole
+    sits in a scene's BVH like any other shape.
+
+    Batched intersection returns each ray's closest non-negative hit
+    (``k = 1``). ``closest_hits`` also reports the face and barycentric
+    coordinates, which batched normals need.
+    """
+
+    def __init__(
+        self,
+        vertices: np.ndarray,
+        faces: np.ndarray,
+        normals: Optional[np.ndarray] = None,
+        normal_faces: Optional[np.ndarray] = None,
+        transform: Optional[Matrix] = None,
+        max_leaf_size: int = DEFAULT_MESH_LEAF_SIZE,
+        material: Optional[Material] = None,
+        bvh_nodes: Optional[Tuple] = None,
+    ):
+        super().__init__(transform, material)
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float64).reshape(-1, 3)
+        self.faces = np.ascontiguousarray(faces, dtype=np.int64).reshape(-1, 3)
+        if self.faces.size and (self.faces.min() < 0 or self.faces.max() >= len(self.vertices)):
+            raise ValueError("Face refers to a vertex that doesn't exist")
+        self.normals = None
+        self.normal_faces = None
+        if normals is not None and normal_faces is not None:
+            self.normals = np.ascontiguousarray(normals, dtype=np.float64).reshape(-1, 3)
+            self.normal_faces = np.ascontiguousarray(normal_faces, dtype=np.int64).reshape(-1, 3)
+            if self.normal_faces.shape != self.faces.shape:
+                raise ValueError("normal_faces must have one row per face")
+            if self.normal_faces.size and self.normal_faces.max() >= len(self.normals):
+                raise ValueError("Face refers to a normal that doesn't exist")
+        self.max_leaf_size = max_leaf_size
+
+        self._p1 = self.vertices[self.faces[:, 0]]
+        self._e1 = self.vertices[self.faces[:, 1]] - self._p1
+        self._e2 = self.vertices[self.faces[:, 2]] - self._p1
+        self._bvh: Optional[_TriangleBVH] = None
+        if bvh_nodes is not None:
+            self._bvh = _TriangleBVH(self, max_leaf_size, bvh_nodes)
+
+    def __len__(self) -> int:
+        return len(self.faces)
+
+    def __fingerprint__(self):
+        return (self.vertices, self.faces, self.normals, self.normal_faces, self.transform, self.material)
+
+    @property
+    def bvh(self) -> "_TriangleBVH":
+        if self._bvh is None:
+            self._bvh = _TriangleBVH(self, self.max_leaf_size)
+        return self._bvh
+
+    def bounds(self) -> BoundingBox:
+        if not len(self.vertices):
+            return BoundingBox.empty()
+        return BoundingBox(self.vertices.min(axis=0), self.vertices.max(axis=0))
+
+    def local_closest_hits(
+        self, batch: RayBatch, t_max=np.inf
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Closest non-negative hit of each object-space ray below ``t_max``.
+
+        Returns ``(t, face, u, v)``, with ``inf``, -1 and ``nan`` for misses.
+        """
+        hits = HitBuffer(len(batch))
+        t, face = self.bvh.intersect_batch(batch, t_max, min_packet_rays=0, out=hits)
+        missed = face < 0
+        t[missed] = np.inf
+        hits.u[missed] = np.nan
+        hits.v[missed] = np.nan
+        return t, face, hits.u, hits.v
+
+    def local_intersect(self, ray: Ray) -> List[Intersection]:
+        o, d = ray.origin, ray.direction
+        t, face, u, v = self.local_closest_hits(RayBatch([[o.x, o.y, o.z]], [[d.x, d.y, d.z]]))
+        if face[0] < 0:
+            return []
+        return [Intersection(float(t[0]), self, float(u[0]), float(v[0]), int(face[0]))]
+
+    def local_closest_hit(self, ray: Ray, record: HitRecord) -> bool:
+        o, d = ray.origin, ray.direction
+        t, face, u, v = self.local_closest_hits(RayBatch([[o.x, o.y, o.z]], [[d.x, d.y, d.z]]), record.t)
+        if face[0] < 0:
+            return False
+        return record.record(float(t[0]), self, float(u[0]), float(v[0]), int(face[0]))
+
+    def local_intersect_batch(self, batch: RayBatch) -> Tuple[np.ndarray, np.ndarray]:
+        t, face = self.bvh.intersect_batch(batch, min_packet_rays=0)
+        return t[:, np.newaxis], face >= 0
+
+    def local_occluded(self, ray: Ray, max_t: float) -> bool:
+        o, d = ray.origin, ray.direction
+        return bool(self.local_occluded_batch(RayBatch([[o.x, o.y, o.z]], [[d.x, d.y, d.z]]), max_t)[0])
+
+    def local_occluded_batch(self, batch: RayBatch, max_t) -> np.ndarray:
+        return self.bvh.occluded_batch(batch, max_t, min_packet_rays=0)
+
+    def local_normal_at(self, point: Point, hit: Optional[Intersection] = None) -> Vector:
+        if hit is not None and hit.face is not None:
+            face, u, v = hit.face, hit.u, hit.v
+        elif len(self.faces) == 1:
+            face, u, v = 0, 1 / 3, 1 / 3
+        else:
+            raise ValueError("A mesh normal needs the intersection that found the point")
+        x, y, z = self.normals_at(np.array([face]), np.array([u]), np.array([v]))[0].tolist()
+        return Vector(x, y, z)
+
+    def local_normal_at_batch(self, points: np.ndarray, faces=None, u=None, v=None) -> np.ndarray:
+        if faces is None or (faces < 0).any():
+            raise ValueError("A mesh normal needs the face and barycentrics of the hit that found the point")
+        return self.normals_at(faces, u, v)
+
+    def normals_at(self, faces: np.ndarray, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """Unit object-space normals at barycentric (u, v) on the given faces."""
+        normals = np.cross(self._e2[faces], self._e1[faces])
+        if self.normal_faces is not None:
+            corners = self.normal_faces[faces]
+            smooth = (corners >= 0).all(axis=1)
+            if smooth.any():
+                n1, n2, n3 = (self.normals[corners[smooth, i]] for i in range(3))
+                us = u[smooth, np.newaxis]
+                vs = v[smooth, np.newaxis]
+                normals[smooth] = n2 * us + n3 * vs + n1 * (1 - us - vs)
+        return normals / np.sqrt(np.einsum("ij,ij->i", normals, normals))[:, np.newaxis]
+
+
+class Triangle(Mesh):
+    """A single flat triangle; a one-face mesh."""
+
+    def __init__(self, p1: Point, p2: Point, p3: Point, transform: Optional[Matrix] = None,
+                 material: Optional[Material] = None):
+        super().__init__([(p.x, p.y, p.z) for p in (p1, p2, p3)], [(0, 1, 2)], transform=transform, material=material)
+
+    @property
+    def p1(self) -> Point:
+        return Point(*self.vertices[0].tolist())
+
+    @property
+    def p2(self) -> Point:
+        return Point(*self.vertices[1].tolist())
+
+    @property
+    def p3(self) -> Point:
+        return Point(*self.vertices[2].tolist())
+
+    @property
+    def e1(self) -> Vector:
+        return Vector(*self._e1[0].tolist())
+
+    @property
+    def e2(self) -> Vector:
+        return Vector(*self._e2[0].tolist())
+
+    @property
+    def normal(self) -> Vector:
+        x, y, z = self.normals_at(np.array([0]), np.array([0.0]), np.array([0.0]))[0].tolist()
+        return Vector(x, y, z)
+
+
+class _TriangleBVH(BVH):
+    """A BVH over one mesh's triangles in object space.
+
+    Primitive indices are face indices, and leaves run a batched
+    Möller–Trumbore test of their rays against all of their triangles at once.
+    """
+
+    def __init__(self, mesh: Mesh, max_leaf_size: int, nodes: Optional[Tuple] = None):
+        self.mesh = mesh
+        self.shapes = []
+        if nodes is not None:
+            self._set_nodes(*nodes)
+            return
+        v = mesh.vertices
+        f = mesh.faces
+        a, b, c = v[f[:, 0]], v[f[:, 1]], v[f[:, 2]]
+        self._build(np.minimum(np.minimum(a, b), c), np.maximum(np.maximum(a, b), c), max_leaf_size)
+
+    def __fingerprint__(self):
+        return self.mesh
+
+    def _intersect_leaf(self, primitives: np.ndarray, batch: RayBatch, rays: np.ndarray, hits: HitBuffer) -> None:
+        mesh = self.mesh
+        t, u, v = _moller_trumbore(
+            batch.origins[:, np.newaxis], batch.directions[:, np.newaxis],
+            mesh._p1[primitives], mesh._e1[primitives], mesh._e2[primitives],
+        )
+        nearest = t.argmin(axis=1)
+        picked = (np.arange(len(t)), nearest)
+        t = t[picked]
+        closer = t < hits.t[rays]
+        rays = rays[closer]
+        hits.t[rays] = t[closer]
+        hits.index[rays] = primitives[nearest[closer]]
+        hits.u[rays] = u[picked][closer]
+        hits.v[rays] = v[picked][closer]
+
+    def _occlude_leaf(
+        self, primitives: np.ndarray, batch: RayBatch, rays: np.ndarray, limits: np.ndarray, blocked: np.ndarray
+    ) -> None:
+        mesh = self.mesh
+        t, _, _ = _moller_trumbore(
+            batch.origins[rays, np.newaxis], batch.directions[rays, np.newaxis],
+            mesh._p1[primitives], mesh._e1[primitives], mesh._e2[primitives],
+        )
+        hits = rays[(t < limits[rays, np.newaxis]).any(axis=1)]
+        blocked[hits] = True
+        limits[hits] = -np.inf
+
+
+def _moller_trumbore(origins, directions, p1, e1, e2):
+    """Batched Möller–Trumbore ray/triangle test.
+
+    Arguments broadcast against each other over their leading axes, e.g.
+    ``(R, 1, 3)`` rays against ``(M, 3)`` triangles gives ``(R, M)`` results.
+    Returns ``(t, u, v)``, with ``t`` set to ``inf`` where a ray misses the
+    triangle, meets it behind the origin or runs (nearly) parallel to it.
+    """
+    pvec = np.cross(directions, e2)
+    det = np.einsum("...k,...k->...", e1, pvec)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f = 1.0 / det
+        tvec = origins - p1
+        u = f * np.einsum("...k,...k->...", tvec, pvec)
+        qvec = np.cross(tvec, e1)
+        v = f * np.einsum("...k,...k->...", directions, qvec)
+        t = f * np.einsum("...k,...k->...", e2, qvec)
+        hit = (np.abs(det) > EPSILON) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+    return np.where(hit, t, np.inf), u, v
@@ -0,0 +1,85 @@
+# raytracer/shapes/obj.py
+
+from array import array
+from typing import Iterable, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from raytracer.matrices import Matrix
+from .mesh import Mesh
+
+
+def load_obj(source: Union[str, TextIO], transform: Optional[Matrix] = None) -> Mesh:
+    """Read a Wavefront OBJ file into a single ``Mesh``.
+
+    ``source`` is a path or an open text file. It's read one line at a time
+    straight into compact typed arrays, so there is no per-vertex or
+    per-face Python object even for very large files. ``v``, ``vn`` and ``f``
+    statements are used. Faces may be written ``v``, ``v/vt``, ``v//vn`` or
+    ``v/vt/vn`` with negative (relative) indices, and polygons are split
+    into triangle fans. Everything else (groups, materials, texture
+    coordinates) is skipped.
+    """
+    if isinstance(source, str):
+        with open(source) as f:
+            return parse_obj(f, transform)
+    return parse_obj(source, transform)
+
+
+def parse_obj(lines: Iterable[str], transform: Optional[Matrix] = None) -> Mesh:
+    vertices = array("d")
+    normals = array("d")
+    faces = array("q")
+    normal_faces = array("q")
+    smooth = False
+
+    for number, line in enumerate(lines, 1):
+        parts = line.split()
+        if not parts:
+            continue
+        keyword = parts[0]
+        try:
+            if keyword == "v":
+                if len(parts) < 4:
+                    raise ValueError("a vertex needs three coordinates")
+                vertices.extend(map(float, parts[1:4]))
+            elif keyword == "vn":
+                if len(parts) < 4:
+                    raise ValueError("a normal needs three components")
+                normals.extend(map(float, parts[1:4]))
+            elif keyword == "f":
+                corners = [_corner(part, len(vertices) // 3, len(normals) // 3) for part in parts[1:]]
+                if len(corners) < 3:
+                    raise ValueError("a face needs at least three vertices")
+                first = corners[0]
+                for second, third in zip(corners[1:], corners[2:]):
+                    for vertex, normal in (first, second, third):
+                        faces.append(vertex)
+                        normal_faces.append(normal)
+                        smooth = smooth or normal >= 0
+        except ValueError as error:
+            raise ValueError(f"OBJ line {number}: {error}") from None
+
+    return Mesh(
+        np.frombuffer(vertices, dtype=np.float64).reshape(-1, 3),
+        np.frombuffer(faces, dtype=np.int64).reshape(-1, 3),
+        np.frombuffer(normals, dtype=np.float64).reshape(-1, 3) if smooth else None,
+        np.frombuffer(normal_faces, dtype=np.int64).reshape(-1, 3) if smooth else None,
+        transform=transform,
+    )
+
+
+def _corner(part: str, vertex_count: int, normal_count: int) -> Tuple[int, int]:
+    """Parse one ``v[/vt[/vn]]`` face corner into zero-based (vertex, normal)."""
+    fields = part.split("/")
+    vertex = _index(fields[0], vertex_count, "vertex")
+    normal = _index(fields[2], normal_count, "normal") if len(fields) > 2 and fields[2] else -1
+    return vertex, normal
+
+
+def _index(field: str, count: int, kind: str) -> int:
+    index = int(field)
+    index = index - 1 if index > 0 else count + index
+    if not 0 <= index < count:
+        raise ValueError(f"{kind} index {field} is out of range")
+    return index
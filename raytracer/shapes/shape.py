@@ -0,0 +1,158 @@
+# raytracer/shapes/shape.py
+
+import math
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from raytracer.bounds import BoundingBox
+from raytracer.intersections import HitRecord, Intersection
+from raytracer.materials import Material
+from raytracer.matrices import Matrix
+from raytracer.rays import Ray, RayBatch
+from raytracer.tuples import Point, Vector
+from raytracer.utils import identity_matrix
+
+IDENTITY = Matrix(4, 4, identity_matrix(4))
+
+# Caches filled from the transform; they are left out of fingerprints.
+_DERIVED = ("_inverse_transform",)
+
+
+class Shape(ABC):
+    """Base class for primitives defined in their own object space.
+
+    Subclasses implement ``bounds``, ``local_intersect``,
+    ``local_intersect_batch`` and ``local_normal_at``, and can't be
+    created until they do. This class moves rays and points between world
+    and object space with the shape's transform. Each shape carries the
+    ``material`` it is shaded with.
+
+    Batched intersection returns ``(ts, mask)``: ``ts`` is an ``(N, k)`` array
+    of each ray's k roots in ascending order (``inf`` where there is no
+    root) and ``mask`` is true for rays that meet the shape at all.
+
+    ``closest_hit`` lowers a reusable ``HitRecord`` instead of returning a
+    list; the full sorted list from ``intersect`` is still there for callers
+    that need every crossing. ``closest_hits`` is its batched form and also
+    reports the face and barycentric coordinates of mesh hits, which
+    ``normal_at_batch`` takes back. ``occluded`` and ``occluded_batch``
+    answer shadow-ray queries: does the ray hit the shape at some
+    ``0 <= t < max_t``? Subclasses can override the ``local_`` versions
+    with an early-exit test.
+
+    ``inverse_transform`` and ``inverse_transpose`` are computed on first
+    use and cached on the transform matrix, so each shape inverts its
+    matrix once however many rays it meets.
+    """
+
+    def __init__(self, transform: Optional[Matrix] = None, material: Optional[Material] = None):
+        self.transform = IDENTITY if transform is None else transform
+        self.material = Material() if material is None else material
+
+    def __fingerprint__(self):
+        return {name: value for name, value in vars(self).items() if name not in _DERIVED}
+
+    @property
+    def transform(self) -> Matrix:
+        return self._transform
+
+    @transform.setter
+    def transform(self, transform: Matrix) -> None:
+        self._transform = transform
+        self._inverse_transform: Optional[Matrix] = None
+
+    @property
+    def inverse_transform(self) -> Matrix:
+        inverse = self._inverse_transform
+        if inverse is None:
+            inverse = self._inverse_transform = self._transform.inverse()
+        return inverse
+
+    @property
+    def inverse_transpose(self) -> Matrix:
+        """Maps object-space normals to world space (up to normalization)."""
+        return self._transform.inverse_transpose()
+
+    @abstractmethod
+    def bounds(self) -> BoundingBox:
+        """Return the shape's bounding box in object space."""
+
+    def intersect(self, ray: Ray) -> List[Intersection]:
+        return self.local_intersect(ray.transform(self.inverse_transform))
+
+    def intersect_batch(self, batch: RayBatch) -> Tuple[np.ndarray, np.ndarray]:
+        return self.local_intersect_batch(batch.transform(self.inverse_transform))
+
+    def closest_hit(self, ray: Ray, record: HitRecord) -> bool:
+        """Lower ``record`` to this shape's closest hit; return whether it did."""
+        return self.local_closest_hit(ray.transform(self.inverse_transform), record)
+
+    def closest_hits(self, batch: RayBatch, t_max=math.inf) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Closest hit of each ray below ``t_max`` (a scalar or one limit per ray).
+
+        Returns ``(t, face, u, v)`` with ``t = inf`` for a miss. ``face``,
+        ``u`` and ``v`` are None for shapes without faces.
+        """
+        return self.local_closest_hits(batch.transform(self.inverse_transform), t_max)
+
+    def occluded(self, ray: Ray, max_t: float = math.inf) -> bool:
+        return self.local_occluded(ray.transform(self.inverse_transform), max_t)
+
+    def occluded_batch(self, batch: RayBatch, max_t=math.inf) -> np.ndarray:
+        """Boolean ``(N,)`` array; ``max_t`` is a scalar or one limit per ray."""
+        return self.local_occluded_batch(batch.transform(self.inverse_transform), max_t)
+
+    def normal_at(self, point: Point, hit: Optional[Intersection] = None) -> Vector:
+        local_normal = self.local_normal_at(self.inverse_transform.transform_point(point), hit)
+        return self._transform.transform_normal(local_normal).normalize_()
+
+    def normal_at_batch(self, points: np.ndarray, faces=None, u=None, v=None) -> np.ndarray:
+        """Unit world-space normals at ``(N, 3)`` points on the shape.
+
+        ``faces``, ``u`` and ``v`` are the hits' ``closest_hits`` results,
+        needed for meshes.
+        """
+        inverse = self.inverse_transform.data
+        local_points = points @ inverse[:3, :3].T + inverse[:3, 3]
+        local_normals = self.local_normal_at_batch(local_points, faces, u, v)
+        normals = local_normals @ self.inverse_transpose.data[:3, :3].T
+        return normals / np.sqrt(np.einsum("ij,ij->i", normals, normals))[:, np.newaxis]
+
+    @abstractmethod
+    def local_intersect(self, ray: Ray) -> List[Intersection]:
+        """Every intersection of an object-space ray with the shape."""
+
+    @abstractmethod
+    def local_intersect_batch(self, batch: RayBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """Batched ``local_intersect``, as ``(ts, mask)``."""
+
+    def local_closest_hit(self, ray: Ray, record: HitRecord) -> bool:
+        found = False
+        for x in self.local_intersect(ray):
+            found = record.record(x.t, x.object, x.u, x.v, x.face) or found
+        return found
+
+    def local_closest_hits(self, batch: RayBatch, t_max) -> Tuple[np.ndarray, None, None, None]:
+        ts, _ = self.local_intersect_batch(batch)
+        t = np.where(ts >= 0, ts, np.inf).min(axis=1)
+        t[t >= t_max] = np.inf
+        return t, None, None, None
+
+    def local_occluded(self, ray: Ray, max_t: float) -> bool:
+        return any(0 <= x.t < max_t for x in self.local_intersect(ray))
+
+    def local_occluded_batch(self, batch: RayBatch, max_t) -> np.ndarray:
+        ts, _ = self.local_intersect_batch(batch)
+        limit = np.broadcast_to(np.asarray(max_t, dtype=np.float64), (len(batch),))[:, np.newaxis]
+        return ((ts >= 0) & (ts < limit)).any(axis=1)
+
+    @abstractmethod
+    def local_normal_at(self, point: Point, hit: Optional[Intersection] = None) -> Vector:
+        """The object-space normal at ``point``; ``hit`` is the intersection that found it."""
+
+    def local_normal_at_batch(self, points: np.ndarray, faces=None, u=None, v=None) -> np.ndarray:
+        # Shapes whose normal depends on more than the point override this.
+        normals = [self.local_normal_at(Point(x, y, z)) for x, y, z in points.tolist()]
+        return np.array([(n.x, n.y, n.z) for n in normals], dtype=np.float64).reshape(-1, 3)
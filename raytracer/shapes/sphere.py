@@ -0,0 +1,89 @@
+# raytracer/shapes/sphere.py
+
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from raytracer.bounds import BoundingBox
+from raytracer.intersections import HitRecord, Intersection
+from raytracer.rays import Ray, RayBatch
+from raytracer.tuples import Point, Vector
+from .shape import Shape
+
+
+class Sphere(Shape):
+    """A unit sphere centered at the object-space origin."""
+
+    def bounds(self) -> BoundingBox:
+        return BoundingBox((-1, -1, -1), (1, 1, 1))
+
+    def local_intersect(self, ray: Ray) -> List[Intersection]:
+        o = ray.origin
+        d = ray.direction
+        a = d.x * d.x + d.y * d.y + d.z * d.z
+        b = 2 * (d.x * o.x + d.y * o.y + d.z * o.z)
+        c = o.x * o.x + o.y * o.y + o.z * o.z - 1
+
+        discriminant = b * b - 4 * a * c
+        if discriminant < 0:
+            return []
+
+        root = math.sqrt(discriminant)
+        return [
+            Intersection((-b - root) / (2 * a), self),
+            Intersection((-b + root) / (2 * a), self),
+        ]
+
+    def local_closest_hit(self, ray: Ray, record: HitRecord) -> bool:
+        o = ray.origin
+        d = ray.direction
+        a = d.x * d.x + d.y * d.y + d.z * d.z
+        b = 2 * (d.x * o.x + d.y * o.y + d.z * o.z)
+        c = o.x * o.x + o.y * o.y + o.z * o.z - 1
+
+        discriminant = b * b - 4 * a * c
+        if discriminant < 0:
+            return False
+        root = math.sqrt(discriminant)
+        # The far root only matters when the near one is behind the origin.
+        return record.record((-b - root) / (2 * a), self) or record.record((-b + root) / (2 * a), self)
+
+    def local_occluded(self, ray: Ray, max_t: float) -> bool:
+        o = ray.origin
+        d = ray.direction
+        a = d.x * d.x + d.y * d.y + d.z * d.z
+        b = 2 * (d.x * o.x + d.y * o.y + d.z * o.z)
+        c = o.x * o.x + o.y * o.y + o.z * o.z - 1
+
+        discriminant = b * b - 4 * a * c
+        if discriminant < 0:
+            return False
+        root = math.sqrt(discriminant)
+        near = (-b - root) / (2 * a)
+        if 0 <= near < max_t:
+            return True
+        far = (-b + root) / (2 * a)
+        return 0 <= far < max_t
+
+    def local_intersect_batch(self, batch: RayBatch) -> Tuple[np.ndarray, np.ndarray]:
+        o = batch.origins
+        d = batch.directions
+        a = np.einsum("ij,ij->i", d, d)
+        b = 2 * np.einsum("ij,ij->i", d, o)
+        c = np.einsum("ij,ij->i", o, o) - 1
+
+        discriminant = b * b - 4 * a * c
+        mask = discriminant >= 0
+        root = np.sqrt(np.where(mask, discriminant, 0))
+        ts = np.empty((len(batch), 2))
+        ts[:, 0] = (-b - root) / (2 * a)
+        ts[:, 1] = (-b + root) / (2 * a)
+        ts[~mask] = np.inf
+        return ts, mask
+
+    def local_normal_at(self, point: Point, hit: Optional[Intersection] = None) -> Vector:
+        return Vector(point.x, point.y, point.z)
+
+    def local_normal_at_batch(self, points: np.ndarray, faces=None, u=None, v=None) -> np.ndarray:
+        return points
@@ -1,15 +1,61 @@
+import math
+
 from .tuple import Tuple
 
-class Vector(Tuple):
+_new = object.__new__
+
+
+class Vector(Tuple, w=0):
+    __slots__ = ()
+
     def __init__(self, x, y, z):
-        super().__init__(x, y, z, 0)
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = 0
 
     def cross(self, other):
-        return Vector(
+        return _vector(
             self.y * other.z - self.z * other.y,
             self.z * other.x - self.x * other.z,
             self.x * other.y - self.y * other.x)
 
-class Point(Tuple):
+    def dot(self, other):
+        # w is 0, so its term never contributes.
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def magnitude(self):
+        x, y, z = self.x, self.y, self.z
+        return math.sqrt(x * x + y * y + z * z)
+
+    def normalize(self):
+        x, y, z = self.x, self.y, self.z
+        inv = 1 / math.sqrt(x * x + y * y + z * z)
+        return _vector(x * inv, y * inv, z * inv)
+
+    def normalize_(self):
+        x, y, z = self.x, self.y, self.z
+        inv = 1 / math.sqrt(x * x + y * y + z * z)
+        self.x = x * inv
+        self.y = y * inv
+        self.z = z * inv
+        return self
+
+
+class Point(Tuple, w=1):
+    __slots__ = ()
+
     def __init__(self, x, y, z):
-        super().__init__(x, y, z, 1)
\ No newline at end of file
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = 1
+
+
+def _vector(x, y, z):
+    result = _new(Vector)
+    result.x = x
+    result.y = y
+    result.z = z
+    result.w = 0
+    return result
@@ -1,16 +1,49 @@
 # raytracer/tuples/tuple.py
 
 import math
+from typing import Dict, Type
 from raytracer.utils import float_equal
 
+# Canonical subclass for a given w, filled in by subclasses declared with
+# ``class Point(Tuple, w=1)``.
+_KINDS: Dict[float, Type["Tuple"]] = {}
+
+_new = object.__new__
+
 
 class Tuple:
+    """A 4-component (x, y, z, w) tuple.
+
+    Arithmetic keeps the subtype where it is meaningful: ``Vector + Vector``
+    is a ``Vector``, ``Point - Point`` is a ``Vector``, ``Point + Vector`` is a
+    ``Point`` and ``Color * Color`` is a ``Color``. Anything else falls back
+    to a plain ``Tuple``. In-place operations can't change a tuple's type,
+    so they raise ``TypeError`` where the plain operator would.
+    """
+
+    __slots__ = ("x", "y", "z", "w")
+
     def __init__(self, x: float, y: float, z: float, w: int):
         self.x: float = x
         self.y: float = y
         self.z: float = z
         self.w: int = w
 
+    def __init_subclass__(cls, w=None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if w is not None:
+            _KINDS[w] = cls
+
+    def derive(self, x: float, y: float, z: float, w: float) -> "Tuple":
+        """Return a new tuple of the same kind as this one, or a plain
+        ``Tuple`` if the new w no longer fits that kind."""
+        result = _new(type(self) if w == self.w else Tuple)
+        result.x = x
+        result.y = y
+        result.z = z
+        result.w = w
+        return result
+
     def isPoint(self):
         return self.w == 1
 
@@ -30,35 +63,110 @@ class Tuple:
     def __add__(self, other):
         if not isinstance(other, Tuple):
             return NotImplemented
-        return Tuple(
+        return _combine(
+            self, other,
             self.x + other.x, self.y + other.y, self.z + other.z, self.w + other.w
         )
 
     def __sub__(self, other):
         if not isinstance(other, Tuple):
             return NotImplemented
-        return Tuple(
+        return _combine(
+            self, other,
             self.x - other.x, self.y - other.y, self.z - other.z, self.w - other.w
         )
 
     def __neg__(self):
-        return Tuple(-self.x, -self.y, -self.z, -self.w)
+        return self.derive(-self.x, -self.y, -self.z, -self.w)
 
     def __mul__(self, scalar):
-        return Tuple(self.x * scalar, self.y * scalar, self.z * scalar, self.w * scalar)
+        return self.derive(self.x * scalar, self.y * scalar, self.z * scalar, self.w * scalar)
+
+    __rmul__ = __mul__
 
     def __truediv__(self, scalar):
-        return Tuple(self.x / scalar, self.y / scalar, self.z / scalar, self.w / scalar)
+        return self.derive(self.x / scalar, self.y / scalar, self.z / scalar, self.w / scalar)
+
+    def iadd(self, other: "Tuple") -> "Tuple":
+        """Add ``other`` to this tuple in place and return it."""
+        _check_kind(self, _kind(self, other, self.w + other.w), "add", other)
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        self.w += other.w
+        return self
+
+    def isub(self, other: "Tuple") -> "Tuple":
+        """Subtract ``other`` from this tuple in place and return it."""
+        _check_kind(self, _kind(self, other, self.w - other.w), "subtract", other)
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        self.w -= other.w
+        return self
+
+    def imul(self, scalar: float) -> "Tuple":
+        """Scale this tuple in place and return it."""
+        if self.w * scalar != self.w and type(self) is not Tuple:
+            raise TypeError(f"Scaling a {type(self).__name__} in place would change its w")
+        self.x *= scalar
+        self.y *= scalar
+        self.z *= scalar
+        self.w *= scalar
+        return self
 
     def magnitude(self):
-        return math.sqrt(self.x**2 + self.y**2 + self.z**2 + self.w**2)
+        x, y, z, w = self.x, self.y, self.z, self.w
+        return math.sqrt(x * x + y * y + z * z + w * w)
 
     def normalize(self):
         mag = self.magnitude()
-        return Tuple(self.x / mag, self.y / mag, self.z / mag, self.w / mag)
+        return self.derive(self.x / mag, self.y / mag, self.z / mag, self.w / mag)
+
+    def normalize_(self) -> "Tuple":
+        """Normalize this tuple in place and return it."""
+        return self.imul(1 / self.magnitude())
 
     def dot(self, other):
         return self.x * other.x + self.y * other.y + self.z * other.z + self.w * other.w
 
     def __repr__(self):
+        kind = type(self)
+        if _KINDS.get(self.w) is kind:
+            # Registered kinds imply their w and are built without it.
+            return f"{kind.__name__}({self.x}, {self.y}, {self.z})"
+        return f"{kind.__name__}({self.x}, {self.y}, {self.z}, {self.w})"
+
+    def __str__(self):
+        # The homogeneous form, so a Point prints like the Tuple it stands for.
         return f"Tuple({self.x}, {self.y}, {self.z}, {self.w})"
+
+
+def _kind(a: Tuple, b: Tuple, w: float) -> Type[Tuple]:
+    """The most specific type for the result of ``a (+|-) b`` with that w."""
+    kind = type(a)
+    if kind is type(b) and w == a.w:
+        return kind
+    # Mixing kinds re-derives the result from w, but only between the kinds
+    # w identifies (points and vectors); a Color plus a Vector is a Tuple.
+    if _KINDS.get(a.w) is kind and _KINDS.get(b.w) is type(b):
+        return _KINDS.get(w, Tuple)
+    return Tuple
+
+
+def _check_kind(a: Tuple, kind: Type[Tuple], verb: str, b: Tuple) -> None:
+    if kind is not type(a) and type(a) is not Tuple:
+        raise TypeError(f"Can't {verb} a {type(b).__name__} in place on a {type(a).__name__}")
+
+
+def _combine(a: Tuple, b: Tuple, x: float, y: float, z: float, w: float) -> Tuple:
+    """Build the result of ``a (+|-) b``, picking the most specific type."""
+    kind = type(a)
+    if kind is not type(b) or w != a.w:
+        kind = _kind(a, b, w)
+    result = _new(kind)
+    result.x = x
+    result.y = y
+    result.z = z
+    result.w = w
+    return result
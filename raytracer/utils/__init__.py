@@ -1,4 +1,5 @@
 # raytracer/utils/__init__.py
 
+from .utils import EPSILON
 from .utils import float_equal
 from .utils import identity_matrix
\ No newline at end of file
@@ -0,0 +1,4 @@
+# raytracer/world/__init__.py
+
+from .world import SurfaceHits, World
+from .renderer import SceneRenderer
\ No newline at end of file
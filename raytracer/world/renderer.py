@@ -0,0 +1,26 @@
+# raytracer/world/renderer.py
+
+import numpy as np
+
+from raytracer import instrumentation
+from raytracer.camera import Camera
+from .world import World
+
+
+class SceneRenderer:
+    """Renders a ``World`` through a ``Camera`` with Phong shading, shadows,
+    reflection and refraction.
+
+    It follows the renderer protocol: called with arrays of continuous pixel
+    coordinates, it returns their ``(N, 3)`` colors.
+    """
+
+    def __init__(self, world: World, camera: Camera):
+        self.world = world
+        self.camera = camera
+
+    def __call__(self, px: np.ndarray, py: np.ndarray) -> np.ndarray:
+        with instrumentation.stage("ray_generation"):
+            batch = self.camera.rays_for_pixels(px, py)
+            instrumentation.count("rays_cast", len(batch))
+        return self.world.shade_batch(batch)
@@ -0,0 +1,268 @@
+# raytracer/world/world.py
+
+import hashlib
+from collections import deque
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from raytracer import instrumentation
+from raytracer.bvh import BVH
+from raytracer.colors import Color
+from raytracer.intersections import HitBuffer
+from raytracer.lights import PointLight
+from raytracer.materials import MaterialTable
+from raytracer.rays import Ray, RayBatch
+from raytracer.shading import lighting, reflect, refract
+from raytracer.shapes import Shape, Sphere
+from raytracer.utils import EPSILON
+
+
+class SurfaceHits:
+    """The rays of a batch that hit something, prepared for shading.
+
+    ``rays`` are their positions in the batch and ``objects`` the index of
+    the shape each one hit. ``normals`` face the eye (``inside`` marks the
+    ones that were flipped), and ``over_points`` are nudged off the surface
+    along them so shadow and reflected rays don't hit the surface they start
+    from. ``under_points`` are nudged the other way, for refracted rays.
+    """
+
+    __slots__ = ("rays", "t", "objects", "points", "eyev", "normals", "inside", "over_points", "under_points")
+
+    def __init__(self, rays, t, objects, points, eyev, normals, inside, over_points, under_points):
+        self.rays = rays
+        self.t = t
+        self.objects = objects
+        self.points = points
+        self.eyev = eyev
+        self.normals = normals
+        self.inside = inside
+        self.over_points = over_points
+        self.under_points = under_points
+
+    def __len__(self) -> int:
+        return len(self.rays)
+
+
+class World:
+    """The shapes in a scene and the point lights that illuminate them.
+
+    The BVH and the material table are built on first use, unless a ``bvh``
+    built earlier over the same objects is passed in. Call ``refresh()``
+    after changing ``objects`` or their materials.
+
+    Reflected and refracted rays are followed up to ``max_depth`` bounces.
+    From ``roulette_depth`` on, each one survives with a probability equal
+    to its weight and is reweighted to match, so dim paths end early
+    without biasing the image. The random numbers come from ``seed`` and
+    the primary rays themselves, so a batch always renders the same while
+    different tiles, samples and passes draw independent numbers.
+    """
+
+    def __init__(
+        self,
+        objects: Sequence[Shape] = (),
+        lights: Sequence[PointLight] = (),
+        bvh: Optional[BVH] = None,
+        max_depth: int = 5,
+        roulette_depth: int = 3,
+        seed: int = 0,
+    ):
+        self.objects = list(objects)
+        self.lights = list(lights)
+        self.max_depth = max_depth
+        self.roulette_depth = roulette_depth
+        self.seed = seed
+        self.refresh()
+        self._bvh = bvh
+
+    def __fingerprint__(self):
+        return (self.objects, self.lights, self.max_depth, self.roulette_depth, self.seed)
+
+    def refresh(self) -> None:
+        self._bvh: Optional[BVH] = None
+        self._materials: Optional[MaterialTable] = None
+        self._spheres: Optional[np.ndarray] = None
+        self._sphere_inverses: Optional[np.ndarray] = None
+        self._sphere_normals: Optional[np.ndarray] = None
+
+    @property
+    def bvh(self) -> BVH:
+        if self._bvh is None:
+            self._bvh = BVH(self.objects)
+        return self._bvh
+
+    @property
+    def materials(self) -> MaterialTable:
+        """One row per object, so an object's index is its material index."""
+        if self._materials is None:
+            self._materials = MaterialTable([shape.material for shape in self.objects])
+        return self._materials
+
+    def intersect(self, ray: Ray):
+        """Every intersection of ``ray`` with the world, sorted by t."""
+        return self.bvh.intersect(ray)
+
+    def color_at(self, ray: Ray) -> Color:
+        o, d = ray.origin, ray.direction
+        r, g, b = self.shade_batch(RayBatch([[o.x, o.y, o.z]], [[d.x, d.y, d.z]]))[0].tolist()
+        return Color(r, g, b)
+
+    def shade_batch(self, batch: RayBatch, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """The ``(N, 3)`` color seen along each ray; black where nothing is hit.
+
+        Secondary rays are not traced recursively. Each pass over the work
+        queue intersects and shades one batch of rays, adds their weighted
+        colors to the rays they came from, and queues every reflected and
+        refracted ray they spawn as the next batch.
+        """
+        if out is None:
+            out = np.zeros((len(batch), 3))
+        else:
+            out[...] = 0
+        materials = self.materials
+        max_depth = self.max_depth if materials.reflective.any() or materials.transparency.any() else 0
+        rng = self._roulette_rng(batch) if max_depth else None
+        queue = deque([(batch, np.arange(len(batch)), np.ones(len(batch)), 0)])
+        while queue:
+            batch, sources, weights, depth = queue.popleft()
+            with instrumentation.stage("intersection"):
+                found = HitBuffer(len(batch))
+                self.bvh.intersect_batch(batch, out=found)
+            with instrumentation.stage("shading"):
+                hits = self.prepare_hits(batch, found)
+                if not len(hits):
+                    continue
+                sources = sources[hits.rays]
+                weights = weights[hits.rays]
+                colors = self.shade_hits(hits)
+                if depth:
+                    # Several secondary rays can lead back to one primary ray.
+                    colors *= weights[:, np.newaxis]
+                    np.add.at(out, sources, colors)
+                else:
+                    out[sources] = colors
+                if depth < max_depth:
+                    secondary, parents, weights = self.secondary_rays(hits, weights, depth + 1, rng)
+                    if len(secondary):
+                        instrumentation.count("secondary_rays", len(secondary))
+                        queue.append((secondary, sources[parents], weights, depth + 1))
+        return out
+
+    def prepare_hits(self, batch: RayBatch, found: HitBuffer) -> SurfaceHits:
+        """Shading inputs for the rays of ``batch`` that ``intersect_batch`` found hits for."""
+        rays = np.flatnonzero(found.index >= 0)
+        t = found.t[rays]
+        objects = found.index[rays]
+        directions = batch.directions[rays]
+        points = batch.origins[rays] + directions * t[:, np.newaxis]
+        eyev = -directions / np.sqrt(np.einsum("ij,ij->i", directions, directions))[:, np.newaxis]
+        normals = self.normals_at(points, objects, found.face[rays], found.u[rays], found.v[rays])
+        inside = np.einsum("ij,ij->i", normals, eyev) < 0
+        normals[inside] *= -1
+        over_points = points + normals * EPSILON
+        under_points = points - normals * EPSILON
+        return SurfaceHits(rays, t, objects, points, eyev, normals, inside, over_points, under_points)
+
+    def normals_at(
+        self, points: np.ndarray, objects: np.ndarray, faces: np.ndarray, u: np.ndarray, v: np.ndarray
+    ) -> np.ndarray:
+        """Unit world-space normals at points on ``objects[i]``.
+
+        ``faces``, ``u`` and ``v`` are the hits' ``HitBuffer`` slots, which
+        give the face and barycentric coordinates on meshes.
+        """
+        normals = np.empty_like(points)
+        spheres = self._sphere_mask()[objects]
+        if spheres.any():
+            # A sphere's object-space normal is the object-space point, so all
+            # spheres are done at once with stacked inverses and transposes.
+            hit_spheres = objects[spheres]
+            inverse = self._sphere_inverses[hit_spheres]
+            local = np.einsum("nij,nj->ni", inverse[:, :, :3], points[spheres]) + inverse[:, :, 3]
+            normals[spheres] = np.einsum("nij,nj->ni", self._sphere_normals[hit_spheres], local)
+        rest = np.flatnonzero(~spheres)
+        if len(rest):
+            order = rest[np.argsort(objects[rest], kind="stable")]
+            shapes, starts = np.unique(objects[order], return_index=True)
+            for shape, group in zip(shapes.tolist(), np.split(order, starts[1:])):
+                normals[group] = self.objects[shape].normal_at_batch(points[group], faces[group], u[group], v[group])
+        normals /= np.sqrt(np.einsum("ij,ij->i", normals, normals))[:, np.newaxis]
+        return normals
+
+    def shade_hits(self, hits: SurfaceHits) -> np.ndarray:
+        colors = np.zeros((len(hits), 3))
+        for light in self.lights:
+            lighting(
+                self.materials, hits.objects, light, hits.over_points, hits.eyev, hits.normals,
+                in_shadow=self.is_shadowed_batch(hits.over_points, light), out=colors, accumulate=True,
+            )
+        return colors
+
+    def secondary_rays(
+        self, hits: SurfaceHits, weights: np.ndarray, depth: int, rng: np.random.Generator
+    ) -> Tuple[RayBatch, np.ndarray, np.ndarray]:
+        """The reflected and refracted rays spawned by ``hits``.
+
+        Returns the rays, the hit each one came from and its weight: the
+        parent's weight times the surface's ``reflective`` or
+        ``transparency``. Surfaces that are both split the light between
+        the two by Schlick's reflectance. Refraction assumes every
+        transparent object is surrounded by air.
+        """
+        reflective = self.materials.reflective[hits.objects]
+        transparency = self.materials.transparency[hits.objects]
+        reflect_weights = weights * reflective
+        refract_weights = weights * transparency
+
+        transparent = np.flatnonzero(transparency > 0)
+        refracted = np.empty((len(transparent), 3))
+        if len(transparent):
+            index = self.materials.refractive_index[hits.objects[transparent]]
+            inside = hits.inside[transparent]
+            refracted, reflectance = refract(
+                hits.eyev[transparent], hits.normals[transparent],
+                np.where(inside, index, 1.0), np.where(inside, 1.0, index),
+            )
+            fresnel = reflective[transparent] > 0
+            reflect_weights[transparent] *= np.where(fresnel, reflectance, 1)
+            refract_weights[transparent] *= np.where(fresnel, 1 - reflectance, reflectance < 1)
+
+        mirrors = np.flatnonzero(reflect_weights > 0)
+        keep = refract_weights[transparent] > 0
+        parents = np.concatenate([mirrors, transparent[keep]])
+        weights = np.concatenate([reflect_weights[mirrors], refract_weights[transparent[keep]]])
+        origins = np.concatenate([hits.over_points[mirrors], hits.under_points[transparent[keep]]])
+        directions = np.concatenate([reflect(-hits.eyev[mirrors], hits.normals[mirrors]), refracted[keep]])
+
+        if depth >= self.roulette_depth and len(weights):
+            survival = np.minimum(weights, 1)
+            alive = rng.random(len(weights)) < survival
+            parents, origins, directions = parents[alive], origins[alive], directions[alive]
+            weights = weights[alive] / survival[alive]
+        return RayBatch(origins, directions), parents, weights
+
+    def _roulette_rng(self, batch: RayBatch) -> np.random.Generator:
+        digest = hashlib.blake2b(batch.origins.tobytes(), digest_size=16)
+        digest.update(batch.directions.tobytes())
+        return np.random.default_rng((self.seed, int.from_bytes(digest.digest(), "little")))
+
+    def is_shadowed_batch(self, points: np.ndarray, light: PointLight) -> np.ndarray:
+        """Whether something lies between each point and the light.
+
+        Shadow rays point straight at the light without normalizing, so the
+        light sits at ``t = 1`` and any-hit traversal can stop there.
+        """
+        position = np.array([light.position.x, light.position.y, light.position.z])
+        return self.bvh.occluded_batch(RayBatch(points, position - points), 1.0)
+
+    def _sphere_mask(self) -> np.ndarray:
+        if self._spheres is None:
+            self._spheres = np.array([type(shape) is Sphere for shape in self.objects], dtype=bool)
+            self._sphere_inverses = np.zeros((len(self.objects), 3, 4))
+            self._sphere_normals = np.zeros((len(self.objects), 3, 3))
+            for i in np.flatnonzero(self._spheres).tolist():
+                self._sphere_inverses[i] = self.objects[i].inverse_transform.data[:3]
+                self._sphere_normals[i] = self.objects[i].inverse_transpose.data[:3, :3]
+        return self._spheres
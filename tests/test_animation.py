@@ -0,0 +1,117 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.animation import frame_path, interpolate, is_animated, render_frame, scene_at
+
+import json
+import os
+import tempfile
+from multiprocessing import cpu_count
+
+NUM_CPUS = cpu_count()
+
+SCENE = {
+    "camera": {
+        "width": 16, "height": 12, "field_of_view": 1.0,
+        "from": {"keyframes": {"0": [0, 1, -8], "4": [8, 1, 0]}}, "to": [0, 0, 0],
+    },
+    "lights": [{"position": [-10, 10, -10], "intensity": [1, 1, 1]}],
+    "objects": [
+        {"type": "sphere", "transform": [["translate", {"keyframes": {"0": -1, "4": 1}}, 0, 0]]},
+        {"type": "sphere", "transform": [["scale", 0.5, 0.5, 0.5], ["translate", 0, 1.5, 0]]},
+    ],
+}
+
+
+def read_frames(paths):
+    frames = []
+    for path in paths:
+        with open(path, "rb") as f:
+            frames.append(f.read())
+    return frames
+
+
+@task
+def test_interpolate_keyframes():
+    keys = {"0": 0, "10": 5, "30": 1}
+    assert interpolate(keys, -3) == 0
+    assert interpolate(keys, 4) == 2
+    assert interpolate(keys, 20) == 3
+    assert interpolate(keys, 40) == 1
+    assert interpolate({"2": [0, 0, 0], "0": [2, 4, 6]}, 1) == [1, 2, 3]
+    for keys in ({}, {"0": [0, 0, 0], "10": [1, 1]}, {"0": 0, "10": [1, 1, 1]}):
+        try:
+            interpolate(keys, 5)
+        except ValueError:
+            pass
+        else:
+            assert False, f"expected a ValueError for {keys}"
+
+
+@task
+def test_scene_at_resolves_every_keyframed_value():
+    scene = scene_at(SCENE, 2)
+    assert scene["camera"]["from"] == [4, 1, -4]
+    assert scene["objects"][0]["transform"] == [["translate", 0, 0, 0]]
+    assert scene["objects"][1] == SCENE["objects"][1]
+    assert is_animated(SCENE["camera"]["from"]) and not is_animated(scene["camera"])
+    assert frame_path("out/frame_{frame:03d}.ppm", 7) == "out/frame_007.ppm"
+
+
+@task
+def test_render_frame_writes_atomically():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "frames", "frame.ppm")
+        assert render_frame(SCENE, 1, path, tile_size=8) == path
+        with open(path, "rb") as f:
+            assert f.read(13) == b"P6\n16 12\n255\n"
+        assert os.listdir(os.path.dirname(path)) == ["frame.ppm"]
+        umask = os.umask(0)
+        os.umask(umask)
+        assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+
+
+@task
+def test_animation_flow_renders_and_resumes():
+    from main import render_frame_task, run_animation
+
+    assert render_frame_task.retries >= 1
+    with tempfile.TemporaryDirectory() as directory:
+        scene_path = os.path.join(directory, "scene.json")
+        with open(scene_path, "w") as f:
+            json.dump(SCENE, f)
+        pattern = os.path.join(directory, "out", "frame_{frame:02d}.ppm")
+        paths = run_animation(scene_path, range(3), pattern, tile_size=8)
+        assert paths == [frame_path(pattern, frame) for frame in range(3)]
+        first = read_frames(paths)
+        assert len(set(first)) == 3
+
+        # A rerun only renders the frame that is missing.
+        with open(paths[0], "wb") as f:
+            f.write(b"kept")
+        os.remove(paths[2])
+        run_animation(scene_path, range(3), pattern, tile_size=8)
+        assert read_frames(paths) == [b"kept", first[1], first[2]]
+
+        run_animation(SCENE, [0], pattern, tile_size=8, overwrite=True)
+        assert read_frames(paths[:1]) == first[:1]
+
+
+@task
+def test_local_animation_uses_worker_processes():
+    from main import run_animation_locally
+
+    with tempfile.TemporaryDirectory() as directory:
+        pattern = os.path.join(directory, "frame_{frame}.ppm")
+        paths = run_animation_locally(SCENE, [0, 4], pattern, workers=2, tile_size=8)
+        frames = read_frames(paths)
+    assert len(frames) == 2 and frames[0] != frames[1]
+    assert all(frame.startswith(b"P6\n16 12\n255\n") for frame in frames)
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_animation() -> None:
+    test_interpolate_keyframes()
+    test_scene_at_resolves_every_keyframed_value()
+    test_render_frame_writes_atomically()
+    test_animation_flow_renders_and_resumes()
+    test_local_animation_uses_worker_processes()
@@ -0,0 +1,64 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.bench import compare_results, load_results, run_benchmarks, save_results
+from raytracer.bench.scenes import OrthographicRenderer, sphere_grid
+
+import os
+import tempfile
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+@task
+def test_run_micro_and_render_benchmarks():
+    results = run_benchmarks(
+        ["matrix_inverse", "render_sphere_grid_64_16"], resolutions=[16], repeat=1, min_time=0.01
+    )
+    assert set(results) == {"matrix_inverse", "render_sphere_grid_64_16"}
+    assert results["render_sphere_grid_64_16"]["operations"] == 256
+    assert results["matrix_inverse"]["seconds"] > 0
+
+
+@task
+def test_unknown_benchmark_is_rejected():
+    try:
+        run_benchmarks(["no_such_benchmark"])
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("Expected KeyError for an unknown benchmark")
+
+
+@task
+def test_results_round_trip_and_compare():
+    baseline = {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}, "c": {"seconds": 1.0}, "d": {"seconds": 1.0}}
+    current = {"a": {"seconds": 1.5}, "b": {"seconds": 0.5}, "c": {"seconds": 1.05}}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "baseline.json")
+        save_results(baseline, path, label="v1")
+        loaded = load_results(path)
+    assert loaded["label"] == "v1"
+    rows = compare_results(loaded, {"benchmarks": current}, threshold=0.1)
+    assert [(row["name"], row["status"]) for row in rows] == [
+        ("a", "regression"),
+        ("b", "improvement"),
+        ("c", "unchanged"),
+    ]
+
+
+@task
+def test_orthographic_renderer_hits_grid():
+    renderer = OrthographicRenderer(sphere_grid(1), 10, 10, extent=2)
+    colors = renderer(np.array([5.0, 0.5]), np.array([5.0, 0.5]))
+    assert np.allclose(colors, [[1, 1, 1], [0, 0, 0]])
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_bench() -> None:
+    test_run_micro_and_render_benchmarks()
+    test_unknown_benchmark_is_rejected()
+    test_results_round_trip_and_compare()
+    test_orthographic_renderer_hits_grid()
@@ -0,0 +1,213 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.bounds import BoundingBox
+from raytracer.bvh import BVH
+from raytracer.intersections import HitBuffer, HitRecord, hit
+from raytracer.matrices.transformations import translation, scaling, rotation_z
+from raytracer.rays import Ray, RayBatch
+from raytracer.shapes import Sphere
+from raytracer.tuples import Point, Vector
+
+import math
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+def random_spheres(count, seed=7):
+    rng = np.random.default_rng(seed)
+    return [
+        Sphere(translation(*rng.uniform(-10, 10, 3)) * scaling(*([rng.uniform(0.2, 1)] * 3)))
+        for _ in range(count)
+    ]
+
+
+def random_rays(count, seed=11):
+    rng = np.random.default_rng(seed)
+    return RayBatch(rng.uniform(-15, 15, (count, 3)), rng.normal(size=(count, 3)))
+
+
+def brute_force_closest(shapes, batch):
+    best_t = np.full(len(batch), np.inf)
+    best_index = np.full(len(batch), -1)
+    for i, shape in enumerate(shapes):
+        ts, mask = shape.intersect_batch(batch)
+        t = np.where(ts >= 0, ts, np.inf).min(axis=1)
+        closer = t < best_t
+        best_t[closer] = t[closer]
+        best_index[closer] = i
+    return best_t, best_index
+
+
+@task
+def test_sphere_bounds():
+    assert Sphere().bounds() == BoundingBox((-1, -1, -1), (1, 1, 1))
+
+
+@task
+def test_transformed_bounding_box():
+    box = BoundingBox((-1, -1, -1), (1, 1, 1))
+    moved = box.transform(translation(1, 2, 3) * scaling(2, 1, 1))
+    assert moved == BoundingBox((-1, 1, 2), (3, 3, 4))
+    rotated = box.transform(rotation_z(math.pi / 4))
+    assert rotated == BoundingBox((-math.sqrt(2), -math.sqrt(2), -1), (math.sqrt(2), math.sqrt(2), 1))
+
+
+@task
+def test_bounding_box_union_and_area():
+    box = BoundingBox((0, 0, 0), (1, 1, 1)).union(BoundingBox((1, 0, 0), (2, 1, 1)))
+    assert box == BoundingBox((0, 0, 0), (2, 1, 1))
+    assert box.surface_area() == 10
+
+
+@task
+def test_bvh_nodes_are_flat_and_cover_every_shape():
+    shapes = random_spheres(200)
+    bvh = BVH(shapes)
+    assert bvh.node_min.shape == (len(bvh), 3)
+    assert sorted(bvh.indices.tolist()) == list(range(200))
+    leaves = bvh.node_count > 0
+    assert bvh.node_count[leaves].sum() == 200
+    assert bvh.node_count.max() <= 4
+    root = BoundingBox(bvh.node_min[0], bvh.node_max[0])
+    for shape in shapes:
+        box = shape.bounds().transform(shape.transform)
+        assert np.all(root.minimum <= box.minimum) and np.all(box.maximum <= root.maximum)
+
+
+@task
+def test_bvh_single_ray_matches_shapes():
+    shapes = random_spheres(100)
+    bvh = BVH(shapes)
+    batch = random_rays(50)
+    for k in range(len(batch)):
+        ray = batch[k]
+        hits = [shape.intersect(ray) for shape in shapes]
+        expected = sorted(x.t for xs in hits if xs and xs[-1].t >= 0 for x in xs)
+        assert [x.t for x in bvh.intersect(ray)] == expected
+
+
+@task
+def test_bvh_closest_hit_matches_sorted_list():
+    shapes = random_spheres(100)
+    bvh = BVH(shapes)
+    batch = random_rays(50)
+    record = HitRecord()
+    for k in range(len(batch)):
+        ray = batch[k]
+        expected = hit(bvh.intersect(ray))
+        bvh.closest_hit(ray, record.reset())
+        assert record.intersection() == expected
+        if expected is not None:
+            assert not bvh.closest_hit(ray, record.reset(expected.t))
+
+
+@task
+def test_bvh_batch_t_max_and_reused_buffer():
+    shapes = random_spheres(300)
+    bvh = BVH(shapes)
+    batch = random_rays(400)
+    expected_t, expected_index = bvh.intersect_batch(batch)
+    limits = np.random.default_rng(5).uniform(0, 30, len(batch))
+    t, index = bvh.intersect_batch(batch, limits)
+    inside = expected_t < limits
+    assert np.array_equal(index >= 0, inside)
+    assert np.array_equal(index[inside], expected_index[inside])
+    assert np.allclose(t, np.where(inside, expected_t, limits))
+    buffer = HitBuffer()
+    for n in (400, 100):
+        t, index = bvh.intersect_batch(batch.subset(np.arange(n)), out=buffer)
+        assert t.base is buffer._t and np.array_equal(index, expected_index[:n])
+
+
+@task
+def test_bvh_batch_matches_brute_force():
+    shapes = random_spheres(300)
+    batch = random_rays(400)
+    t, index = BVH(shapes).intersect_batch(batch)
+    expected_t, expected_index = brute_force_closest(shapes, batch)
+    assert np.allclose(t, expected_t)
+    assert np.array_equal(index, expected_index)
+    assert np.isfinite(t).any()
+
+
+@task
+def test_bvh_diverged_packets_fall_back_to_single_rays():
+    shapes = random_spheres(300)
+    bvh = BVH(shapes)
+    batch = random_rays(400)
+    expected_t, expected_index = brute_force_closest(shapes, batch)
+    for min_packet_rays in (0, 16, len(batch)):
+        t, index = bvh.intersect_batch(batch, min_packet_rays=min_packet_rays)
+        assert np.allclose(t, expected_t)
+        assert np.array_equal(index, expected_index)
+
+
+@task
+def test_bvh_coherent_packet():
+    shapes = random_spheres(300)
+    xs, ys = np.meshgrid(np.linspace(-12, 12, 32), np.linspace(-12, 12, 32))
+    origins = np.stack([xs.ravel(), ys.ravel(), np.full(xs.size, 20.0)], axis=-1)
+    directions = np.tile([0.01, -0.02, -1.0], (xs.size, 1))
+    batch = RayBatch(origins, directions)
+    t, index = BVH(shapes).intersect_batch(batch)
+    expected_t, expected_index = brute_force_closest(shapes, batch)
+    assert np.allclose(t, expected_t)
+    assert np.array_equal(index, expected_index)
+    assert (index >= 0).sum() > 50
+
+
+@task
+def test_bvh_occlusion_matches_closest_hit():
+    shapes = random_spheres(300)
+    bvh = BVH(shapes)
+    batch = random_rays(400)
+    t, _ = bvh.intersect_batch(batch)
+    limits = np.random.default_rng(5).uniform(0, 60, len(batch))
+    for min_packet_rays in (0, 16, len(batch)):
+        blocked = bvh.occluded_batch(batch, limits, min_packet_rays=min_packet_rays)
+        assert np.array_equal(blocked, t < limits)
+    assert np.array_equal(bvh.occluded_batch(batch), np.isfinite(t))
+    for i in range(0, len(batch), 37):
+        ray = Ray(Point(*batch.origins[i]), Vector(*batch.directions[i]))
+        assert bvh.occluded(ray, max_t=limits[i]) == (t[i] < limits[i])
+
+
+@task
+def test_bvh_axis_aligned_rays():
+    shapes = [Sphere(translation(x, 0, 0)) for x in range(-6, 7, 3)]
+    bvh = BVH(shapes, max_leaf_size=1)
+    xs = bvh.intersect(Ray(Point(-10, 0, 0), Vector(1, 0, 0)))
+    assert [x.t for x in xs] == [3, 5, 6, 8, 9, 11, 12, 14, 15, 17]
+    t, index = bvh.intersect_batch(RayBatch([[-10, 0, 0], [0, 5, 0]], [[1, 0, 0], [0, 0, 1]]))
+    assert t[0] == 3 and index[0] == 0
+    assert np.isinf(t[1]) and index[1] == -1
+
+
+@task
+def test_empty_bvh():
+    bvh = BVH([])
+    assert bvh.intersect(Ray(Point(0, 0, 0), Vector(0, 0, 1))) == []
+    t, index = bvh.intersect_batch(RayBatch([[0, 0, 0]], [[0, 0, 1]]))
+    assert np.isinf(t[0]) and index[0] == -1
+    assert not bvh.occluded(Ray(Point(0, 0, 0), Vector(0, 0, 1)))
+    assert not bvh.occluded_batch(RayBatch([[0, 0, 0]], [[0, 0, 1]]))[0]
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_bvh() -> None:
+    test_sphere_bounds()
+    test_transformed_bounding_box()
+    test_bounding_box_union_and_area()
+    test_bvh_nodes_are_flat_and_cover_every_shape()
+    test_bvh_single_ray_matches_shapes()
+    test_bvh_closest_hit_matches_sorted_list()
+    test_bvh_batch_t_max_and_reused_buffer()
+    test_bvh_batch_matches_brute_force()
+    test_bvh_diverged_packets_fall_back_to_single_rays()
+    test_bvh_coherent_packet()
+    test_bvh_occlusion_matches_closest_hit()
+    test_bvh_axis_aligned_rays()
+    test_empty_bvh()
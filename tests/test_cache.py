@@ -0,0 +1,170 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.bench.scenes import OrthographicRenderer, sphere_grid
+from raytracer.cache import TileCache, code_version, fingerprint, tile_key
+from raytracer.matrices.transformations import Transform
+from raytracer.render import Tile
+from raytracer.shapes import Sphere
+from raytracer.tuples import Point
+
+import math
+import os
+import tempfile
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+class Gradient:
+    def __init__(self, scale):
+        self.scale = scale
+
+    def __call__(self, px, py):
+        return np.stack([px / self.scale, py / self.scale, np.zeros_like(px)], axis=-1)
+
+
+@task
+def test_fingerprint_is_stable_for_equal_scenes():
+    assert fingerprint(sphere_grid(9)) == fingerprint(sphere_grid(9))
+    assert fingerprint(OrthographicRenderer(sphere_grid(9), 8, 8)) == fingerprint(
+        OrthographicRenderer(sphere_grid(9), 8, 8)
+    )
+
+
+@task
+def test_fingerprint_ignores_filled_caches():
+    shapes = sphere_grid(4)
+    before = fingerprint(shapes)
+    for shape in shapes:
+        shape.transform.transpose()
+        shape.normal_at(Point(1, 0, 0))
+    assert fingerprint(shapes) == before
+
+
+@task
+def test_fingerprint_changes_with_content():
+    sphere = Sphere(Transform().translate(1, 0, 0).matrix)
+    moved = Sphere(Transform().translate(1, 0, 1e-9).matrix)
+    assert fingerprint(sphere) != fingerprint(moved)
+    assert fingerprint(Gradient(10)) != fingerprint(Gradient(20))
+    assert fingerprint([1, 2]) != fingerprint((1, 2))
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+
+
+@task
+def test_tile_cache_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TileCache(directory)
+        key = tile_key("scene", Tile(0, 0, 2, 2))
+        assert cache.get(key) is None
+        cache.put(key, np.ones((2, 2, 3)))
+        assert key in cache
+        assert np.array_equal(cache.get(key), np.ones((2, 2, 3)))
+        cache.invalidate(key)
+        assert cache.get(key) is None
+
+
+@task
+def test_tile_cache_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as directory:
+        tile = np.zeros((8, 8, 3))
+        TileCache(directory).put("probe", tile)
+        entry_size = os.path.getsize(os.path.join(directory, "probe.npy"))
+        cache = TileCache(directory, max_bytes=3 * entry_size)
+        cache.clear()
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.put(key, tile)
+            os.utime(os.path.join(directory, f"{key}.npy"), ns=(i * 10**9, i * 10**9))
+        cache.get("a")
+        cache.put("d", tile)
+        assert len(cache) == 3
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache and "d" in cache
+        assert cache.size_bytes() <= cache.max_bytes
+
+
+@task
+def test_tile_cache_tracks_its_size_between_scans():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TileCache(directory)
+        scans = []
+        entries = cache._entries
+        cache._entries = lambda: scans.append(1) or entries()
+        for key in "abcdef":
+            cache.put(key, np.zeros((8, 8, 3)))
+        cache.put("a", np.zeros((4, 4, 3)))
+        cache.invalidate("b")
+        assert len(scans) == 1
+        assert cache._size == cache.size_bytes()
+
+
+@task
+def test_tile_keys_change_with_the_code():
+    version = code_version()
+    assert len(version) == 64 and code_version() == version
+    tile = Tile(0, 0, 2, 2)
+    assert tile_key("scene", tile) == tile_key("scene", tile, version)
+    assert tile_key("scene", tile) != tile_key("scene", tile, "an older release")
+
+
+@task
+def test_render_flow_reuses_cached_tiles():
+    from main import run_render
+
+    renderer = Gradient(10)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TileCache(directory)
+        first = run_render(renderer, 8, 6, tile_size=4, cache=cache)
+        assert len(cache) == 4
+        # Overwrite one cached tile: a second run must read it back rather than re-render it.
+        key = tile_key(fingerprint((renderer, None, ("shared", "float64"))), Tile(4, 0, 8, 4))
+        cache.put(key, np.full((4, 4, 3), 0.5))
+        second = run_render(renderer, 8, 6, tile_size=4, cache=cache)
+    assert np.allclose(second.buffer[:, :4], first.buffer[:, :4])
+    assert np.allclose(second.buffer[4:, 4:], first.buffer[4:, 4:])
+    assert np.allclose(second.buffer[0:4, 4:8], 0.5)
+
+
+@task
+def test_render_flow_keeps_precisions_apart():
+    from main import run_render
+
+    renderer = Gradient(7)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TileCache(directory)
+        mapped = run_render(renderer, 8, 6, tile_size=4, cache=cache, output_path=os.path.join(directory, "out.ppm"))
+        mapped.close()
+        assert len(cache) == 4
+        full = run_render(renderer, 8, 6, tile_size=4, cache=cache)
+        assert len(cache) == 8
+    ys, xs = np.mgrid[0:6, 0:8] + 0.5
+    assert np.array_equal(full.buffer, renderer(xs, ys))
+
+
+@task
+def test_failed_render_closes_the_mapped_canvas():
+    from main import _render_target
+
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            with _render_target(4, 4, os.path.join(directory, "out.ppm"), "uint8") as (canvas, _):
+                raise RuntimeError("tile failed")
+        except RuntimeError:
+            pass
+        assert canvas.buffer is None
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_cache() -> None:
+    test_fingerprint_is_stable_for_equal_scenes()
+    test_fingerprint_ignores_filled_caches()
+    test_fingerprint_changes_with_content()
+    test_tile_cache_round_trip()
+    test_tile_cache_evicts_least_recently_used()
+    test_tile_cache_tracks_its_size_between_scans()
+    test_tile_keys_change_with_the_code()
+    test_render_flow_keeps_precisions_apart()
+    test_failed_render_closes_the_mapped_canvas()
+    test_render_flow_reuses_cached_tiles()
@@ -0,0 +1,88 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.camera import Camera
+from raytracer.matrices.transformations import Transform, rotation_y, translation, view_transform
+from raytracer.tuples import Point, Vector
+from raytracer.utils import float_equal
+
+import math
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+@task
+def test_constructing_a_camera():
+    c = Camera(160, 120, math.pi / 2)
+    assert c.hsize == 160
+    assert c.vsize == 120
+    assert c.field_of_view == math.pi / 2
+    assert c.transform == translation(0, 0, 0)
+
+
+@task
+def test_pixel_size_for_horizontal_and_vertical_canvas():
+    assert float_equal(Camera(200, 125, math.pi / 2).pixel_size, 0.01)
+    assert float_equal(Camera(125, 200, math.pi / 2).pixel_size, 0.01)
+
+
+@task
+def test_ray_through_center_and_corner_of_canvas():
+    c = Camera(201, 101, math.pi / 2)
+    r = c.ray_for_pixel(100.5, 50.5)
+    assert r.origin == Point(0, 0, 0)
+    assert r.direction == Vector(0, 0, -1)
+    r = c.ray_for_pixel(0.5, 0.5)
+    assert r.origin == Point(0, 0, 0)
+    assert r.direction == Vector(0.66519, 0.33259, -0.66851)
+
+
+@task
+def test_ray_when_camera_is_transformed():
+    c = Camera(201, 101, math.pi / 2, rotation_y(math.pi / 4) * translation(0, -2, 5))
+    r = c.ray_for_pixel(100.5, 50.5)
+    assert r.origin == Point(0, 2, -5)
+    assert r.direction == Vector(math.sqrt(2) / 2, 0, -math.sqrt(2) / 2)
+
+
+@task
+def test_batched_rays_match_single_rays():
+    c = Camera(40, 30, 1.2, view_transform(Point(1, 3, -6), Point(0, 1, 0), Vector(0, 1, 0)))
+    px = np.array([0.5, 13.25, 39.9])
+    py = np.array([0.5, 7.75, 29.1])
+    batch = c.rays_for_pixels(px, py)
+    for i in range(3):
+        assert batch[i].origin == c.ray_for_pixel(px[i], py[i]).origin
+        assert batch[i].direction == c.ray_for_pixel(px[i], py[i]).direction
+
+
+@task
+def test_tile_rays_match_pixel_centers():
+    c = Camera(40, 30, 1.2, Transform().rotate_x(0.3).translate(1, 2, 3).inverse)
+    tile = c.rays_for_tile(5, 7, 9, 10)
+    xs, ys = np.meshgrid(np.arange(5, 9) + 0.5, np.arange(7, 10) + 0.5)
+    expected = c.rays_for_pixels(xs.ravel(), ys.ravel())
+    assert len(tile) == 12
+    assert np.allclose(tile.origins, expected.origins)
+    assert np.allclose(tile.directions, expected.directions)
+
+
+@task
+def test_setting_transform_recomputes_rays():
+    c = Camera(11, 11, math.pi / 2)
+    c.transform = translation(0, 0, -5)
+    assert c.rays_for_tile(5, 5, 6, 6)[0].origin == Point(0, 0, 5)
+    assert c.inverse_transform == translation(0, 0, 5)
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_camera() -> None:
+    test_constructing_a_camera()
+    test_pixel_size_for_horizontal_and_vertical_canvas()
+    test_ray_through_center_and_corner_of_canvas()
+    test_ray_when_camera_is_transformed()
+    test_batched_rays_match_single_rays()
+    test_tile_rays_match_pixel_centers()
+    test_setting_transform_recomputes_rays()
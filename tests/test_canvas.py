@@ -1,11 +1,16 @@
 from prefect import task, flow
 from prefect_ray.task_runners import RayTaskRunner
-from raytracer.canvas import Canvas
+from raytracer.canvas import Canvas, MappedCanvas
 from raytracer.colors import Color
 
+import io
 import math
+import os
+import tempfile
 from multiprocessing import cpu_count
 
+import numpy as np
+
 NUM_CPUS = cpu_count()
 
 
@@ -53,9 +58,94 @@ def test_construct_ppm_pixel_data():
     assert lines[5] == "0 0 0 0 0 0 0 0 0 0 0 0 0 0 255"
 
 
+@task
+def test_splitting_long_lines_in_ppm():
+    c = Canvas(10, 2)
+    for y in range(2):
+        for x in range(10):
+            c.write_pixel(x, y, Color(1, 0.8, 0.6))
+    ppm = c.to_ppm()
+    lines = ppm.splitlines()
+    assert lines[3] == "255 204 153 255 204 153 255 204 153 255 204 153 255 204 153 255 204"
+    assert lines[4] == "153 255 204 153 255 204 153 255 204 153 255 204 153"
+    assert lines[5] == "255 204 153 255 204 153 255 204 153 255 204 153 255 204 153 255 204"
+    assert lines[6] == "153 255 204 153 255 204 153 255 204 153 255 204 153"
+
+
+@task
+def test_ppm_ends_with_newline():
+    c = Canvas(5, 3)
+    ppm = c.to_ppm()
+    assert ppm[-1] == "\n"
+
+
+@task
+def test_write_binary_ppm():
+    c = Canvas(2, 2)
+    c.write_pixel(0, 0, Color(1.5, 0, 0))
+    c.write_pixel(1, 1, Color(0, 0.5, 1))
+    stream = io.BytesIO()
+    c.write_ppm(stream)
+    assert stream.getvalue() == b"P6\n2 2\n255\n" + bytes(
+        [255, 0, 0, 0, 0, 0, 0, 0, 0, 0, 128, 255]
+    )
+
+
+@task
+def test_downscale_averages_blocks():
+    c = Canvas(5, 3)
+    c.write_pixel(0, 0, Color(1, 0, 0))
+    c.write_pixel(4, 2, Color(0, 0, 1))
+    small = c.downscale(2)
+    assert small.width == 3
+    assert small.height == 2
+    assert small.pixel_at(0, 0) == Color(0.25, 0, 0)
+    assert small.pixel_at(2, 1) == Color(0, 0, 1)
+
+
+@task
+def test_mapped_canvas_is_a_finished_ppm():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "image.ppm")
+        with MappedCanvas(path, 3, 2) as c:
+            c.write_pixel(0, 0, Color(1, 0.5, 0))
+            c.write_pixel(2, 1, Color(0, 0, 1))
+            assert c.pixel_at(0, 0) == Color(1, 128 / 255, 0)
+            stream = io.BytesIO()
+            c.write_ppm(stream)
+        with open(path, "rb") as f:
+            data = f.read()
+    assert data == stream.getvalue()
+    assert data.startswith(b"P6\n3 2\n255\n")
+    assert data[-3:] == bytes([0, 0, 255])
+
+
+@task
+def test_mapped_canvas_rows_from_other_openers():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "image.pfm")
+        c = MappedCanvas(path, 4, 4, dtype="float32")
+        top = MappedCanvas.open(path)
+        bottom = MappedCanvas.open(path)
+        top.write_block(0, 0, np.full((2, 4, 3), 0.25))
+        bottom.write_block(0, 2, np.full((2, 4, 3), 0.75))
+        top.close()
+        bottom.close()
+        assert c.pixel_at(3, 1) == Color(0.25, 0.25, 0.25)
+        assert c.pixel_at(0, 3) == Color(0.75, 0.75, 0.75)
+        assert c.downscale(4).pixel_at(0, 0) == Color(0.5, 0.5, 0.5)
+        c.close()
+
+
 @flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
 def test_canvas() -> None:
     test_create_canvas()
     test_write_pixel()
     test_construct_ppm_header()
     test_construct_ppm_pixel_data()
+    test_splitting_long_lines_in_ppm()
+    test_ppm_ends_with_newline()
+    test_write_binary_ppm()
+    test_downscale_averages_blocks()
+    test_mapped_canvas_is_a_finished_ppm()
+    test_mapped_canvas_rows_from_other_openers()
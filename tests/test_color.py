@@ -1,6 +1,7 @@
 from prefect import task, flow
 from prefect_ray.task_runners import RayTaskRunner
 from raytracer.colors import Color
+from raytracer.tuples import Tuple, Vector
 
 import math
 from multiprocessing import cpu_count
@@ -35,9 +36,36 @@ def test_multiply_colors():
     assert c1 * c2 == Color(0.9, 0.2, 0.04)
 
 
+@task
+def test_color_arithmetic_returns_colors():
+    c1 = Color(1, 0.2, 0.4)
+    c2 = Color(0.9, 1, 0.1)
+    assert type(c1 + c2) is Color
+    assert type(c1 - c2) is Color
+    assert type(c1 * c2) is Color
+    assert type(c1 * 2) is Color
+    assert type(c1 + Vector(1, 2, 3)) is Tuple
+    assert repr(Color(1, 0.5, 0)) == "Color(1, 0.5, 0)"
+    try:
+        c1.iadd(Vector(1, 2, 3))
+    except TypeError:
+        pass
+    else:
+        assert False, "expected a TypeError"
+
+
+@task
+def test_multiply_colors_in_place():
+    c = Color(1, 0.2, 0.4)
+    c.imul(Color(0.9, 1, 0.1)).imul(2)
+    assert c == Color(1.8, 0.4, 0.08)
+
+
 @flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
 def test_color() -> None:
     test_add_color()
     test_subtract_color()
     test_multiply_color_by_scalar()
     test_multiply_colors()
+    test_color_arithmetic_returns_colors()
+    test_multiply_colors_in_place()
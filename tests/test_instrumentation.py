@@ -0,0 +1,107 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer import instrumentation
+from raytracer.bench.scenes import OrthographicRenderer, sphere_grid
+from raytracer.canvas import Canvas
+from raytracer.colors import Color
+from raytracer.matrices.transformations import translation
+from raytracer.rays import Ray, RayBatch
+from raytracer.shapes import Shape, Sphere
+from raytracer.tuples import Point, Vector
+
+import io
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+@task
+def test_counters_are_off_by_default():
+    instrumentation.reset()
+    assert not instrumentation.is_enabled()
+    Point(1, 2, 3) - Point(0, 0, 0)
+    instrumentation.count("rays_cast", 10)
+    with instrumentation.stage("shading"):
+        pass
+    assert instrumentation.snapshot() == {"counters": {}, "timers": {}}
+
+
+@task
+def test_probes_count_hot_path_events():
+    with instrumentation.instrumented():
+        p = Point(1, 2, 3)
+        v = p - Point(0, 0, 0)
+        v.normalize()
+        Color(1, 1, 1) * 0.5
+        m = translation(1, 2, 3)
+        m.inverse()
+        m.inverse()
+        canvas = Canvas(2, 2)
+        canvas.write_pixel(0, 0, Color(1, 0, 0))
+        report = instrumentation.snapshot()
+    counters = report["counters"]
+    assert counters["tuple_allocations"] == 7
+    assert counters["matrix_inversions"] == 1
+    assert counters["canvas_writes"] == 1
+
+
+@task
+def test_probes_keep_default_arguments():
+    sphere = Sphere(translation(0, 0, 5))
+    with instrumentation.instrumented():
+        assert sphere.occluded(Ray(Point(0, 0, 0), Vector(0, 0, 1)))
+        assert sphere.occluded_batch(RayBatch([[0, 0, 0]], [[0, 0, 1]])).tolist() == [True]
+        counters = instrumentation.snapshot()["counters"]
+    assert counters["occlusion_tests"] == 2
+
+
+@task
+def test_disabling_removes_probes():
+    init = Point.__init__
+    intersect = Shape.intersect
+    with instrumentation.instrumented():
+        assert Point.__init__ is not init
+    assert not instrumentation.is_enabled()
+    assert Point.__init__ is init
+    assert Shape.intersect is intersect
+
+
+@task
+def test_render_stages_are_timed():
+    renderer = OrthographicRenderer(sphere_grid(4), 8, 8, extent=4)
+    with instrumentation.instrumented():
+        px, py = np.meshgrid(np.arange(8) + 0.5, np.arange(8) + 0.5)
+        colors = renderer(px.ravel(), py.ravel())
+        canvas = Canvas.from_buffer(colors.reshape(8, 8, 3))
+        canvas.write_ppm(io.BytesIO())
+        report = instrumentation.snapshot()
+    assert report["counters"]["rays_cast"] == 64
+    assert report["counters"]["intersection_tests"] > 0
+    assert set(report["timers"]) == {"ray_generation", "intersection", "shading", "ppm_encoding"}
+
+
+@task
+def test_merge_and_format_report():
+    merged = instrumentation.merge(
+        {"counters": {"rays_cast": 2}, "timers": {"shading": 0.5}},
+        {"counters": {"rays_cast": 3, "canvas_writes": 1}, "timers": {"shading": 0.5, "intersection": 1.0}},
+    )
+    assert merged == {
+        "counters": {"rays_cast": 5, "canvas_writes": 1},
+        "timers": {"shading": 1.0, "intersection": 1.0},
+    }
+    report = instrumentation.format_report(merged)
+    assert "rays_cast" in report
+    assert "50.0%" in report
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_instrumentation() -> None:
+    test_counters_are_off_by_default()
+    test_probes_count_hot_path_events()
+    test_probes_keep_default_arguments()
+    test_disabling_removes_probes()
+    test_render_stages_are_timed()
+    test_merge_and_format_report()
@@ -379,6 +379,106 @@ def test_matrix_product_inverse():
     assert C * B.inverse() == A
 
 
+@task
+def test_matrix_inverse_is_cached():
+    m = Matrix(
+        4,
+        4,
+        [
+            [9, 3, 0, 9],
+            [-5, -2, -6, -3],
+            [-4, 9, 6, 4],
+            [-7, 6, 6, 2],
+        ],
+    )
+    inv = m.inverse()
+    assert m.inverse() is inv
+    assert inv.inverse() is m
+    assert m * inv == Matrix(4, 4, identity_matrix(4))
+
+
+@task
+def test_matrix_transpose_is_cached():
+    m = Matrix(4, 4, [[1, 2, 3, 4], [5, 6, 7, 8], [9, 8, 7, 6], [5, 4, 3, 2]])
+    t = m.transpose()
+    assert m.transpose() is t
+    assert t.transpose() is m
+
+
+@task
+def test_matrix_is_immutable():
+    m = Matrix(4, 4, identity_matrix(4))
+    try:
+        m.data[0, 0] = 2
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Matrix data should be read-only")
+
+
+@task
+def test_noninvertible_matrix_inverse_raises():
+    m = Matrix(
+        4,
+        4,
+        [
+            [-4, 2, -2, -3],
+            [9, 6, 2, 6],
+            [0, -5, 1, -5],
+            [0, 0, 0, 0],
+        ],
+    )
+    try:
+        m.inverse()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected ValueError for a singular matrix")
+
+
+@task
+def test_matrix_affine_flag():
+    assert Matrix(4, 4, identity_matrix(4)).affine
+    assert not Matrix(4, 4, [[1, 2, 3, 4], [5, 6, 7, 8], [9, 8, 7, 6], [5, 4, 3, 2]]).affine
+    assert not Matrix(3, 3, identity_matrix(3)).affine
+    a = Matrix(4, 4, [[2, 0, 1, 3], [0, 1, 0, -1], [1, 0, 4, 2], [0, 0, 0, 1]])
+    assert a.affine
+    assert (a * a).affine
+    assert a.inverse().affine
+    assert not a.transpose().affine
+
+
+@task
+def test_affine_fast_paths_match_generic_multiply():
+    a = Matrix(4, 4, [[2, 0, 1, 3], [0.5, 1, 0, -1], [1, -3, 4, 2], [0, 0, 0, 1]])
+    p = Point(1, -2, 3)
+    v = Vector(1, -2, 3)
+    assert a.transform_point(p) == Tuple(8, -2.5, 21, 1)
+    assert type(a.transform_point(p)) is Point
+    assert a.transform_vector(v) == Tuple(5, -1.5, 19, 0)
+    assert type(a.transform_vector(v)) is Vector
+    assert a * p == a.transform_point(p)
+    assert a * v == a.transform_vector(v)
+
+
+@task
+def test_transform_normal_uses_inverse_transpose():
+    a = Matrix(4, 4, [[2, 0, 1, 3], [0.5, 1, 0, -1], [1, -3, 4, 2], [0, 0, 0, 1]])
+    n = Vector(0, 1, 1)
+    expected = a.inverse().transpose() * n
+    assert a.transform_normal(n) == Vector(expected.x, expected.y, expected.z)
+    assert a.inverse_transpose() is a.inverse_transpose() and a.inverse_transpose().affine
+
+
+@task
+def test_from_array_keeps_a_known_inverse():
+    a = Matrix(4, 4, [[2, 0, 1, 3], [0.5, 1, 0, -1], [1, -3, 4, 2], [0, 0, 0, 1]])
+    b = Matrix.from_array(a.data, a.inverse().data)
+    assert b == a and b.affine
+    assert b.inverse() == a.inverse()
+    assert b.inverse().inverse() is b
+
+
 @flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
 def test_matrix() -> None:
     test_matrix_elements_4x4()
@@ -405,4 +505,12 @@ def test_matrix() -> None:
     test_matrix_inverse_2()
     test_matrix_inverse_3()
     test_matrix_product_inverse()
+    test_matrix_inverse_is_cached()
+    test_matrix_transpose_is_cached()
+    test_matrix_is_immutable()
+    test_noninvertible_matrix_inverse_raises()
+    test_matrix_affine_flag()
+    test_affine_fast_paths_match_generic_multiply()
+    test_transform_normal_uses_inverse_transpose()
+    test_from_array_keeps_a_known_inverse()
     
\ No newline at end of file
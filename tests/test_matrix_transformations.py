@@ -1,7 +1,7 @@
 from prefect import task, flow
 from prefect_ray.task_runners import RayTaskRunner
 from raytracer.matrices import Matrix
-from raytracer.matrices.transformations import translation, scaling, rotation_x, rotation_y, rotation_z, shearing
+from raytracer.matrices.transformations import translation, scaling, rotation_x, rotation_y, rotation_z, shearing, Transform, view_transform
 from raytracer.tuples import Point, Vector
 from raytracer.utils import identity_matrix
 
@@ -163,6 +163,99 @@ def test_chained_transformations_applied_in_reverse_order():
     assert t * p == Point(15, 0, 7)
 
 
+@task
+def test_transforming_keeps_tuple_kind():
+    transform = translation(5, -3, 2)
+    assert type(transform * Point(-3, 4, 5)) is Point
+    assert type(transform * Vector(-3, 4, 5)) is Vector
+
+
+@task
+def test_transformation_factories_are_affine():
+    for m in (translation(1, 2, 3), scaling(1, 2, 3), rotation_x(1), rotation_y(1), rotation_z(1),
+              shearing(1, 0, 0, 0, 0, 1), Transform().rotate_x(1).translate(1, 2, 3).matrix):
+        assert m.affine
+        assert m.inverse().affine
+
+
+@task
+def test_fluent_transform_matches_chained_matrices():
+    t = Transform().rotate_x(math.pi / 2).scale(5, 5, 5).translate(10, 5, 7)
+    assert t.matrix == translation(10, 5, 7) * scaling(5, 5, 5) * rotation_x(math.pi / 2)
+    assert t.matrix * Point(1, 0, 1) == Point(15, 0, 7)
+
+
+@task
+def test_fluent_transform_covers_every_factory():
+    t = (
+        Transform()
+        .translate(1, 2, 3)
+        .rotate_y(0.3)
+        .shear(1, 0.5, 0.25, 0, 0.75, 2)
+        .rotate_z(-1.2)
+        .scale(2, -1, 0.5)
+        .rotate_x(2.1)
+    )
+    expected = (
+        rotation_x(2.1)
+        * scaling(2, -1, 0.5)
+        * rotation_z(-1.2)
+        * shearing(1, 0.5, 0.25, 0, 0.75, 2)
+        * rotation_y(0.3)
+        * translation(1, 2, 3)
+    )
+    assert t.matrix == expected
+    assert t.inverse == expected.inverse()
+
+
+@task
+def test_fluent_transform_caches_matrix_and_inverse():
+    t = Transform().scale(2, 2, 2).translate(1, 0, 0)
+    assert t.matrix is t.matrix
+    assert t.inverse is t.inverse
+    assert t.matrix.inverse() is t.inverse
+    assert t.inverse * Point(3, 0, 0) == Point(1, 0, 0)
+
+
+@task
+def test_fluent_transform_is_immutable():
+    base = Transform().translate(1, 0, 0)
+    moved = base.translate(0, 1, 0)
+    assert base.matrix == translation(1, 0, 0)
+    assert moved.matrix == translation(1, 1, 0)
+    assert Transform().matrix == Matrix(4, 4, identity_matrix(4))
+
+
+@task
+def test_view_transform_default_orientation():
+    t = view_transform(Point(0, 0, 0), Point(0, 0, -1), Vector(0, 1, 0))
+    assert t == Matrix(4, 4, identity_matrix(4))
+
+
+@task
+def test_view_transform_looking_in_positive_z():
+    t = view_transform(Point(0, 0, 0), Point(0, 0, 1), Vector(0, 1, 0))
+    assert t == scaling(-1, 1, -1)
+
+
+@task
+def test_view_transform_moves_the_world():
+    t = view_transform(Point(0, 0, 8), Point(0, 0, 0), Vector(0, 1, 0))
+    assert t == translation(0, 0, -8)
+    assert t.affine
+
+
+@task
+def test_arbitrary_view_transform():
+    t = view_transform(Point(1, 3, 2), Point(4, -2, 8), Vector(1, 1, 0))
+    assert t == Matrix(4, 4, [
+        [-0.50709, 0.50709, 0.67612, -2.36643],
+        [0.76772, 0.60609, 0.12122, -2.82843],
+        [-0.35857, 0.59761, -0.71714, 0.00000],
+        [0.00000, 0.00000, 0.00000, 1.00000],
+    ])
+
+
 @flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
 def test_matrix_transformations() -> None:
     test_translation()
@@ -184,3 +277,13 @@ def test_matrix_transformations() -> None:
     test_shearing_transformation_moves_z_in_proportion_to_y()
     test_individual_transformations_applied_in_sequence()
     test_chained_transformations_applied_in_reverse_order()
+    test_transforming_keeps_tuple_kind()
+    test_transformation_factories_are_affine()
+    test_fluent_transform_matches_chained_matrices()
+    test_fluent_transform_covers_every_factory()
+    test_fluent_transform_caches_matrix_and_inverse()
+    test_fluent_transform_is_immutable()
+    test_view_transform_default_orientation()
+    test_view_transform_looking_in_positive_z()
+    test_view_transform_moves_the_world()
+    test_arbitrary_view_transform()
@@ -0,0 +1,236 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.bvh import BVH
+from raytracer.intersections import HitBuffer, HitRecord, Intersection
+from raytracer.matrices.transformations import scaling, translation
+from raytracer.rays import Ray, RayBatch
+from raytracer.shapes import Mesh, Sphere, Triangle, load_obj, parse_obj
+from raytracer.shapes.mesh import _moller_trumbore
+from raytracer.tuples import Point, Vector
+
+import io
+import math
+import os
+import tempfile
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+def wavy_grid(n=40):
+    xs, ys = np.meshgrid(np.linspace(-1, 1, n), np.linspace(-1, 1, n))
+    vertices = np.stack([xs.ravel(), ys.ravel(), 0.2 * np.sin(4 * xs.ravel())], axis=-1)
+    index = np.arange(n * n).reshape(n, n)
+    a, b, c, d = index[:-1, :-1].ravel(), index[:-1, 1:].ravel(), index[1:, :-1].ravel(), index[1:, 1:].ravel()
+    return Mesh(vertices, np.concatenate([np.stack([a, b, c], -1), np.stack([b, d, c], -1)]))
+
+
+@task
+def test_constructing_a_triangle():
+    t = Triangle(Point(0, 1, 0), Point(-1, 0, 0), Point(1, 0, 0))
+    assert t.p1 == Point(0, 1, 0)
+    assert t.e1 == Vector(-1, -1, 0)
+    assert t.e2 == Vector(1, -1, 0)
+    assert t.normal == Vector(0, 0, -1)
+    assert t.normal_at(Point(-0.5, 0.75, 0)) == Vector(0, 0, -1)
+
+
+@task
+def test_ray_misses_triangle():
+    t = Triangle(Point(0, 1, 0), Point(-1, 0, 0), Point(1, 0, 0))
+    assert t.local_intersect(Ray(Point(0, -1, -2), Vector(0, 1, 0))) == []
+    assert t.local_intersect(Ray(Point(1, 1, -2), Vector(0, 0, 1))) == []
+    assert t.local_intersect(Ray(Point(-1, 1, -2), Vector(0, 0, 1))) == []
+    assert t.local_intersect(Ray(Point(0, -1, -2), Vector(0, 0, 1))) == []
+    # Nearly parallel to the plane: no huge, unstable t.
+    assert t.local_intersect(Ray(Point(-0.5, 0.3, -1e-9), Vector(1, 0, 1e-9))) == []
+
+
+@task
+def test_ray_strikes_triangle():
+    t = Triangle(Point(0, 1, 0), Point(-1, 0, 0), Point(1, 0, 0))
+    xs = t.local_intersect(Ray(Point(0, 0.5, -2), Vector(0, 0, 1)))
+    assert len(xs) == 1
+    assert xs[0].t == 2
+    assert xs[0].face == 0
+    assert math.isclose(xs[0].u, 0.25) and math.isclose(xs[0].v, 0.25)
+    record = Ray(Point(0, 0.5, -2), Vector(0, 0, 1)).closest_hit(t)
+    assert record.t == 2 and record.face == 0 and math.isclose(record.u, 0.25)
+    assert t.normal_at(Point(0, 0.5, 0), record) == Vector(0, 0, -1)
+    assert not t.closest_hit(Ray(Point(0, 0.5, -2), Vector(0, 0, 1)), HitRecord(2))
+
+
+@task
+def test_smooth_normals_are_interpolated():
+    mesh = Mesh(
+        [(0, 1, 0), (-1, 0, 0), (1, 0, 0)], [(0, 1, 2)],
+        normals=[(0, 1, 0), (-1, 0, 0), (1, 0, 0)], normal_faces=[(0, 1, 2)],
+    )
+    n = mesh.normal_at(Point(0, 0, 0), Intersection(1, mesh, 0.45, 0.25, 0))
+    assert n == Vector(-0.5547, 0.83205, 0)
+
+
+@task
+def test_batched_moller_trumbore_broadcasts():
+    p1 = np.array([[0.0, 1, 0], [0, 1, 5]])
+    e1 = np.array([[-1.0, -1, 0], [-1, -1, 0]])
+    e2 = np.array([[1.0, -1, 0], [1, -1, 0]])
+    origins = np.array([[0.0, 0.5, -2], [3, 3, -2]])[:, np.newaxis]
+    directions = np.array([[0.0, 0, 1], [0, 0, 1]])[:, np.newaxis]
+    t, u, v = _moller_trumbore(origins, directions, p1, e1, e2)
+    assert t.shape == (2, 2)
+    assert np.allclose(t[0], [2, 7])
+    assert np.all(np.isinf(t[1]))
+
+
+@task
+def test_mesh_closest_hits_match_brute_force():
+    mesh = wavy_grid()
+    rng = np.random.default_rng(3)
+    origins = np.stack([*rng.uniform(-1.2, 1.2, (2, 500)), np.full(500, -3.0)], axis=-1)
+    directions = np.tile([0.05, 0.02, 1.0], (500, 1)) + rng.normal(scale=0.05, size=(500, 3))
+    batch = RayBatch(origins, directions)
+    t, face, u, v = mesh.closest_hits(batch)
+    brute, _, _ = _moller_trumbore(origins[:, None], directions[:, None], mesh._p1, mesh._e1, mesh._e2)
+    assert np.allclose(t, brute.min(axis=1))
+    assert np.array_equal(face >= 0, np.isfinite(brute.min(axis=1)))
+    hit = face >= 0
+    points = origins[hit] + directions[hit] * t[hit, None]
+    corners = mesh.vertices[mesh.faces[face[hit]]]
+    rebuilt = corners[:, 0] * (1 - u[hit] - v[hit])[:, None] + corners[:, 1] * u[hit, None] + corners[:, 2] * v[hit, None]
+    assert np.allclose(points, rebuilt)
+
+
+@task
+def test_mesh_occlusion_matches_closest_hits():
+    mesh = wavy_grid()
+    mesh.transform = translation(0, 0, 1)
+    rng = np.random.default_rng(4)
+    origins = np.stack([*rng.uniform(-1.2, 1.2, (2, 500)), np.full(500, -3.0)], axis=-1)
+    batch = RayBatch(origins, np.tile([0.0, 0.0, 1.0], (500, 1)))
+    t = np.array([min((x.t for x in mesh.intersect(Ray(Point(*o), Vector(0, 0, 1)))), default=np.inf) for o in origins])
+    limits = rng.uniform(3, 5, 500)
+    assert np.array_equal(mesh.occluded_batch(batch, limits), t < limits)
+    assert mesh.occluded(Ray(Point(0, 0, -3), Vector(0, 0, 1)))
+    assert not mesh.occluded(Ray(Point(0, 0, -3), Vector(0, 0, 1)), max_t=3.5)
+
+
+@task
+def test_mesh_in_scene_bvh():
+    mesh = wavy_grid(10)
+    mesh.transform = translation(0, 0, 5) * scaling(2, 2, 2)
+    sphere = Sphere(translation(3, 0, 0))
+    bvh = BVH([mesh, sphere])
+    t, index = bvh.intersect_batch(RayBatch([[0, 0, -5], [3, 0, -5], [9, 9, -5]], [[0, 0, 1]] * 3))
+    assert index.tolist() == [0, 1, -1]
+    assert math.isclose(t[0], 10)
+    assert math.isclose(t[1], 4)
+    xs = bvh.intersect(Ray(Point(0.2, 0.1, -5), Vector(0, 0, 1)))
+    assert len(xs) == 1 and xs[0].object is mesh
+    n = mesh.normal_at(Ray(Point(0.2, 0.1, -5), Vector(0, 0, 1)).position(xs[0].t), xs[0])
+    assert math.isclose(n.magnitude(), 1)
+
+
+@task
+def test_scene_bvh_reports_mesh_faces():
+    mesh = wavy_grid(10)
+    mesh.transform = translation(0, 0, 5) * scaling(2, 2, 2)
+    sphere = Sphere(translation(0, 0, 0) * scaling(0.5, 0.5, 0.5))
+    rng = np.random.default_rng(6)
+    origins = np.stack([*rng.uniform(-2, 2, (2, 200)), np.full(200, -5.0)], axis=-1)
+    batch = RayBatch(origins, np.tile([0.0, 0.0, 1.0], (200, 1)))
+    t, face, u, v = mesh.closest_hits(batch)
+    for min_packet_rays in (0, 1000):
+        found = HitBuffer()
+        index = BVH([mesh, sphere]).intersect_batch(batch, min_packet_rays=min_packet_rays, out=found)[1]
+        on_mesh = index == 0
+        assert (index == 1).any() and on_mesh.any()
+        assert np.array_equal(found.face, np.where(on_mesh, face, -1))
+        assert np.allclose(found.u[on_mesh], u[on_mesh]) and np.allclose(found.v[on_mesh], v[on_mesh])
+    points = origins[on_mesh] + batch.directions[on_mesh] * t[on_mesh, None]
+    normals = mesh.normal_at_batch(points, face[on_mesh], u[on_mesh], v[on_mesh])
+    for point, k, normal in zip(points, np.flatnonzero(on_mesh), normals):
+        expected = mesh.normal_at(Point(*point), Intersection(t[k], mesh, u[k], v[k], face[k]))
+        assert np.allclose(normal, [expected.x, expected.y, expected.z])
+    try:
+        mesh.normal_at_batch(points)
+    except ValueError:
+        pass
+    else:
+        assert False, "expected a ValueError without the hits' faces"
+
+
+@task
+def test_parse_obj_vertices_faces_and_polygons():
+    mesh = parse_obj(io.StringIO("""
+There was a young lady named Bright
+v -1 1 0
+v -1 0 0
+v 1 0 0
+v 1 1 0
+v 0 2 0
+g FirstGroup
+f 1 2 3
+f 1 3 4 5
+"""))
+    assert mesh.vertices.shape == (5, 3)
+    assert mesh.faces.tolist() == [[0, 1, 2], [0, 2, 3], [0, 3, 4]]
+    assert mesh.normals is None
+
+
+@task
+def test_parse_obj_normals_and_relative_indices():
+    mesh = parse_obj([
+        "v 0 1 0", "v -1 0 0", "v 1 0 0",
+        "vn -1 0 0", "vn 1 0 0", "vn 0 1 0",
+        "f 1//3 2//1 3//2",
+        "f -3/1/-1 -2/2/-3 -1/3/-2",
+    ])
+    assert mesh.faces.tolist() == [[0, 1, 2], [0, 1, 2]]
+    assert mesh.normal_faces.tolist() == [[2, 0, 1], [2, 0, 1]]
+    assert mesh.normals[1].tolist() == [1, 0, 0]
+
+
+@task
+def test_parse_obj_rejects_bad_indices():
+    for lines, message in (
+        (["v 0 0 0", "v 1 0 0", "f 1 2 3"], "line 3"),
+        (["v 0 0 0", "v 1 0", "v 0 1 0", "f 1 2 3"], "line 2: a vertex needs three coordinates"),
+        (["v 0 0 0", "vn 0 1", "f 1//1 1//1 1//1"], "line 2: a normal needs three components"),
+    ):
+        try:
+            parse_obj(lines)
+        except ValueError as error:
+            assert message in str(error), str(error)
+        else:
+            assert False, "expected a ValueError"
+
+
+@task
+def test_load_obj_from_path():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "triangle.obj")
+        with open(path, "w") as f:
+            f.write("v 0 1 0\nv -1 0 0\nv 1 0 0\nf 1 2 3\n")
+        mesh = load_obj(path, transform=translation(0, 0, 1))
+    assert len(mesh) == 1
+    assert mesh.intersect(Ray(Point(0, 0.5, -2), Vector(0, 0, 1)))[0].t == 3
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_mesh() -> None:
+    test_constructing_a_triangle()
+    test_ray_misses_triangle()
+    test_ray_strikes_triangle()
+    test_smooth_normals_are_interpolated()
+    test_batched_moller_trumbore_broadcasts()
+    test_mesh_closest_hits_match_brute_force()
+    test_mesh_occlusion_matches_closest_hits()
+    test_mesh_in_scene_bvh()
+    test_scene_bvh_reports_mesh_faces()
+    test_parse_obj_vertices_faces_and_polygons()
+    test_parse_obj_normals_and_relative_indices()
+    test_parse_obj_rejects_bad_indices()
+    test_load_obj_from_path()
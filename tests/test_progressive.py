@@ -0,0 +1,79 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.bench.scenes import gradient
+from raytracer.colors import Color
+from raytracer.render import iter_progressive, render_progressive, render_tile
+from raytracer.render.tiles import Tile
+
+import math
+import os
+import tempfile
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+class CountingRenderer:
+    def __init__(self):
+        self.calls = np.zeros((7, 10), dtype=int)
+
+    def __call__(self, px, py):
+        np.add.at(self.calls, (py.astype(int), px.astype(int)), 1)
+        return gradient(px, py)
+
+
+@task
+def test_coarse_passes_render_each_pixel_once():
+    renderer = CountingRenderer()
+    passes = [p for p, _ in iter_progressive(renderer, 10, 7, initial_block=4)]
+    assert [(p.kind, p.block) for p in passes] == [("coarse", 4), ("coarse", 2), ("coarse", 1)]
+    assert [p.pixels for p in passes] == [6, 14, 50]
+    assert np.all(renderer.calls == 1)
+
+
+@task
+def test_first_pass_fills_blocks():
+    _, canvas = next(iter_progressive(gradient, 10, 7, initial_block=4))
+    assert canvas.pixel_at(3, 3) == Color(0.05, 0.05, 0)
+    assert canvas.pixel_at(9, 6) == Color(0.85, 0.45, 0)
+
+
+@task
+def test_final_coarse_pass_matches_full_render():
+    canvas = render_progressive(gradient, 10, 7)
+    assert np.allclose(canvas.buffer, render_tile(gradient, Tile(0, 0, 10, 7)))
+
+
+@task
+def test_extra_samples_average_jittered_positions():
+    seen = []
+    canvas = render_progressive(
+        gradient, 10, 7, extra_samples=3, callback=lambda p, c: seen.append((p.kind, c.buffer.copy()))
+    )
+    assert [kind for kind, _ in seen][-3:] == ["sample"] * 3
+    # The gradient is linear, so averaged jittered samples stay near the centre value.
+    assert np.allclose(canvas.buffer, render_tile(gradient, Tile(0, 0, 10, 7)), atol=0.05)
+    assert not np.allclose(seen[-1][1], seen[-2][1])
+
+
+@task
+def test_preview_is_downscaled_ppm():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "preview.ppm")
+        render_progressive(gradient, 10, 7, preview_path=path, preview_size=4)
+        with open(path, "rb") as f:
+            data = f.read()
+        assert os.listdir(directory) == ["preview.ppm"]
+    assert data.startswith(b"P6\n4 3\n255\n")
+    assert len(data) == len(b"P6\n4 3\n255\n") + 4 * 3 * 3
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_progressive() -> None:
+    test_coarse_passes_render_each_pixel_once()
+    test_first_pass_fills_blocks()
+    test_final_coarse_pass_matches_full_render()
+    test_extra_samples_average_jittered_positions()
+    test_preview_is_downscaled_ppm()
@@ -0,0 +1,87 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.rays import Ray, RayBatch
+from raytracer.matrices.transformations import translation, scaling
+from raytracer.tuples import Point, Vector
+
+import math
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+@task
+def test_create_ray():
+    origin = Point(1, 2, 3)
+    direction = Vector(4, 5, 6)
+    r = Ray(origin, direction)
+    assert r.origin == origin
+    assert r.direction == direction
+
+
+@task
+def test_compute_point_from_distance():
+    r = Ray(Point(2, 3, 4), Vector(1, 0, 0))
+    assert r.position(0) == Point(2, 3, 4)
+    assert r.position(1) == Point(3, 3, 4)
+    assert r.position(-1) == Point(1, 3, 4)
+    assert r.position(2.5) == Point(4.5, 3, 4)
+
+
+@task
+def test_create_ray_batch():
+    batch = RayBatch.from_rays(
+        [Ray(Point(1, 2, 3), Vector(0, 0, 1)), Ray(Point(0, 0, 0), Vector(1, 0, 0))]
+    )
+    assert len(batch) == 2
+    assert batch.origins.shape == (2, 3)
+    assert batch.origins.flags["C_CONTIGUOUS"]
+    assert batch[0].origin == Point(1, 2, 3)
+    assert batch[1].direction == Vector(1, 0, 0)
+
+
+@task
+def test_ray_batch_rejects_mismatched_arrays():
+    try:
+        RayBatch(np.zeros((2, 3)), np.zeros((3, 3)))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected ValueError for mismatched arrays")
+
+
+@task
+def test_ray_batch_position():
+    batch = RayBatch([[2, 3, 4], [0, 0, 0]], [[1, 0, 0], [0, 2, 0]])
+    positions = batch.position(np.array([2.5, -1]))
+    assert np.allclose(positions, [[4.5, 3, 4], [0, -2, 0]])
+    assert np.allclose(batch.position(1), [[3, 3, 4], [0, 2, 0]])
+
+
+@task
+def test_translating_ray_batch():
+    batch = RayBatch([[1, 2, 3]], [[0, 1, 0]])
+    moved = batch.transform(translation(3, 4, 5))
+    assert np.allclose(moved.origins, [[4, 6, 8]])
+    assert np.allclose(moved.directions, [[0, 1, 0]])
+
+
+@task
+def test_scaling_ray_batch():
+    batch = RayBatch([[1, 2, 3], [0, 0, 0]], [[0, 1, 0], [1, 1, 1]])
+    scaled = batch.transform(scaling(2, 3, 4))
+    assert np.allclose(scaled.origins, [[2, 6, 12], [0, 0, 0]])
+    assert np.allclose(scaled.directions, [[0, 3, 0], [2, 3, 4]])
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_ray() -> None:
+    test_create_ray()
+    test_compute_point_from_distance()
+    test_create_ray_batch()
+    test_ray_batch_rejects_mismatched_arrays()
+    test_ray_batch_position()
+    test_translating_ray_batch()
+    test_scaling_ray_batch()
@@ -0,0 +1,121 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.bench.scenes import gradient
+from raytracer.colors import Color
+from raytracer.render import SharedBuffer, Tile, render_tile, split_tiles
+
+import math
+import os
+import subprocess
+import sys
+import tempfile
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Attaches in the owning process and in a spawned worker, which shares its
+# resource tracker, then unlinks.
+OWNER_ATTACH_SCRIPT = """
+import multiprocessing
+from raytracer.render import SharedBuffer
+
+if __name__ == "__main__":
+    with SharedBuffer(4, 3) as shared:
+        SharedBuffer.attach(shared.name, 4, 3).close()
+        worker = multiprocessing.get_context("spawn").Process(target=SharedBuffer.attach, args=(shared.name, 4, 3))
+        worker.start()
+        worker.join()
+        assert worker.exitcode == 0
+"""
+
+
+@task
+def test_split_tiles_covers_canvas():
+    tiles = split_tiles(10, 7, 4)
+    assert len(tiles) == 6
+    assert tiles[0] == Tile(0, 0, 4, 4)
+    assert tiles[2] == Tile(8, 0, 10, 4)
+    assert tiles[-1] == Tile(8, 4, 10, 7)
+    covered = np.zeros((7, 10), dtype=int)
+    for tile in tiles:
+        covered[tile.y0:tile.y1, tile.x0:tile.x1] += 1
+    assert np.all(covered == 1)
+
+
+@task
+def test_tile_pixel_centers():
+    px, py = Tile(2, 1, 4, 3).pixel_centers()
+    assert np.allclose(px, [2.5, 3.5, 2.5, 3.5])
+    assert np.allclose(py, [1.5, 1.5, 2.5, 2.5])
+
+
+@task
+def test_render_tile():
+    pixels = render_tile(gradient, Tile(2, 1, 4, 3))
+    assert pixels.shape == (2, 2, 3)
+    assert np.allclose(pixels[1, 0], [0.25, 0.25, 0])
+
+
+@task
+def test_shared_buffer_is_visible_to_attached_views():
+    with SharedBuffer(4, 3) as shared:
+        attached = SharedBuffer.attach(shared.name, 4, 3)
+        attached.array[2, 3] = (1, 0.5, 0)
+        attached.close()
+        canvas = shared.to_canvas()
+    assert canvas.width == 4
+    assert canvas.height == 3
+    assert canvas.pixel_at(3, 2) == Color(1, 0.5, 0)
+    assert canvas.pixel_at(0, 0) == Color(0, 0, 0)
+
+
+@task
+def test_attaching_in_the_owner_keeps_the_tracker_consistent():
+    # The resource tracker reports errors on the stderr of the interpreter
+    # that started it, so run the owner in a child interpreter.
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "owner.py")
+        with open(script, "w") as f:
+            f.write(OWNER_ATTACH_SCRIPT)
+        result = subprocess.run(
+            [sys.executable, script], cwd=ROOT, env={**os.environ, "PYTHONPATH": ROOT},
+            capture_output=True, text=True, timeout=120,
+        )
+    assert result.returncode == 0, result.stderr
+    assert "KeyError" not in result.stderr and "leaked" not in result.stderr, result.stderr
+
+
+@task
+def test_render_flow_assembles_tiles():
+    from main import run_render
+
+    canvas = run_render(gradient, 10, 7, tile_size=4)
+    assert canvas.pixel_at(0, 0) == Color(0.05, 0.05, 0)
+    assert canvas.pixel_at(9, 6) == Color(0.95, 0.65, 0)
+
+
+@task
+def test_render_flow_writes_mapped_output():
+    from main import run_render
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "render.ppm")
+        canvas = run_render(gradient, 10, 7, tile_size=4, output_path=path)
+        assert canvas.pixel_at(9, 6) == Color(242 / 255, 166 / 255, 0)
+        canvas.close()
+        with open(path, "rb") as f:
+            assert f.read(12) == b"P6\n10 7\n255\n"
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_render() -> None:
+    test_split_tiles_covers_canvas()
+    test_tile_pixel_centers()
+    test_render_tile()
+    test_shared_buffer_is_visible_to_attached_views()
+    test_attaching_in_the_owner_keeps_the_tracker_consistent()
+    test_render_flow_assembles_tiles()
+    test_render_flow_writes_mapped_output()
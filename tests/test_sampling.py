@@ -0,0 +1,98 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.bench.scenes import gradient
+from raytracer.render import BoxFilter, Filter, GaussianFilter, Sampler, TentFilter, Tile, render_tile
+
+import math
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+class EdgeRenderer:
+    """White right of x = 5.3, black left of it; records every sample."""
+
+    def __init__(self):
+        self.xs = []
+
+    def __call__(self, px, py):
+        self.xs.append(px.copy())
+        value = (px > 5.3).astype(np.float64)
+        return np.stack([value, value, value], axis=-1)
+
+
+@task
+def test_stratified_samples_cover_each_stratum():
+    sampler = Sampler(3)
+    sx, sy = sampler.stratified(np.array([2]), np.array([5]), np.random.default_rng(0))
+    assert len(sx) == 9
+    cells = sorted(zip(np.floor((sx - 2) * 3).astype(int).tolist(), np.floor((sy - 5) * 3).astype(int).tolist()))
+    assert cells == [(i, j) for i in range(3) for j in range(3)]
+
+
+@task
+def test_filter_weights():
+    assert BoxFilter().margin == 0
+    assert TentFilter().margin == 1
+    assert GaussianFilter().margin == 1
+    d = np.array([0.0, 0.5, 1.0, 2.0])
+    assert np.allclose(TentFilter().profile(d), [1, 0.5, 0, 0])
+    assert np.allclose(BoxFilter().profile(d), [1, 1, 0, 0])
+    gaussian = GaussianFilter().profile(d)
+    assert gaussian[0] > gaussian[1] > gaussian[2] > 0 and gaussian[3] == 0
+    try:
+        Filter(1.0)
+    except TypeError:
+        pass
+    else:
+        assert False, "a filter without a profile should be abstract"
+
+
+@task
+def test_filters_reconstruct_linear_image():
+    tile = Tile(3, 2, 11, 9)
+    expected = render_tile(gradient, tile)
+    for name in ("box", "tent", "gaussian"):
+        pixels = Sampler(4, name).render_tile(gradient, tile)
+        assert pixels.shape == (7, 8, 3)
+        assert np.allclose(pixels, expected, atol=0.01)
+
+
+@task
+def test_sampling_is_reproducible_per_tile():
+    a = Sampler(2, seed=3).render_tile(gradient, Tile(0, 0, 4, 4))
+    b = Sampler(2, seed=3).render_tile(gradient, Tile(0, 0, 4, 4))
+    c = Sampler(2, seed=4).render_tile(gradient, Tile(0, 0, 4, 4))
+    assert np.array_equal(a, b)
+    assert not np.array_equal(a, c)
+
+
+@task
+def test_adaptive_sampling_refines_only_noisy_pixels():
+    renderer = EdgeRenderer()
+    pixels = Sampler(2, threshold=1e-3, max_rounds=4).render_tile(renderer, Tile(0, 0, 10, 1))
+    assert len(renderer.xs) == 4
+    assert [len(xs) for xs in renderer.xs] == [40, 4, 4, 4]
+    assert np.all(np.floor(np.concatenate(renderer.xs[1:])) == 5)
+    assert np.allclose(pixels[0, :5], 0) and np.allclose(pixels[0, 6:], 1)
+    assert 0.4 < pixels[0, 5, 0] < 0.95
+
+
+@task
+def test_render_flow_with_sampler():
+    from main import run_render
+
+    canvas = run_render(gradient, 10, 7, tile_size=4, sampler=Sampler(2, "tent"))
+    assert np.allclose(canvas.buffer, render_tile(gradient, Tile(0, 0, 10, 7)), atol=0.02)
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_sampling() -> None:
+    test_stratified_samples_cover_each_stratum()
+    test_filter_weights()
+    test_filters_reconstruct_linear_image()
+    test_sampling_is_reproducible_per_tile()
+    test_adaptive_sampling_refines_only_noisy_pixels()
+    test_render_flow_with_sampler()
@@ -0,0 +1,157 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer import instrumentation
+from raytracer.colors import Color
+from raytracer.materials import Material
+from raytracer.matrices.transformations import rotation_x, scaling, translation
+from raytracer.scene import CompiledScene, compile_scene, load_scene, parse_scene
+from raytracer.shapes import Mesh, Sphere, Triangle
+from raytracer.tuples import Point
+from raytracer.world import World
+
+import json
+import os
+import tempfile
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+SCENE = {
+    "camera": {"width": 24, "height": 16, "field_of_view": 1.2, "from": [0, 1, -12], "to": [0, 0, 0]},
+    "lights": [{"position": [-10, 10, -10], "intensity": [1, 1, 1]}],
+    "materials": {"red": {"color": [1, 0, 0], "diffuse": 0.7}},
+    "objects": [
+        {"type": "sphere", "material": "red", "transform": [["scale", 2, 2, 2], ["translate", -2, 0, 0]]},
+        {"type": "sphere", "material": {"specular": 0.1}, "transform": [["rotate_x", 0.5], ["translate", 2, 0, 0]]},
+        {"type": "triangle", "points": [[0, 1, 0], [-1, 0, 0], [1, 0, 0]], "transform": [["translate", 0, 2, -3]]},
+        {"type": "mesh", "file": "quad.obj", "material": "red", "transform": [["translate", 0, -2, 0]]},
+    ],
+}
+QUAD = "v -5 0 -5\nv 5 0 -5\nv 5 0 5\nv -5 0 5\nf 1 2 3 4\n"
+
+
+def write_scene(directory):
+    with open(os.path.join(directory, "quad.obj"), "w") as f:
+        f.write(QUAD)
+    path = os.path.join(directory, "scene.json")
+    with open(path, "w") as f:
+        json.dump(SCENE, f)
+    return path
+
+
+def render(scene):
+    renderer = scene.renderer()
+    ys, xs = np.mgrid[0:16, 0:24] + 0.5
+    return renderer(xs.ravel(), ys.ravel())
+
+
+@task
+def test_parse_scene_objects_lights_and_camera():
+    objects, lights, camera = parse_scene({**SCENE, "objects": SCENE["objects"][:3]})
+    red, plain, triangle = objects
+    assert type(red) is Sphere and red.transform == translation(-2, 0, 0) * scaling(2, 2, 2)
+    assert plain.transform == translation(2, 0, 0) * rotation_x(0.5)
+    assert red.material.color == Color(1, 0, 0) and red.material.diffuse == 0.7
+    assert plain.material.specular == 0.1 and plain.material.ambient == 0.1
+    assert type(triangle) is Triangle and triangle.p1 == Point(0, 1, 0)
+    assert lights[0].position == Point(-10, 10, -10)
+    assert (camera.hsize, camera.vsize, camera.field_of_view) == (24, 16, 1.2)
+
+
+@task
+def test_parse_scene_rejects_mistakes():
+    for scene, message in (
+        ({"objects": [{"type": "cube"}]}, "objects[0]: unknown object type 'cube'"),
+        ({"objects": [{"type": "sphere", "material": "gold"}]}, "unknown material 'gold'"),
+        ({"objects": [{"type": "sphere", "transform": [["scale", 2]]}]}, "bad transform step"),
+        ({"materials": {"m": {"shine": 3}}}, "materials.m: unknown material fields ['shine']"),
+        ({"lights": [{"position": [0, 0], "intensity": [1, 1, 1]}]}, "lights[0]: position"),
+        ({"camera": {"from": [0, 0, 0], "to": [0, 0, 1]}}, "width and height"),
+    ):
+        try:
+            parse_scene(scene)
+        except ValueError as error:
+            assert message in str(error), str(error)
+        else:
+            assert False, f"expected a ValueError for {scene}"
+
+
+@task
+def test_compiled_scene_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_scene(directory)
+        compiled = load_scene(path)
+        saved = compile_scene(path, os.path.join(directory, "scene.npz"))
+        loaded = load_scene(os.path.join(directory, "scene.npz"))
+    assert set(loaded.arrays) == set(saved.arrays)
+    for name, values in saved.arrays.items():
+        assert np.array_equal(loaded.arrays[name], values), name
+    image = render(compiled)
+    assert (image > 0).any()
+    assert np.array_equal(render(loaded), image)
+
+    objects = loaded.objects()
+    assert [type(shape) for shape in objects] == [Sphere, Sphere, Mesh, Mesh]
+    assert objects[0].material is objects[3].material
+    assert len(objects[3]) == 2 and objects[3].bvh.nodes()[0].shape[1] == 3
+    assert loaded.camera().transform == compiled.camera().transform
+
+
+@task
+def test_loading_a_compiled_scene_inverts_nothing():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scene.npz")
+        objects = [Sphere(translation(i, 0, 0) * scaling(0.4, 0.4, 0.4)) for i in range(10)]
+        CompiledScene.from_objects(objects).save(path)
+        with instrumentation.instrumented():
+            world = load_scene(path).world()
+            inversions = instrumentation.snapshot()["counters"].get("matrix_inversions", 0)
+    assert inversions == 0
+    assert len(world.objects) == 10 and len(world.bvh) > 1
+    assert world.objects[3].inverse_transform == objects[3].inverse_transform
+
+
+@task
+def test_glass_materials_survive_compilation():
+    objects, _, _ = parse_scene({
+        "materials": {"glass": {"transparency": 0.9, "reflective": 0.9, "refractive_index": 1.5}},
+        "objects": [{"type": "sphere", "material": "glass"}],
+    })
+    glass = objects[0].material
+    assert glass == Material(transparency=0.9, reflective=0.9, refractive_index=1.5)
+    compiled = CompiledScene.from_objects(objects)
+    assert CompiledScene(dict(compiled.arrays)).objects()[0].material == glass
+
+    # Scenes compiled before these fields existed load as opaque.
+    old = {k: v for k, v in compiled.arrays.items() if k not in ("material_transparency", "material_reflective")}
+    assert CompiledScene(old).objects()[0].material == Material(refractive_index=1.5)
+
+    world = CompiledScene.from_world(World(objects, max_depth=8, roulette_depth=4, seed=11)).world()
+    assert (world.max_depth, world.roulette_depth, world.seed) == (8, 4, 11)
+    old = {k: v for k, v in compiled.arrays.items() if k != "world_settings"}
+    assert CompiledScene(old).world().max_depth == World().max_depth
+
+
+@task
+def test_compile_rejects_unknown_shapes():
+    class Plane(Sphere):
+        pass
+
+    try:
+        CompiledScene.from_objects([Plane()])
+    except ValueError as error:
+        assert "Plane" in str(error)
+    else:
+        assert False, "expected a ValueError"
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_scene() -> None:
+    test_parse_scene_objects_lights_and_camera()
+    test_parse_scene_rejects_mistakes()
+    test_compiled_scene_round_trip()
+    test_loading_a_compiled_scene_inverts_nothing()
+    test_glass_materials_survive_compilation()
+    test_compile_rejects_unknown_shapes()
@@ -0,0 +1,89 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer.colors import Color
+from raytracer.lights import PointLight
+from raytracer.materials import Material, MaterialTable
+from raytracer.shading import lighting, reflect, refract
+from raytracer.shapes import Sphere
+from raytracer.tuples import Point
+
+import math
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+K = math.sqrt(2) / 2
+
+
+def shade(eyev, light_position, in_shadow=None):
+    materials = MaterialTable([Material()])
+    light = PointLight(Point(*light_position), Color(1, 1, 1))
+    return lighting(materials, 0, light, np.zeros(3), np.array(eyev, dtype=float), np.array([0, 0, -1.0]), in_shadow)
+
+
+@task
+def test_point_light_and_default_material():
+    light = PointLight(Point(0, 0, 0), Color(1, 1, 1))
+    assert light.position == Point(0, 0, 0)
+    assert light.intensity == Color(1, 1, 1)
+    m = Material()
+    assert m.color == Color(1, 1, 1)
+    assert (m.ambient, m.diffuse, m.specular, m.shininess) == (0.1, 0.9, 0.9, 200.0)
+    assert (m.reflective, m.transparency, m.refractive_index) == (0, 0, 1)
+    assert Sphere().material == m
+    assert Sphere(material=Material(ambient=1)).material.ambient == 1
+
+
+@task
+def test_lighting_book_cases():
+    assert np.allclose(shade([0, 0, -1], [0, 0, -10]), 1.9)
+    assert np.allclose(shade([0, K, -K], [0, 0, -10]), 1.0)
+    assert np.allclose(shade([0, 0, -1], [0, 10, -10]), 0.7364, atol=1e-4)
+    assert np.allclose(shade([0, -K, -K], [0, 10, -10]), 1.6364, atol=1e-4)
+    assert np.allclose(shade([0, 0, -1], [0, 0, 10]), 0.1)
+    assert np.allclose(shade([0, 0, -1], [0, 0, -10], in_shadow=True), 0.1)
+
+
+@task
+def test_lighting_batches_materials_into_a_buffer():
+    materials = MaterialTable([Material(Color(1, 0, 0)), Material(Color(0, 0, 1), ambient=0.5)])
+    light = PointLight(Point(0, 0, -10), Color(1, 1, 1))
+    points = np.zeros((2, 3, 3))
+    eyev = np.broadcast_to([0, 0, -1.0], (2, 3, 3))
+    normals = np.broadcast_to([0, 0, -1.0], (2, 3, 3))
+    index = np.array([[0, 1, 0], [1, 0, 1]])
+    shadow = np.array([[False, False, True], [False, False, False]])
+    canvas = np.zeros((4, 5, 3))
+    out = lighting(materials, index, light, points, eyev, normals, shadow, out=canvas[1:3, 1:4])
+    assert out.base is canvas
+    assert np.allclose(canvas[1, 1], [1.9, 0.9, 0.9])
+    assert np.allclose(canvas[1, 2], [0.9, 0.9, 2.3])
+    assert np.allclose(canvas[1, 3], [0.1, 0, 0])
+    assert not canvas[0].any() and not canvas[:, 0].any()
+    lighting(materials, index, light, points, eyev, normals, out=canvas[1:3, 1:4], accumulate=True)
+    assert np.allclose(canvas[1, 3], [2.0, 0.9, 0.9])
+
+
+@task
+def test_reflect_and_schlick():
+    assert np.allclose(reflect(np.array([1.0, -1, 0]), np.array([0.0, 1, 0])), [1, 1, 0])
+    assert np.allclose(reflect(np.array([[0.0, -1, 0]]), np.array([[K, K, 0]])), [[1, 0, 0]])
+
+    up = np.array([[0.0, 1, 0]])
+    directions, reflectance = refract(up, up, 1.0, 1.5)
+    assert np.allclose(directions, [[0, -1, 0]]) and np.allclose(reflectance, 0.04)
+    _, reflectance = refract(np.array([[0.0, K, K]]), up, 1.5, 1.0)
+    assert reflectance.tolist() == [1.0]
+    normal = np.array([[0, 0.99, -math.sqrt(1 - 0.99 ** 2)]])
+    _, reflectance = refract(np.array([[0.0, 0, -1]]), normal, 1.0, 1.5)
+    assert np.allclose(reflectance, 0.48873, atol=1e-3)
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_shading() -> None:
+    test_point_light_and_default_material()
+    test_lighting_book_cases()
+    test_lighting_batches_materials_into_a_buffer()
+    test_reflect_and_schlick()
@@ -0,0 +1,235 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer import instrumentation
+from raytracer.cache import fingerprint
+from raytracer.intersections import HitBuffer, HitRecord, Intersection, intersections, hit
+from raytracer.matrices.transformations import translation, scaling, rotation_z
+from raytracer.rays import Ray, RayBatch
+from raytracer.shapes import Shape, Sphere
+from raytracer.tuples import Point, Vector
+
+import math
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+@task
+def test_ray_intersects_sphere_at_two_points():
+    r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
+    s = Sphere()
+    xs = s.intersect(r)
+    assert len(xs) == 2
+    assert xs[0].t == 4.0
+    assert xs[1].t == 6.0
+    assert xs[0].object is s
+
+
+@task
+def test_ray_intersects_sphere_at_tangent():
+    xs = Sphere().intersect(Ray(Point(0, 1, -5), Vector(0, 0, 1)))
+    assert [x.t for x in xs] == [5.0, 5.0]
+
+
+@task
+def test_ray_misses_sphere():
+    assert Sphere().intersect(Ray(Point(0, 2, -5), Vector(0, 0, 1))) == []
+
+
+@task
+def test_ray_originates_inside_sphere():
+    xs = Sphere().intersect(Ray(Point(0, 0, 0), Vector(0, 0, 1)))
+    assert [x.t for x in xs] == [-1.0, 1.0]
+
+
+@task
+def test_sphere_behind_ray():
+    xs = Sphere().intersect(Ray(Point(0, 0, 5), Vector(0, 0, 1)))
+    assert [x.t for x in xs] == [-6.0, -4.0]
+
+
+@task
+def test_hit_ignores_negative_intersections():
+    s = Sphere()
+    i1 = Intersection(5, s)
+    i2 = Intersection(7, s)
+    i3 = Intersection(-3, s)
+    i4 = Intersection(2, s)
+    xs = intersections(i1, i2, i3, i4)
+    assert [x.t for x in xs] == [-3, 2, 5, 7]
+    assert hit(xs) is i4
+    assert hit(intersections(Intersection(-2, s), Intersection(-1, s))) is None
+
+
+@task
+def test_hit_record_keeps_the_closest_hit():
+    s = Sphere()
+    record = HitRecord()
+    assert not record and record.t == math.inf
+    assert record.record(5, s)
+    assert not record.record(-3, s)
+    assert not record.record(7, s)
+    assert record.record(2, s, face=1)
+    assert record and record.t == 2 and record.object is s and record.face == 1
+    assert record.intersection() == Intersection(2, s)
+    record.reset(1.5)
+    assert not record and record.intersection() is None
+    assert not record.record(2, s)
+
+
+@task
+def test_hit_buffer_reuses_its_slots():
+    buffer = HitBuffer()
+    t, index = buffer.reset(4, [1, 2, 3, 4])
+    assert t.tolist() == [1, 2, 3, 4] and index.tolist() == [-1] * 4
+    storage = buffer._t
+    t, index = buffer.reset(2)
+    assert buffer._t is storage and t.tolist() == [math.inf] * 2 and len(index) == 2
+
+
+@task
+def test_sphere_closest_hit_matches_hit():
+    s = Sphere(translation(0.5, 0, 0) * scaling(2, 1, 1))
+    record = HitRecord()
+    for origin in (Point(0, 0, -5), Point(0, 2, -5), Point(0, 0, 0), Point(0, 0, 5)):
+        ray = Ray(origin, Vector(0, 0, 1))
+        expected = hit(s.intersect(ray))
+        assert s.closest_hit(ray, record.reset()) == (expected is not None)
+        assert record.intersection() == expected
+    r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
+    assert r.closest_hit(Sphere()).t == 4
+    assert not r.closest_hit(Sphere(), HitRecord(3))
+
+
+@task
+def test_sphere_transform_and_inverse():
+    s = Sphere()
+    assert s.transform == s.inverse_transform
+    s.transform = translation(2, 3, 4)
+    assert s.inverse_transform == translation(-2, -3, -4)
+
+
+@task
+def test_sphere_inverts_its_transform_once_on_demand():
+    with instrumentation.instrumented():
+        spheres = [Sphere(rotation_z(0.1 * i) * scaling(1, 2, 3)) for i in range(5)]
+        empty = fingerprint(spheres)
+        assert instrumentation.snapshot()["counters"].get("matrix_inversions", 0) == 0
+        r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
+        for _ in range(20):
+            for s in spheres:
+                s.intersect(r)
+                s.normal_at(Point(0, 0, -1))
+        assert instrumentation.snapshot()["counters"]["matrix_inversions"] == 5
+    assert fingerprint(spheres) == empty
+    s = spheres[0]
+    assert s.inverse_transpose.data[:3, :3].tolist() == s.inverse_transform.transpose().data[:3, :3].tolist()
+    assert s.inverse_transpose.affine and s.inverse_transpose is s.transform.inverse_transpose()
+    s.transform = translation(1, 0, 0) * scaling(2, 1, 1)
+    assert s.inverse_transform == scaling(0.5, 1, 1) * translation(-1, 0, 0)
+    assert s.inverse_transpose == scaling(0.5, 1, 1)
+
+
+@task
+def test_intersect_scaled_sphere():
+    s = Sphere(scaling(2, 2, 2))
+    xs = s.intersect(Ray(Point(0, 0, -5), Vector(0, 0, 1)))
+    assert [x.t for x in xs] == [3.0, 7.0]
+
+
+@task
+def test_intersect_translated_sphere():
+    s = Sphere(translation(5, 0, 0))
+    assert s.intersect(Ray(Point(0, 0, -5), Vector(0, 0, 1))) == []
+
+
+@task
+def test_batched_intersection_matches_scalar():
+    s = Sphere(translation(0.5, 0, 0) * scaling(2, 1, 1))
+    rays = [
+        Ray(Point(0, 0, -5), Vector(0, 0, 1)),
+        Ray(Point(0, 2, -5), Vector(0, 0, 1)),
+        Ray(Point(0, 0, 0), Vector(0, 0, 1)),
+        Ray(Point(-5, 0.5, 0), Vector(1, 0, 0)),
+    ]
+    ts, mask = s.intersect_batch(RayBatch.from_rays(rays))
+    assert ts.shape == (4, 2)
+    assert list(mask) == [True, False, True, True]
+    for i, ray in enumerate(rays):
+        expected = [x.t for x in s.intersect(ray)]
+        if expected:
+            assert np.allclose(ts[i], expected)
+        else:
+            assert np.all(np.isinf(ts[i]))
+
+
+@task
+def test_sphere_occlusion():
+    s = Sphere(translation(0, 0, 5))
+    r = Ray(Point(0, 0, 0), Vector(0, 0, 1))
+    assert s.occluded(r)
+    assert s.occluded(r, max_t=4.5)
+    assert not s.occluded(r, max_t=4)
+    assert r.occluded(s, max_t=10)
+    assert not s.occluded(Ray(Point(0, 0, 7), Vector(0, 0, 1)))
+    assert s.occluded(Ray(Point(0, 0, 5), Vector(0, 0, 1)), max_t=2)
+    batch = RayBatch([[0, 0, 0], [0, 0, 0], [0, 3, 0], [0, 0, 7]], [[0, 0, 1]] * 4)
+    assert s.occluded_batch(batch, [10, 3, 10, 10]).tolist() == [True, False, False, False]
+
+
+@task
+def test_normal_on_sphere():
+    s = Sphere()
+    assert s.normal_at(Point(1, 0, 0)) == Vector(1, 0, 0)
+    k = math.sqrt(3) / 3
+    n = s.normal_at(Point(k, k, k))
+    assert n == Vector(k, k, k)
+    assert n == n.normalize()
+
+
+@task
+def test_normal_on_transformed_sphere():
+    s = Sphere(translation(0, 1, 0))
+    assert s.normal_at(Point(0, 1.70711, -0.70711)) == Vector(0, 0.70711, -0.70711)
+    s = Sphere(scaling(1, 0.5, 1) * rotation_z(math.pi / 5))
+    n = s.normal_at(Point(0, math.sqrt(2) / 2, -math.sqrt(2) / 2))
+    assert n == Vector(0, 0.97014, -0.24254)
+
+
+@task
+def test_incomplete_shapes_cannot_be_created():
+    class Flat(Shape):
+        def bounds(self):
+            return Sphere().bounds()
+
+    for cls in (Shape, Flat):
+        try:
+            cls()
+        except TypeError:
+            pass
+        else:
+            assert False, f"{cls.__name__} should be abstract"
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_sphere() -> None:
+    test_ray_intersects_sphere_at_two_points()
+    test_ray_intersects_sphere_at_tangent()
+    test_ray_misses_sphere()
+    test_ray_originates_inside_sphere()
+    test_sphere_behind_ray()
+    test_hit_ignores_negative_intersections()
+    test_hit_record_keeps_the_closest_hit()
+    test_hit_buffer_reuses_its_slots()
+    test_sphere_closest_hit_matches_hit()
+    test_sphere_transform_and_inverse()
+    test_sphere_inverts_its_transform_once_on_demand()
+    test_intersect_scaled_sphere()
+    test_intersect_translated_sphere()
+    test_batched_intersection_matches_scalar()
+    test_sphere_occlusion()
+    test_normal_on_sphere()
+    test_normal_on_transformed_sphere()
+    test_incomplete_shapes_cannot_be_created()
@@ -3,6 +3,7 @@ from prefect_ray.task_runners import RayTaskRunner
 from raytracer.tuples import Tuple, Point, Vector
 
 import math
+import numpy as np
 from multiprocessing import cpu_count
 
 NUM_CPUS = cpu_count()
@@ -131,6 +132,85 @@ def test_tuple_cross_product():
     assert b.cross(a) == Vector(1, -2, 1)
 
 
+@task
+def test_tuples_have_no_instance_dict():
+    for t in (Tuple(1, 2, 3, 1), Point(1, 2, 3), Vector(1, 2, 3)):
+        assert not hasattr(t, "__dict__")
+
+
+@task
+def test_arithmetic_preserves_subtype():
+    p = Point(3, 2, 1)
+    v = Vector(5, 6, 7)
+    assert type(p - Point(5, 6, 7)) is Vector
+    assert type(p + v) is Point
+    assert type(v + p) is Point
+    assert type(p - v) is Point
+    assert type(v + v) is Vector
+    assert type(v - v) is Vector
+    assert type(-v) is Vector
+    assert type(v * 2) is Vector
+    assert type(v / 2) is Vector
+    assert type(v.normalize()) is Vector
+    assert type(v.cross(v)) is Vector
+    assert type(p + p) is Tuple
+    assert type(Tuple(1, 2, 3, 0) + v) is Tuple
+    assert type(2 * v) is Vector
+    assert type(np.float64(2) * v) is Vector
+    assert np.float64(2) * v == Vector(10, 12, 14)
+
+
+@task
+def test_repr_names_the_kind():
+    assert repr(Vector(1, 2, 3) * 2) == "Vector(2, 4, 6)"
+    assert repr(Point(1, 2, 3) + Vector(1, 1, 1)) == "Point(2, 3, 4)"
+    assert repr(Tuple(1, 2, 3, 4)) == "Tuple(1, 2, 3, 4)"
+    assert repr(Point(1, 1, 1) + Point(1, 1, 1)) == "Tuple(2, 2, 2, 2)"
+    assert str(Vector(1, 2, 3)) == "Tuple(1, 2, 3, 0)"
+
+
+@task
+def test_in_place_operations():
+    v = Vector(1, 2, 3)
+    same = v.iadd(Vector(1, 1, 1))
+    assert same is v
+    assert v == Vector(2, 3, 4)
+    v.isub(Vector(1, 1, 1)).imul(2)
+    assert v == Vector(2, 4, 6)
+    v.normalize_()
+    assert v == Vector(0.26726, 0.53452, 0.80178)
+    assert type(v) is Vector
+
+
+@task
+def test_in_place_operations_keep_the_subtype():
+    for operation in (
+        lambda: Vector(1, 2, 3).iadd(Point(1, 1, 1)),
+        lambda: Point(1, 2, 3).iadd(Point(1, 1, 1)),
+        lambda: Point(1, 2, 3).isub(Point(1, 1, 1)),
+        lambda: Point(1, 2, 3).imul(2),
+        lambda: Point(1, 2, 3).normalize_(),
+    ):
+        try:
+            operation()
+        except TypeError:
+            pass
+        else:
+            assert False, "expected a TypeError"
+    p = Point(1, 2, 3).iadd(Vector(1, 1, 1)).isub(Vector(0, 0, 1))
+    assert type(p) is Point and p == Point(2, 3, 3)
+    assert Point(1, 2, 3).imul(1) == Point(1, 2, 3)
+    assert Tuple(1, 2, 3, 1).imul(2) == Tuple(2, 4, 6, 2)
+
+
+@task
+def test_vector_dot_and_magnitude_skip_w():
+    a = Vector(1, 2, 3)
+    assert a.dot(Point(2, 3, 4)) == 20
+    assert a.magnitude() == math.sqrt(14)
+    assert Tuple(1, 2, 3, 1).magnitude() == math.sqrt(15)
+
+
 @flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
 def test_tuple() -> None:
     test_tuple_as_point()
@@ -150,3 +230,9 @@ def test_tuple() -> None:
     test_tuple_normalize()
     test_tuple_dot_product()
     test_tuple_cross_product()
+    test_tuples_have_no_instance_dict()
+    test_arithmetic_preserves_subtype()
+    test_repr_names_the_kind()
+    test_in_place_operations()
+    test_in_place_operations_keep_the_subtype()
+    test_vector_dot_and_magnitude_skip_w()
@@ -0,0 +1,157 @@
+from prefect import task, flow
+from prefect_ray.task_runners import RayTaskRunner
+from raytracer import instrumentation
+from raytracer.camera import Camera
+from raytracer.colors import Color
+from raytracer.intersections import HitBuffer
+from raytracer.lights import PointLight
+from raytracer.materials import Material
+from raytracer.matrices.transformations import rotation_z, scaling, translation, view_transform
+from raytracer.rays import Ray, RayBatch
+from raytracer.shapes import Mesh, Sphere, Triangle
+from raytracer.tuples import Point, Vector
+from raytracer.world import SceneRenderer, World
+
+import math
+from multiprocessing import cpu_count
+
+import numpy as np
+
+NUM_CPUS = cpu_count()
+
+
+def default_world():
+    outer = Sphere(material=Material(Color(0.8, 1.0, 0.6), diffuse=0.7, specular=0.2))
+    inner = Sphere(scaling(0.5, 0.5, 0.5))
+    return World([outer, inner], [PointLight(Point(-10, 10, -10), Color(1, 1, 1))])
+
+
+def plane(y, material):
+    vertices = [[-100, 0, -100], [100, 0, -100], [100, 0, 100], [-100, 0, 100]]
+    return Mesh(vertices, [[0, 1, 2], [0, 2, 3]], transform=translation(0, y, 0), material=material)
+
+
+DOWN_RAY = Ray(Point(0, 0, -3), Vector(0, -math.sqrt(2) / 2, math.sqrt(2) / 2))
+
+
+def color_close(color, expected):
+    # The book's expected colors come from a larger surface offset.
+    return np.allclose([color.x, color.y, color.z], expected, atol=1e-4)
+
+
+@task
+def test_color_at_hit_and_miss():
+    w = default_world()
+    assert w.color_at(Ray(Point(0, 0, -5), Vector(0, 0, 1))) == Color(0.38066, 0.47583, 0.2855)
+    assert w.color_at(Ray(Point(0, 0, -5), Vector(0, 1, 0))) == Color(0, 0, 0)
+    assert [x.t for x in w.intersect(Ray(Point(0, 0, -5), Vector(0, 0, 1)))] == [4, 4.5, 5.5, 6]
+
+
+@task
+def test_shading_from_inside_and_behind():
+    w = default_world()
+    w.lights = [PointLight(Point(0, 0.25, 0), Color(1, 1, 1))]
+    assert w.color_at(Ray(Point(0, 0, 0), Vector(0, 0, 1))) == Color(0.90498, 0.90498, 0.90498)
+    w = default_world()
+    w.objects[0].material.ambient = 1
+    w.objects[1].material.ambient = 1
+    w.refresh()
+    assert w.color_at(Ray(Point(0, 0, 0.75), Vector(0, 0, -1))) == w.objects[1].material.color
+
+
+@task
+def test_shadows():
+    w = default_world()
+    points = np.array([[0, 10, 0], [10, -10, 10], [-20, 20, -20], [-2, 2, -2]], dtype=float)
+    assert w.is_shadowed_batch(points, w.lights[0]).tolist() == [False, True, False, False]
+    w = World([Sphere(), Sphere(translation(0, 0, 10))], [PointLight(Point(0, 0, -10), Color(1, 1, 1))])
+    assert w.color_at(Ray(Point(0, 0, 5), Vector(0, 0, 1))) == Color(0.1, 0.1, 0.1)
+
+
+@task
+def test_batched_normals_match_scalar_normals():
+    sphere = Sphere(scaling(1, 0.5, 1) * rotation_z(math.pi / 5))
+    triangle = Triangle(Point(0, 1, 0), Point(-1, 0, 0), Point(1, 0, 0), transform=translation(0, 0, 3))
+    w = World([sphere, triangle])
+    batch = RayBatch([[0, 0, -5], [0.2, 0.1, -5], [0.1, 0.5, -5]], [[0, 0, 1], [0, 0.02, 1], [0, 0, 1]])
+    found = HitBuffer()
+    w.bvh.intersect_batch(batch, out=found)
+    hits = w.prepare_hits(batch, found)
+    assert len(hits) == 3
+    for k in range(3):
+        shape = w.objects[hits.objects[k]]
+        expected = shape.normal_at(Point(*hits.points[k]), w.bvh.closest_hit(batch[hits.rays[k]]))
+        assert np.allclose(hits.normals[k], [expected.x, expected.y, expected.z])
+
+
+@task
+def test_reflection():
+    w = default_world()
+    w.objects.append(plane(-1, Material(reflective=0.5)))
+    w.refresh()
+    assert color_close(w.color_at(DOWN_RAY), [0.87677, 0.92436, 0.82918])
+    w.max_depth = 0
+    assert color_close(w.color_at(DOWN_RAY), [0.68643, 0.68643, 0.68643])
+
+
+@task
+def test_refraction_with_fresnel():
+    w = default_world()
+    floor = plane(-1, Material(transparency=0.5, refractive_index=1.5))
+    w.objects += [floor, Sphere(translation(0, -3.5, -0.5), Material(Color(1, 0, 0), ambient=0.5))]
+    w.refresh()
+    assert color_close(w.color_at(DOWN_RAY), [0.93642, 0.68642, 0.68642])
+    floor.material.reflective = 0.5
+    w.refresh()
+    assert color_close(w.color_at(DOWN_RAY), [0.93391, 0.69643, 0.69243])
+
+
+@task
+def test_secondary_rays_are_bounded():
+    mirror = Material(reflective=1)
+    light = PointLight(Point(0, 0, 0), Color(1, 1, 1))
+    batch = RayBatch(np.zeros((64, 3)), np.tile([0, 1.0, 0], (64, 1)))
+    w = World([plane(-1, mirror), plane(1, mirror)], [light], max_depth=50, roulette_depth=50)
+    with instrumentation.instrumented():
+        exact = w.shade_batch(batch)
+        assert instrumentation.snapshot()["counters"]["secondary_rays"] == 50 * 64
+    assert np.allclose(exact, exact[0])
+
+    # Rays that survive the roulette are reweighted, so the mean holds up.
+    mirror.reflective = 0.8
+    batch = RayBatch(np.zeros((1024, 3)), np.tile([0, 1.0, 0], (1024, 1)))
+    w = World(w.objects, [light], max_depth=50, roulette_depth=2, seed=3)
+    expected = World(w.objects, [light], max_depth=50, roulette_depth=50).shade_batch(batch)
+    with instrumentation.instrumented():
+        colors = w.shade_batch(batch)
+        assert instrumentation.snapshot()["counters"]["secondary_rays"] < 20 * 1024
+    assert np.array_equal(w.shade_batch(batch), colors)
+    assert abs(colors.mean() - expected.mean()) < 0.1 * expected.mean()
+
+    # Another batch (another tile or pass) draws its own random numbers.
+    shifted = RayBatch(batch.origins + [1e-3, 0, 0], batch.directions)
+    exact = World(w.objects, [light], max_depth=50, roulette_depth=50).shade_batch(shifted)
+    assert np.allclose(exact, expected, atol=1e-3)
+    assert not np.allclose(w.shade_batch(shifted), colors, atol=1e-2)
+
+
+@task
+def test_scene_renderer_flow():
+    from main import run_render
+
+    camera = Camera(11, 11, math.pi / 2, view_transform(Point(0, 0, -5), Point(0, 0, 0), Vector(0, 1, 0)))
+    canvas = run_render(SceneRenderer(default_world(), camera), 11, 11, tile_size=4)
+    assert canvas.pixel_at(5, 5) == Color(0.38066, 0.47583, 0.2855)
+    assert canvas.pixel_at(0, 0) == Color(0, 0, 0)
+
+
+@flow(task_runner=RayTaskRunner(init_kwargs={"num_cpus": NUM_CPUS}))
+def test_world() -> None:
+    test_color_at_hit_and_miss()
+    test_shading_from_inside_and_behind()
+    test_shadows()
+    test_batched_normals_match_scalar_normals()
+    test_reflection()
+    test_refraction_with_fresnel()
+    test_secondary_rays_are_bounded()
+    test_scene_renderer_flow()